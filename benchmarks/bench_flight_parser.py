@@ -0,0 +1,115 @@
+"""Benchmark the single-pass Flight parser against the previous window/regex parser.
+
+Usage:
+    python benchmarks/bench_flight_parser.py                  # synthetic pages of growing size
+    python benchmarks/bench_flight_parser.py saved_page.html  # pages saved from anthropic.com
+
+Prints one JSON object per page with the timings of both implementations.
+"""
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.collectors.flight_parser import iter_flight_posts
+
+
+def legacy_parse_flight_data(html: str, page_path: str) -> list:
+    """The previous AnthropicNewsCollector._parse_flight_data, kept for comparison."""
+    chunks = re.findall(r'self\.__next_f\.push\(\[\d+,"(.*?)"\]\)', html, re.DOTALL)
+    if not chunks:
+        return []
+    raw = ""
+    for chunk in chunks:
+        raw += chunk.replace('\\"', '"').replace('\\n', '\n').replace('\\t', '\t')
+
+    posts = []
+    seen_slugs = set()
+    for match in re.finditer(r'"publishedOn"\s*:\s*"([^"]+)"', raw):
+        start = max(0, match.start() - 300)
+        end = min(len(raw), match.end() + 1500)
+        window = raw[start:end]
+        slug_m = re.search(r'"current"\s*:\s*"([\w-]+)"', window)
+        if not slug_m or slug_m.group(1) in seen_slugs:
+            continue
+        seen_slugs.add(slug_m.group(1))
+        title_m = re.search(r'"title"\s*:\s*"([^"]+)"', window)
+        if not title_m:
+            continue
+        summary_m = re.search(r'"summary"\s*:\s*"([^"]*)"', window)
+        label_m = re.search(r'"label"\s*:\s*"([^"]*)"', window)
+        url_prefix = page_path
+        dirs_m = re.search(r'"directories"\s*:\s*\[([^\]]*)\]', window)
+        if dirs_m:
+            first_val = re.search(r'"value"\s*:\s*"([\w-]+)"', dirs_m.group(1))
+            if first_val:
+                url_prefix = f"/{first_val.group(1)}"
+        posts.append({
+            "slug": slug_m.group(1),
+            "title": title_m.group(1),
+            "date": match.group(1),
+            "summary": summary_m.group(1) if summary_m else None,
+            "category": label_m.group(1).lower() if label_m else "anthropic-news",
+            "url_prefix": url_prefix,
+        })
+    return posts
+
+
+def synthetic_page(num_posts: int, chunk_size: int = 2000) -> str:
+    """A listing page shaped like anthropic.com: React tree filler plus Sanity post records."""
+    records = []
+    for i in range(num_posts):
+        records.append(json.dumps({
+            "_id": f"id-{i}",
+            "body": "Lorem ipsum dolor sit amet. " * 20,
+            "publishedOn": "2026-02-05T18:00:00.000Z",
+            "slug": {"_type": "slug", "current": f"post-{i}"},
+            "directories": [{"_key": "news", "value": "news"}],
+            "subjects": [{"label": "Announcements", "value": "announcements"}],
+            "title": f"Post number {i}",
+            "summary": f"Summary of post {i}",
+        }))
+        records.append(json.dumps(["$", "div", None, {"className": "card", "children": ["$", "span", None, {}]}]))
+    payload = "1:" + "[" + ",".join(records) + "]\n"
+    chunks = [payload[i:i + chunk_size] for i in range(0, len(payload), chunk_size)]
+    scripts = "".join(
+        f"<script>self.__next_f.push([1,{json.dumps(chunk)}])</script>" for chunk in chunks
+    )
+    return f"<html><head></head><body>{scripts}</body></html>"
+
+
+def bench(fn, html: str, repeat: int = 3) -> tuple:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = list(fn(html, "/news"))
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    if len(sys.argv) > 1:
+        pages = [(path, open(path, encoding="utf-8").read()) for path in sys.argv[1:]]
+    else:
+        pages = [(f"synthetic-{n}", synthetic_page(n)) for n in (10, 100, 1000, 5000)]
+
+    for name, html in pages:
+        legacy_s, legacy_posts = bench(legacy_parse_flight_data, html)
+        new_s, new_posts = bench(iter_flight_posts, html)
+        print(json.dumps({
+            "page": name,
+            "html_bytes": len(html),
+            "legacy_s": round(legacy_s, 4),
+            "streaming_s": round(new_s, 4),
+            "speedup": round(legacy_s / new_s, 2) if new_s else None,
+            "legacy_posts": len(legacy_posts),
+            "streaming_posts": len(new_posts),
+        }))
+
+
+if __name__ == "__main__":
+    main()
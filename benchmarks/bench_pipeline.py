@@ -0,0 +1,325 @@
+"""Offline benchmark of every InsightBotGraph node across corpus sizes.
+
+Collectors read recorded fixtures (see benchmarks/fixtures.py) instead of the
+network, and every LLM / embedding call goes to the deterministic fake model
+in benchmarks/fake_llm.py with a simulated latency (or, with --llm-server /
+--llm-url, through the real OpenAI client to an OpenAI-compatible mock server
+such as benchmarks/mock_openai_server.py). Each run starts from an
+empty workspace (no seen articles, stores or caches), then the graph nodes
+are executed in order and timed one by one.
+
+Usage:
+    python benchmarks/bench_pipeline.py                          # synthetic corpora of 10 → 10,000 articles
+    python benchmarks/bench_pipeline.py --sizes 100 1000 --llm-latency-ms 300 --llm-jitter-ms 100
+    python benchmarks/bench_pipeline.py --set processing.max_concurrency=16 --set ranking.top_n=50
+    python benchmarks/bench_pipeline.py --llm-server                      # real HTTP client, in-process mock API
+    python benchmarks/bench_pipeline.py --llm-url http://127.0.0.1:8089/v1
+    python benchmarks/bench_pipeline.py --record benchmarks/fixtures/live   # capture the live sources once
+    python benchmarks/bench_pipeline.py --fixtures benchmarks/fixtures/live # ...and replay them
+    python benchmarks/bench_pipeline.py --output new.json --compare baseline.json
+
+Writes one JSON document (settings, environment, per-size node timings and
+LLM usage) to --output and stdout. With --compare, node times are checked
+against a previous result and the exit status is 1 if any node slowed down
+by more than --tolerance.
+"""
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Optional
+from unittest.mock import patch
+
+import yaml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fake_llm import FakeChatModel, FakeEmbeddings
+from fixtures import SLACK_WEBHOOK, Fixtures, record, synthesize
+from mock_openai_server import LatencyModel, MockOpenAIServer
+from src.state import merge_stats
+from src.utils.llm_client import LLMClient
+from src.utils.metrics import MetricsCallbackHandler, RunMetrics
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+NODES = [
+    ("fetch", "fetch_data_node"),
+    ("skip_seen", "skip_seen_node"),
+    ("dedup", "dedup_node"),
+    ("filter", "filter_data_node"),
+    ("rank", "rank_node"),
+    ("process", "process_data_node"),
+    ("publish", "publish_data_node"),
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="synthetic corpus sizes")
+    parser.add_argument("--fixtures", help="replay this fixture directory instead of synthetic corpora")
+    parser.add_argument("--record", metavar="DIR", help="record the live sources into DIR and exit")
+    parser.add_argument("--fixture-cache", default=os.path.join(ROOT, "benchmarks", "fixtures"),
+                        help="where synthetic corpora are generated (reused across runs)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="runs per size; node times are the median")
+    parser.add_argument("--llm-latency-ms", type=float, default=100.0)
+    parser.add_argument("--llm-jitter-ms", type=float, default=50.0)
+    parser.add_argument("--embedding-latency-ms", type=float, default=20.0)
+    parser.add_argument("--llm-server", action="store_true",
+                        help="start the mock OpenAI server in-process (with the latency above) and call it over HTTP")
+    parser.add_argument("--llm-url", help="call an already running OpenAI-compatible server at this base URL")
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="SECTION.KEY=VALUE",
+                        help="override a settings.yaml value (YAML-parsed), e.g. processing.max_concurrency=16")
+    parser.add_argument("--output", default=os.path.join(
+        ROOT, "benchmarks", "results", f"pipeline-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"))
+    parser.add_argument("--compare", metavar="BASELINE", help="previous result to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown per node (0.2 = 20%%)")
+    parser.add_argument("--verbose", action="store_true", help="show the pipeline's own output")
+    return parser.parse_args()
+
+
+def apply_overrides(config: dict, overrides: list) -> dict:
+    for override in overrides:
+        path, _, value = override.partition("=")
+        *sections, key = path.split(".")
+        target = config
+        for section in sections:
+            target = target.setdefault(section, {})
+        target[key] = yaml.safe_load(value)
+    return config
+
+
+def bench_config(base: dict, fixtures: Fixtures, overrides: list, llm_url: Optional[str] = None) -> dict:
+    config = copy.deepcopy(base)
+    collector = config.setdefault("collector", {})
+    collector.update(fixtures.collector_config())
+    collector["arxiv_category_quota"] = None
+    # Replayed pages cost nothing, so source politeness limits would only measure sleeping
+    collector["arxiv_requests_per_minute"] = 600_000
+    collector["timeout_seconds"] = 3600
+    # Every call should reach the (fake) model; a warm cache would hide the LLM stages
+    config.setdefault("cache", {})["enabled"] = False
+    config.setdefault("metrics", {})["prometheus_textfile"] = None
+    if llm_url:
+        config.setdefault("processing", {})["llm_base_url"] = llm_url
+    return apply_overrides(config, overrides)
+
+
+def fake_chat_model(metrics: RunMetrics, args):
+    def get_chat_model(self, temperature: float = 0.0, task: Optional[str] = None):
+        return FakeChatModel(
+            # Reported under the routed model's name, so per-tier usage and cost show up in the results
+            model_name=self.route(task)["model"],
+            latency_ms=args.llm_latency_ms,
+            jitter_ms=args.llm_jitter_ms,
+            seed=args.seed,
+            cache=self.cache,
+            callbacks=[MetricsCallbackHandler(metrics)],
+        )
+    return get_chat_model
+
+
+def llm_snapshot(metrics: RunMetrics) -> tuple:
+    with metrics._lock:
+        calls = sum(entry["calls"] for entry in metrics.llm_calls.values())
+        latencies = [s for entry in metrics.llm_calls.values() for s in entry["latencies"]]
+    return calls, latencies
+
+
+def run_once(fixtures: Fixtures, base_config: dict, args) -> dict:
+    """Runs every node once in a fresh workspace; returns the node timings and LLM usage."""
+    # Imported late: the graph's modules read settings relative to the working directory
+    from src.graph import InsightBotGraph
+
+    workspace = tempfile.mkdtemp(prefix="insightbot-bench-")
+    os.makedirs(os.path.join(workspace, "config"))
+    with open(os.path.join(workspace, "config", "settings.yaml"), "w") as f:
+        yaml.safe_dump(bench_config(base_config, fixtures, args.overrides, args.llm_url), f, allow_unicode=True)
+
+    metrics = RunMetrics()
+    cwd = os.getcwd()
+    os.chdir(workspace)
+    try:
+        with contextlib.ExitStack() as stack:
+            # LLM calls of this run are recorded in its own metrics
+            stack.enter_context(patch("src.utils.llm_client.get_run_metrics", return_value=metrics))
+            if not args.llm_url:
+                stack.enter_context(patch.object(LLMClient, "get_chat_model", fake_chat_model(metrics, args)))
+                stack.enter_context(patch.object(LLMClient, "get_embeddings", lambda self: FakeEmbeddings(
+                    latency_ms=args.embedding_latency_ms)))
+            bot = InsightBotGraph()
+        bot.rss_collector.http.client = fixtures.httpx_client()  # shared by all collectors and Slack
+
+        def arxiv_client(new_client=bot.arxiv_collector._new_client):
+            client = new_client()
+            client._session.mount("https://", fixtures.requests_adapter())
+            client._session.mount("http://", fixtures.requests_adapter())
+            return client
+
+        bot.arxiv_collector._new_client = arxiv_client
+        bot.slack_bot.webhook_url = SLACK_WEBHOOK
+        bot.email_sender.smtp_user = ""  # no SMTP server to replay; the email is skipped
+
+        state = {"articles": [], "stats": {}}
+        nodes = {}
+        for name, method in NODES:
+            articles_in = len(state["articles"])
+            calls_before, latencies_before = llm_snapshot(metrics)
+            output = io.StringIO()
+            with contextlib.redirect_stdout(sys.stdout if args.verbose else output):
+                start = time.perf_counter()
+                update = getattr(bot, method)(state)
+                seconds = time.perf_counter() - start
+            state = {
+                "articles": update.get("articles", state["articles"]),
+                "stats": merge_stats(state["stats"], update.get("stats")),
+            }
+            calls_after, latencies_after = llm_snapshot(metrics)
+            latencies = latencies_after[len(latencies_before):]
+            # Fetch starts empty: its throughput is articles produced per second
+            handled = articles_in or len(state["articles"])
+            nodes[name] = {
+                "seconds": round(seconds, 4),
+                "articles_in": articles_in,
+                "articles_out": len(state["articles"]),
+                "articles_per_s": round(handled / seconds, 1) if seconds > 0 else None,
+                "llm_calls": calls_after - calls_before,
+                "llm_latency_p50_s": round(RunMetrics._percentile(latencies, 50), 4) if latencies else None,
+                "llm_latency_p95_s": round(RunMetrics._percentile(latencies, 95), 4) if latencies else None,
+            }
+        pricing = bot.config.get("metrics", {}).get("pricing_per_1m_tokens", {})
+        report = metrics.build_report(state["stats"], pricing=pricing)
+        return {"nodes": nodes, "llm": report["llm"], "stats": report["stats"]}
+    finally:
+        os.chdir(cwd)
+
+
+def summarize_runs(runs: list) -> dict:
+    """Median node times over repeated runs; counts come from the first run (they are deterministic)."""
+    result = copy.deepcopy(runs[0])
+    for name in result["nodes"]:
+        node = result["nodes"][name]
+        node["seconds"] = round(statistics.median(run["nodes"][name]["seconds"] for run in runs), 4)
+        handled = node["articles_in"] or node["articles_out"]
+        node["articles_per_s"] = round(handled / node["seconds"], 1) if node["seconds"] > 0 else None
+    result["total_s"] = round(sum(node["seconds"] for node in result["nodes"].values()), 4)
+    result["repeat"] = len(runs)
+    return result
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(result: dict, baseline_path: str, tolerance: float) -> list:
+    """Returns the nodes that are more than `tolerance` slower than in the baseline, per corpus size."""
+    with open(baseline_path) as f:
+        baseline = {run["articles"]: run for run in json.load(f)["runs"]}
+    regressions = []
+    for run in result["runs"]:
+        previous = baseline.get(run["articles"])
+        if not previous:
+            continue
+        for name, node in run["nodes"].items():
+            before = previous["nodes"].get(name, {}).get("seconds")
+            # Sub-millisecond nodes are dominated by noise
+            if before and before >= 0.001 and node["seconds"] > before * (1 + tolerance):
+                regressions.append({
+                    "articles": run["articles"], "node": name,
+                    "baseline_s": before, "seconds": node["seconds"],
+                    "ratio": round(node["seconds"] / before, 2),
+                })
+    return regressions
+
+
+def main():
+    args = parse_args()
+    # The fake model never sends it, but LLMClient refuses to start without one
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+    with open(os.path.join(ROOT, "config", "settings.yaml")) as f:
+        base_config = yaml.safe_load(f)
+
+    if args.record:
+        directory = os.path.abspath(args.record)
+        os.chdir(ROOT)  # the collectors read config/settings.yaml
+        fixtures = record(directory)
+        print(f"Recorded {fixtures.articles} articles into {args.record}")
+        return
+
+    if args.fixtures:
+        corpora = [Fixtures(args.fixtures)]
+    else:
+        corpora = []
+        for size in args.sizes:
+            directory = os.path.join(args.fixture_cache, f"synthetic-{size}-seed{args.seed}")
+            exists = os.path.exists(os.path.join(directory, "manifest.json"))
+            corpora.append(Fixtures(directory) if exists else synthesize(directory, size, seed=args.seed))
+
+    server = None
+    if args.llm_server:
+        spread = args.llm_jitter_ms / args.llm_latency_ms if args.llm_latency_ms else 0.0
+        server = MockOpenAIServer(
+            latency=LatencyModel("uniform", args.llm_latency_ms, spread, seed=args.seed), seed=args.seed
+        ).start()
+        args.llm_url = server.url
+
+    result = {
+        "benchmark": "pipeline",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "fixtures": args.fixtures or "synthetic",
+            "seed": args.seed,
+            "llm_latency_ms": args.llm_latency_ms,
+            "llm_jitter_ms": args.llm_jitter_ms,
+            "embedding_latency_ms": args.embedding_latency_ms,
+            "llm": args.llm_url or "in-process fake",
+            "overrides": args.overrides,
+        },
+        "runs": [],
+    }
+    try:
+        for fixtures in corpora:
+            runs = []
+            for _ in range(max(1, args.repeat)):
+                runs.append(run_once(fixtures, base_config, args))
+            run = {"articles": fixtures.articles, **summarize_runs(runs)}
+            result["runs"].append(run)
+            print(f"[bench] {fixtures.articles} articles: {run['total_s']}s "
+                  + " ".join(f"{name}={node['seconds']}s" for name, node in run["nodes"].items()), file=sys.stderr)
+    finally:
+        if server:
+            result["llm_server"] = server.stats()
+            server.stop()
+
+    if args.compare:
+        result["regressions"] = compare(result, args.compare, args.tolerance)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    print(f"[bench] results written to {args.output}", file=sys.stderr)
+    if result.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
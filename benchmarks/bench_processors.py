@@ -0,0 +1,107 @@
+"""Benchmark the per-article setup overhead of the LLM processors.
+
+Compares the previous pattern (each processor builds its own `LLMClient` —
+re-reading the settings file and creating a `ChatOpenAI` with its own HTTP
+pool — and every call rebuilds `prompt | llm | parser`) with the shared
+`ProcessorRegistry` (chains compiled once, one HTTP pool) and with the
+batched `run_many` entry points. The model answers instantly, so the timings
+are pure client-side overhead.
+
+Usage:
+    python benchmarks/bench_processors.py                # 10, 100 and 1000 articles
+    python benchmarks/bench_processors.py 5000
+
+Prints one JSON object per size.
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+import yaml
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_openai import ChatOpenAI
+
+from benchmarks.fake_llm import FakeChatModel
+from src.processors.registry import ProcessorRegistry
+from src.processors.summarizer import Summarizer
+from src.state import Article
+from src.utils.llm_client import LLMClient
+
+
+def articles(n: int) -> list:
+    return [Article(source="arxiv" if i % 2 else "rss", title=f"Efficient inference trick {i}",
+                    url=f"http://example.com/{i}", content="Quantized attention kernels. " * 40)
+            for i in range(n)]
+
+
+def legacy_summarize(article: Article, llm) -> str:
+    """The previous Summarizer call path: a new chain per article."""
+    prompt_text = Summarizer.PAPER_PROMPT if article.source == "arxiv" else Summarizer.NEWS_PROMPT
+    chain = ChatPromptTemplate.from_template(prompt_text) | llm | StrOutputParser()
+    return chain.invoke({"title": article.title, "content": article.content})
+
+
+def legacy_setup(config_path: str):
+    """The previous processor construction: a settings read and a ChatOpenAI (own HTTP pool) per processor."""
+    with open(config_path) as f:
+        config = yaml.safe_load(f)
+    return ChatOpenAI(model=config["processing"]["summary_model"], api_key="sk-bench")
+
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10, 100, 1000]
+    workspace = tempfile.mkdtemp(prefix="insightbot-bench-")
+    config_path = os.path.join(workspace, "settings.yaml")
+    with open(os.path.join(ROOT, "config", "settings.yaml")) as f:
+        config = yaml.safe_load(f)
+    config["cache"]["enabled"] = False
+    # The fake model answers instantly; the request budget would only measure sleeping
+    config["processing"]["requests_per_minute"] = 600_000
+    with open(config_path, "w") as f:
+        yaml.safe_dump(config, f)
+
+    fake = lambda self, temperature=0.0, task=None: FakeChatModel(latency_ms=0)
+    try:
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "sk-bench"}), \
+                patch.object(LLMClient, "get_chat_model", fake):
+            registry = ProcessorRegistry(config_path)
+            summarizer = registry.summarizer
+            for n in sizes:
+                batch = articles(n)
+                llm = FakeChatModel(latency_ms=0)
+                setup_legacy_s = timed(lambda: [legacy_setup(config_path) for _ in range(n)])
+                setup_shared_s = timed(lambda: [registry.summarizer for _ in range(n)])
+                legacy_s = timed(lambda: [legacy_summarize(article, llm) for article in batch])
+                compiled_s = timed(lambda: [summarizer.summarize(article) for article in batch])
+                run_many_s = timed(lambda: summarizer.run_many(batch, max_concurrency=8))
+                print(json.dumps({
+                    "articles": n,
+                    "setup_per_article_legacy_ms": round(setup_legacy_s / n * 1000, 3),
+                    "setup_per_article_shared_ms": round(setup_shared_s / n * 1000, 4),
+                    "call_per_article_legacy_ms": round(legacy_s / n * 1000, 3),
+                    "call_per_article_compiled_ms": round(compiled_s / n * 1000, 3),
+                    "call_per_article_run_many_ms": round(run_many_s / n * 1000, 3),
+                }))
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
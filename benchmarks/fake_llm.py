@@ -0,0 +1,144 @@
+"""Deterministic stand-ins for the chat and embedding models, for offline benchmarks.
+
+`respond(prompt)` recognizes the prompts of `RelevanceFilter` (single and
+batch), `Summarizer` (including its chunk notes), `InsightGenerator` and
+`CombinedProcessor` and returns a well-formed answer that only depends on the
+prompt, so runs are repeatable and cache keys are stable. Relevance scores are derived from a hash of the
+article title. `FakeChatModel` wraps it as a LangChain chat model with a
+configurable (seeded) latency and reports token usage like the OpenAI
+integration, so `MetricsCallbackHandler` records it.
+"""
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+FAKE_MODEL = "fake-llm"
+
+
+def relevance_score(title: str) -> float:
+    """Stable pseudo-random score in [0, 1] for an article title."""
+    digest = hashlib.sha256(title.strip().encode("utf-8")).hexdigest()
+    return round(int(digest[:8], 16) / 0xFFFFFFFF, 2)
+
+
+def count_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token) for simulated usage."""
+    return max(1, len(text) // 4)
+
+
+def _field(prompt: str, label: str) -> str:
+    match = re.search(rf"^\s*{label}:\s*(.*)$", prompt, re.MULTILINE)
+    return match.group(1).strip() if match else ""
+
+
+def _summary(title: str, paper: bool) -> str:
+    if paper:
+        return (f"**배경 (Problem):** {title}이(가) 다루는 문제를 설명합니다.\n"
+                f"**방법론 (Method):** 제안된 핵심 기법을 요약합니다.\n"
+                f"**결과 (Result):** 주요 벤치마크에서의 개선 폭을 정리합니다.")
+    return (f"- {title} 관련 주요 발표 내용입니다.\n"
+            f"- 기술적인 세부 사항과 적용 범위를 설명합니다.\n"
+            f"- 향후 일정과 공개 여부를 정리합니다.")
+
+
+def respond(prompt: str) -> str:
+    """Deterministic answer to one of the pipeline's prompts."""
+    if "mapping every article id" in prompt:
+        titles = re.findall(r"^\s*\[id: (\d+)\]\s*\n\s*Title: (.*)$", prompt, re.MULTILINE)
+        return json.dumps({idx: relevance_score(title) for idx, title in titles})
+    if "single float number" in prompt:
+        return str(relevance_score(_field(prompt, "Article Title")))
+    if '{"summary": "...", "insight": "..."}' in prompt:
+        title = _field(prompt, "Title")
+        return json.dumps({
+            "summary": _summary(title, "research paper" in prompt),
+            "insight": f"{title}의 접근법은 실제 서비스의 비용과 품질을 함께 개선할 수 있음을 보여줌.",
+        }, ensure_ascii=False)
+    if "from this part of an article" in prompt:
+        return f"- {_field(prompt, 'Title')}: 핵심 기법과 수치 요약"
+    if "technical insight" in prompt:
+        title = _field(prompt, "Article Title")
+        return f"{title}의 접근법은 실제 서비스의 비용과 품질을 함께 개선할 수 있음을 보여줌."
+    if "Summarize the following" in prompt:
+        return _summary(_field(prompt, "Title"), "research paper" in prompt)
+    return "OK"
+
+
+def latency_seconds(prompt: str, latency_ms: float, jitter_ms: float, seed: int = 0) -> float:
+    """Simulated response time: `latency_ms` ± `jitter_ms` (uniform), fixed per prompt and seed."""
+    rng = random.Random(f"{seed}:{prompt}")
+    return max(0.0, latency_ms + rng.uniform(-jitter_ms, jitter_ms)) / 1000
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model answering with `respond` after a simulated delay (sleeps; async calls do not block)."""
+
+    model_name: str = FAKE_MODEL
+    latency_ms: float = 100.0
+    jitter_ms: float = 0.0
+    seed: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return FAKE_MODEL
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"model_name": self.model_name, "latency_ms": self.latency_ms, "jitter_ms": self.jitter_ms}
+
+    def _prompt(self, messages) -> str:
+        return "\n".join(str(message.content) for message in messages)
+
+    def _result(self, prompt: str) -> ChatResult:
+        text = respond(prompt)
+        usage = {"prompt_tokens": count_tokens(prompt), "completion_tokens": count_tokens(text)}
+        message = AIMessage(content=text, usage_metadata={
+            "input_tokens": usage["prompt_tokens"],
+            "output_tokens": usage["completion_tokens"],
+            "total_tokens": usage["prompt_tokens"] + usage["completion_tokens"],
+        })
+        return ChatResult(
+            generations=[ChatGeneration(message=message)],
+            llm_output={"token_usage": usage, "model_name": self.model_name},
+        )
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        prompt = self._prompt(messages)
+        time.sleep(latency_seconds(prompt, self.latency_ms, self.jitter_ms, self.seed))
+        return self._result(prompt)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        prompt = self._prompt(messages)
+        await asyncio.sleep(latency_seconds(prompt, self.latency_ms, self.jitter_ms, self.seed))
+        return self._result(prompt)
+
+
+class FakeEmbeddings(Embeddings):
+    """Hashed bag-of-words vectors: texts sharing words are similar, so topic clustering is meaningful."""
+
+    def __init__(self, dimensions: int = 256, latency_ms: float = 0.0):
+        self.dimensions = dimensions
+        self.latency_ms = latency_ms
+
+    def _vector(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        for word in re.findall(r"\w+", text.lower()):
+            digest = int(hashlib.md5(word.encode("utf-8")).hexdigest()[:8], 16)
+            vector[digest % self.dimensions] += 1.0 if digest & 1 << 31 else -1.0
+        return vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.latency_ms / 1000)
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
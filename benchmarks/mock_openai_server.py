@@ -0,0 +1,342 @@
+"""Local OpenAI-compatible server for load-testing the LLM stages without API costs.
+
+Implements the parts of the REST API that ChatOpenAI and OpenAIEmbeddings use:
+
+    POST /v1/chat/completions  deterministic answers per prompt (see fake_llm.respond), optionally streamed
+    POST /v1/embeddings        hashed bag-of-words vectors, as floats or base64
+    GET  /v1/models            the models seen so far
+    GET  /stats                request, 429, token and concurrency counters
+
+Every response waits for a latency drawn from the chosen distribution (plus
+an optional cost per completion token). Requests over the simulated account
+limits (requests and tokens per minute, sliding window) get a 429 with
+Retry-After and x-ratelimit-* headers like the real API; --random-429 adds
+rate-limit errors at a fixed rate on top.
+
+Usage:
+    python benchmarks/mock_openai_server.py --port 8089 --latency lognormal --latency-ms 400 --rpm 500
+    OPENAI_BASE_URL=http://127.0.0.1:8089/v1 OPENAI_API_KEY=sk-mock python src/main.py
+    python benchmarks/bench_pipeline.py --llm-url http://127.0.0.1:8089/v1
+"""
+import argparse
+import base64
+import json
+import math
+import os
+import random
+import struct
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fake_llm import FakeEmbeddings, count_tokens, respond
+
+DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+
+class LatencyModel:
+    """Response time: a draw around `median_ms` (`spread` is the relative width, or the
+    log-space sigma for lognormal) plus `ms_per_token` per completion token."""
+
+    def __init__(self, distribution: str = "fixed", median_ms: float = 200.0, spread: float = 0.5,
+                 ms_per_token: float = 0.0, seed: int = 0):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.distribution = distribution
+        self.median_ms = median_ms
+        self.spread = spread
+        self.ms_per_token = ms_per_token
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self, completion_tokens: int = 0) -> float:
+        with self._lock:
+            if self.distribution == "uniform":
+                ms = self.median_ms * (1 + self._rng.uniform(-self.spread, self.spread))
+            elif self.distribution == "normal":
+                ms = self._rng.gauss(self.median_ms, self.median_ms * self.spread)
+            elif self.distribution == "lognormal":
+                # Long right tail, like real completion latencies
+                ms = self.median_ms * math.exp(self._rng.gauss(0.0, self.spread))
+            else:
+                ms = self.median_ms
+        return max(0.0, ms + self.ms_per_token * completion_tokens) / 1000
+
+
+class RateLimits:
+    """Sliding one-minute window over requests and tokens, like an OpenAI account tier."""
+
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests: deque = deque()  # (timestamp, tokens)
+        self._tokens = 0
+        self._lock = threading.Lock()
+
+    def admit(self, tokens: int) -> tuple:
+        """Returns (admitted, retry_after_seconds, headers)."""
+        now = time.monotonic()
+        with self._lock:
+            while self._requests and now - self._requests[0][0] >= 60:
+                self._tokens -= self._requests.popleft()[1]
+            over_requests = self.rpm is not None and len(self._requests) >= self.rpm
+            over_tokens = self.tpm is not None and self._tokens + tokens > self.tpm and bool(self._requests)
+            if not over_requests and not over_tokens:
+                self._requests.append((now, tokens))
+                self._tokens += tokens
+            retry_after = 60 - (now - self._requests[0][0]) if self._requests else 0.0
+            headers = {}
+            if self.rpm is not None:
+                headers["x-ratelimit-limit-requests"] = str(self.rpm)
+                headers["x-ratelimit-remaining-requests"] = str(max(0, self.rpm - len(self._requests)))
+            if self.tpm is not None:
+                headers["x-ratelimit-limit-tokens"] = str(self.tpm)
+                headers["x-ratelimit-remaining-tokens"] = str(max(0, self.tpm - self._tokens))
+            return not (over_requests or over_tokens), retry_after, headers
+
+
+class MockOpenAIServer:
+    """The mock server; `start()` serves from a background thread (for in-process benchmarks)."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: Optional[LatencyModel] = None,
+        limits: Optional[RateLimits] = None,
+        random_429: float = 0.0,
+        seed: int = 0,
+        verbose: bool = False,
+    ):
+        self.latency = latency or LatencyModel()
+        self.limits = limits or RateLimits()
+        self.random_429 = random_429
+        self.verbose = verbose
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counters = {
+            "requests": 0, "chat_completions": 0, "embeddings": 0, "rate_limited": 0,
+            "prompt_tokens": 0, "completion_tokens": 0, "in_flight": 0, "max_in_flight": 0,
+        }
+        self.models = set()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockOpenAIServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._counters)
+
+    def _count(self, **deltas):
+        with self._lock:
+            for key, delta in deltas.items():
+                self._counters[key] += delta
+            self._counters["max_in_flight"] = max(self._counters["max_in_flight"], self._counters["in_flight"])
+
+    def _throttled(self, tokens: int) -> Optional[tuple]:
+        """None if the request may proceed, else (retry_after, headers, message) for a 429."""
+        admitted, retry_after, headers = self.limits.admit(tokens)
+        if not admitted:
+            return retry_after, headers, "Rate limit reached for requests (simulated)"
+        with self._lock:
+            overloaded = self._rng.random() < self.random_429
+        if overloaded:
+            return 1.0, headers, "Rate limit reached (simulated random 429)"
+        return None
+
+    @staticmethod
+    def _message_text(content) -> str:
+        if isinstance(content, list):  # content parts
+            return "\n".join(part.get("text", "") for part in content if isinstance(part, dict))
+        return content or ""
+
+    def chat_completion(self, body: dict) -> tuple:
+        """Returns (status, payload, headers, delay) for a chat completion request."""
+        model = body.get("model", "mock-model")
+        prompt = "\n".join(self._message_text(m.get("content")) for m in body.get("messages", []))
+        text = respond(prompt)
+        usage = {"prompt_tokens": count_tokens(prompt), "completion_tokens": count_tokens(text)}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        throttled = self._throttled(usage["prompt_tokens"] + (body.get("max_tokens") or usage["completion_tokens"]))
+        if throttled:
+            return self._rate_limited(*throttled)
+        self.models.add(model)
+        self._count(chat_completions=1, prompt_tokens=usage["prompt_tokens"],
+                    completion_tokens=usage["completion_tokens"])
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        delay = self.latency.sample(usage["completion_tokens"])
+        if body.get("stream"):
+            base = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model}
+            chunks = [
+                {**base, "choices": [{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}]},
+                {**base, "choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}]},
+                {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]},
+            ]
+            if (body.get("stream_options") or {}).get("include_usage"):
+                chunks.append({**base, "choices": [], "usage": usage})
+            events = "".join(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n" for chunk in chunks)
+            return 200, events + "data: [DONE]\n\n", {"Content-Type": "text/event-stream"}, delay
+
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "logprobs": None,
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        }
+        return 200, payload, {}, delay
+
+    def embeddings(self, body: dict) -> tuple:
+        items = body.get("input", [])
+        # A single string or a single token list is one input
+        if isinstance(items, str) or (items and isinstance(items[0], int)):
+            items = [items]
+        texts: List[str] = [item if isinstance(item, str) else " ".join(map(str, item)) for item in items]
+        tokens = sum(count_tokens(text) for text in texts)
+
+        throttled = self._throttled(tokens)
+        if throttled:
+            return self._rate_limited(*throttled)
+        model = body.get("model", "mock-embedding")
+        self.models.add(model)
+        self._count(embeddings=1, prompt_tokens=tokens)
+
+        embedder = FakeEmbeddings(dimensions=body.get("dimensions") or 256)
+        data = []
+        for index, text in enumerate(texts):
+            vector = embedder._vector(text)
+            if body.get("encoding_format") == "base64":
+                vector = base64.b64encode(struct.pack(f"<{len(vector)}f", *vector)).decode("ascii")
+            data.append({"object": "embedding", "index": index, "embedding": vector})
+        payload = {"object": "list", "data": data, "model": model,
+                   "usage": {"prompt_tokens": tokens, "total_tokens": tokens}}
+        return 200, payload, {}, self.latency.sample()
+
+    def _rate_limited(self, retry_after: float, headers: dict, message: str) -> tuple:
+        self._count(rate_limited=1)
+        headers = {**headers, "Retry-After": str(max(1, math.ceil(retry_after))),
+                   "retry-after-ms": str(int(retry_after * 1000))}
+        payload = {"error": {"message": message, "type": "requests", "param": None, "code": "rate_limit_exceeded"}}
+        # Rejections are fast, like the real API
+        return 429, payload, headers, 0.0
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, so clients reuse their pooled connections
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, status: int, payload, headers: Optional[dict] = None):
+                body = payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False)
+                data = body.encode("utf-8")
+                self.send_response(status)
+                headers = {"Content-Type": "application/json", **(headers or {})}
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path.rstrip("/") == "/stats":
+                    return self._send(200, server.stats())
+                if self.path.rstrip("/") in ("/v1/models", "/models"):
+                    models = [{"id": m, "object": "model", "owned_by": "mock"} for m in sorted(server.models)]
+                    return self._send(200, {"object": "list", "data": models})
+                self._send(404, {"error": {"message": f"Unknown path {self.path}", "type": "invalid_request_error"}})
+
+            def do_POST(self):
+                try:
+                    body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                except json.JSONDecodeError as e:
+                    return self._send(400, {"error": {"message": str(e), "type": "invalid_request_error"}})
+                path = self.path.split("?", 1)[0].rstrip("/")
+                if path.endswith("/chat/completions"):
+                    handler = server.chat_completion
+                elif path.endswith("/embeddings"):
+                    handler = server.embeddings
+                else:
+                    return self._send(404, {"error": {"message": f"Unknown path {self.path}",
+                                                      "type": "invalid_request_error"}})
+                server._count(requests=1, in_flight=1)
+                try:
+                    status, payload, headers, delay = handler(body)
+                    time.sleep(delay)
+                    self._send(status, payload, headers)
+                finally:
+                    server._count(in_flight=-1)
+
+            def log_message(self, format, *args):
+                if server.verbose:
+                    super().log_message(format, *args)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible mock server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", choices=DISTRIBUTIONS, default="lognormal", help="latency distribution")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="median latency")
+    parser.add_argument("--spread", type=float, default=0.5,
+                        help="relative width (uniform/normal) or log-space sigma (lognormal)")
+    parser.add_argument("--ms-per-token", type=float, default=0.0, help="extra latency per completion token")
+    parser.add_argument("--rpm", type=int, help="requests per minute before 429s")
+    parser.add_argument("--tpm", type=int, help="tokens per minute before 429s")
+    parser.add_argument("--random-429", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    server = MockOpenAIServer(
+        host=args.host,
+        port=args.port,
+        latency=LatencyModel(args.latency, args.latency_ms, args.spread, args.ms_per_token, seed=args.seed),
+        limits=RateLimits(rpm=args.rpm, tpm=args.tpm),
+        random_429=args.random_429,
+        seed=args.seed,
+        verbose=args.verbose,
+    )
+    print(f"Mock OpenAI server listening on {server.url} (OPENAI_BASE_URL={server.url})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(json.dumps(server.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,18 @@
-import requests
+import httpx
 from bs4 import BeautifulSoup
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from dateutil import parser as date_parser
 from typing import List, Optional
 import yaml
 
 from src.collectors.base import BaseCollector
+from src.collectors.flight_parser import iter_flight_posts
+from src.collectors.html_extract import meta_content, next_data_json
 from src.state import Article
+from src.utils.http_client import get_http_client
 
 
 class AnthropicNewsCollector(BaseCollector):
@@ -29,6 +33,9 @@ class AnthropicNewsCollector(BaseCollector):
         self.lookback_days = collector_cfg.get("anthropic_lookback_days", 3)
         self.max_results = collector_cfg.get("anthropic_max_results", 10)
         self.pages = collector_cfg.get("anthropic_pages", self.DEFAULT_PAGES)
+        # Detail pages fetched at once (politeness toward anthropic.com)
+        self.max_workers = max(1, collector_cfg.get("anthropic_max_workers", 4))
+        self.http = get_http_client(self.config.get("http", {}))
 
     def _load_config(self, path: str) -> dict:
         try:
@@ -38,85 +45,91 @@ class AnthropicNewsCollector(BaseCollector):
             return {}
 
     def fetch_data(self) -> List[Article]:
-        """Fetch recent articles from configured Anthropic pages."""
+        """Fetch recent articles from configured Anthropic pages.
+
+        Listing pages are parsed first and candidates are date-filtered and
+        deduplicated; only then are the detail pages fetched, concurrently.
+        The first listing page is read alone, and the others only if it did
+        not yield `max_results` candidates.
+        """
         cutoff = datetime.now().astimezone() - timedelta(days=self.lookback_days)
         seen_slugs: set = set()
+        candidates: List[dict] = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            first, rest = self.pages[:1], self.pages[1:]
+            for pages in (first, rest):
+                if not pages or len(candidates) >= self.max_results:
+                    break
+                listing_pages = list(pool.map(lambda path: self._get_page(f"{self.BASE_URL}{path}"), pages))
+                for page_path, html in zip(pages, listing_pages):
+                    if html:
+                        self._add_candidates(html, page_path, cutoff, seen_slugs, candidates)
+
+            # Detail pages in parallel; the shared HTTP client also caps in-flight requests per host
+            contents = list(pool.map(lambda post: self._fetch_article_content(post["url"]), candidates))
+
         articles: List[Article] = []
+        for post, content in zip(candidates, contents):
+            if not content:
+                content = post.get("summary") or post.get("title", "")
+            url = post.pop("url")
+            articles.append(Article(
+                source="anthropic",
+                title=post.get("title", ""),
+                url=url,
+                content=content,
+                author="Anthropic",
+                date=post.get("date"),
+                category=post.get("category", "anthropic-news"),
+                raw_data=post,
+            ))
 
-        for page_path in self.pages:
-            if len(articles) >= self.max_results:
+        print(f"[AnthropicNewsCollector] Fetched {len(articles)} articles from {len(self.pages)} pages")
+        return articles
+
+    def _add_candidates(self, html: str, page_path: str, cutoff: datetime, seen_slugs: set, candidates: List[dict]):
+        """Appends the listing page's recent, not yet seen posts to `candidates`, up to `max_results`."""
+        for post in self._extract_posts(html, page_path):
+            if len(candidates) >= self.max_results:
                 break
 
-            page_url = f"{self.BASE_URL}{page_path}"
-            html = self._get_page(page_url)
-            if not html:
+            slug = post.get("slug", "")
+            if not slug or slug in seen_slugs:
                 continue
 
-            raw_posts = self._extract_posts(html, page_path)
+            # Date filtering
+            date_str = post.get("date")
+            if date_str:
+                try:
+                    dt = date_parser.parse(date_str)
+                    if not dt.tzinfo:
+                        dt = dt.astimezone()
+                    if dt < cutoff:
+                        continue
+                except (ValueError, TypeError):
+                    pass
 
-            for post in raw_posts:
-                if len(articles) >= self.max_results:
-                    break
+            seen_slugs.add(slug)
 
-                slug = post.get("slug", "")
-                if not slug or slug in seen_slugs:
-                    continue
-
-                # Date filtering
-                date_str = post.get("date")
-                if date_str:
-                    try:
-                        dt = date_parser.parse(date_str)
-                        if not dt.tzinfo:
-                            dt = dt.astimezone()
-                        if dt < cutoff:
-                            continue
-                    except (ValueError, TypeError):
-                        pass
-
-                seen_slugs.add(slug)
-
-                # Determine URL from directories field or page path
-                url_prefix = post.get("url_prefix", page_path)
-                url = f"{self.BASE_URL}{url_prefix}/{slug}"
-
-                # Fetch individual article page for content
-                content = self._fetch_article_content(url)
-                if not content:
-                    content = post.get("summary") or post.get("title", "")
-
-                articles.append(Article(
-                    source="anthropic",
-                    title=post.get("title", ""),
-                    url=url,
-                    content=content,
-                    author="Anthropic",
-                    date=date_str,
-                    category=post.get("category", "anthropic-news"),
-                    raw_data=post,
-                ))
-
-        print(f"[AnthropicNewsCollector] Fetched {len(articles)} articles from {len(self.pages)} pages")
-        return articles
+            # Determine URL from directories field or page path
+            url_prefix = post.get("url_prefix", page_path)
+            candidates.append({**post, "url": f"{self.BASE_URL}{url_prefix}/{slug}"})
 
     def _get_page(self, url: str) -> Optional[str]:
         """Fetch a page with error handling."""
         try:
-            resp = requests.get(url, timeout=30, headers={
-                "User-Agent": "Mozilla/5.0 (compatible; InsightBot/1.0)"
-            })
+            resp = self.http.get(url)
             resp.raise_for_status()
             return resp.text
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"[AnthropicNewsCollector] Failed to fetch {url}: {e}")
             return None
 
     def _extract_posts(self, html: str, page_path: str) -> List[dict]:
         """Extract post data from Next.js page source using multiple strategies."""
-        soup = BeautifulSoup(html, 'html.parser')
-
         # Strategy 1: __NEXT_DATA__ JSON (traditional Next.js)
-        posts = self._try_next_data(soup)
+        posts = self._try_next_data(html)
         if posts:
             return posts
 
@@ -125,16 +138,16 @@ class AnthropicNewsCollector(BaseCollector):
         if posts:
             return posts
 
-        # Strategy 3: Fallback to HTML link parsing
-        return self._parse_html_links(soup, page_path)
+        # Strategy 3: Fallback to HTML link parsing (the only strategy that needs a full parse)
+        return self._parse_html_links(BeautifulSoup(html, 'html.parser'), page_path)
 
-    def _try_next_data(self, soup: BeautifulSoup) -> List[dict]:
+    def _try_next_data(self, html: str) -> List[dict]:
         """Try to extract posts from __NEXT_DATA__ script tag."""
-        script = soup.find('script', id='__NEXT_DATA__')
-        if not script or not script.string:
+        script = next_data_json(html)
+        if not script:
             return []
         try:
-            data = json.loads(script.string)
+            data = json.loads(script)
             page_props = data.get("props", {}).get("pageProps", {})
             for key in ["posts", "articles", "publications", "items"]:
                 items = page_props.get(key)
@@ -153,78 +166,9 @@ class AnthropicNewsCollector(BaseCollector):
           - date: "publishedOn":"2026-02-05T18:00:00.000Z"
           - directories: [{"value":"research"}, {"value":"news"}]
           - subjects: [{"label":"Announcements","value":"announcements"}]
+        See ``flight_parser`` for the single-pass decoder.
         """
-        chunks = re.findall(
-            r'self\.__next_f\.push\(\[\d+,"(.*?)"\]\)',
-            html,
-            re.DOTALL,
-        )
-        if not chunks:
-            return []
-
-        # Concatenate and unescape all Flight data
-        raw = ""
-        for chunk in chunks:
-            raw += chunk.replace('\\"', '"').replace('\\n', '\n').replace('\\t', '\t')
-
-        posts = []
-        seen_slugs = set()
-
-        # Sanity CMS uses "publishedOn" + nested slug: {"current":"<value>"}
-        for match in re.finditer(r'"publishedOn"\s*:\s*"([^"]+)"', raw):
-            date_str = match.group(1)
-
-            # Look in a surrounding window for related fields
-            start = max(0, match.start() - 300)
-            end = min(len(raw), match.end() + 1500)
-            window = raw[start:end]
-
-            # Sanity slug format: "slug":{"_type":"slug","current":"<value>"}
-            slug_m = re.search(r'"current"\s*:\s*"([\w-]+)"', window)
-            if not slug_m:
-                continue
-
-            slug = slug_m.group(1)
-            if slug in seen_slugs:
-                continue
-            seen_slugs.add(slug)
-
-            title_m = re.search(r'"title"\s*:\s*"([^"]+)"', window)
-            if not title_m:
-                continue
-
-            summary_m = re.search(r'"summary"\s*:\s*"([^"]*)"', window)
-            # Sanity subjects: "label":"Announcements"
-            label_m = re.search(r'"label"\s*:\s*"([^"]*)"', window)
-
-            # Determine URL prefix from Sanity directories field
-            url_prefix = self._extract_url_prefix(window, page_path)
-
-            posts.append({
-                "slug": slug,
-                "title": title_m.group(1),
-                "date": date_str,
-                "summary": summary_m.group(1) if summary_m else None,
-                "category": label_m.group(1).lower() if label_m else "anthropic-news",
-                "url_prefix": url_prefix,
-            })
-
-        return posts
-
-    @staticmethod
-    def _extract_url_prefix(window: str, default_path: str) -> str:
-        """Extract the URL path prefix from Sanity directories field.
-
-        Sanity stores directories as:
-          "directories":[{"_key":"research","value":"research"},{"_key":"news","value":"news"}]
-        The first directory value is used as the URL prefix.
-        """
-        dirs_m = re.search(r'"directories"\s*:\s*\[([^\]]*)\]', window)
-        if dirs_m:
-            first_val = re.search(r'"value"\s*:\s*"([\w-]+)"', dirs_m.group(1))
-            if first_val:
-                return f"/{first_val.group(1)}"
-        return default_path
+        return list(iter_flight_posts(html, page_path))
 
     def _parse_html_links(self, soup: BeautifulSoup, page_path: str) -> List[dict]:
         """Fallback: extract article links from HTML anchor tags."""
@@ -258,24 +202,23 @@ class AnthropicNewsCollector(BaseCollector):
         """Fetch content from an individual article page via meta tags.
 
         Meta description / og:description are reliably present in SSR pages
-        even when the body content is client-rendered.
+        even when the body content is client-rendered. They are read from
+        <head> alone; the whole page is only parsed when they are missing.
         """
         html = self._get_page(url)
         if not html:
             return None
 
-        soup = BeautifulSoup(html, 'html.parser')
-
         # Try meta description
         for attr in [
             {'name': 'description'},
             {'property': 'og:description'},
         ]:
-            tag = soup.find('meta', attrs=attr)
-            if tag:
-                content = tag.get('content', '').strip()
-                if len(content) > 30:
-                    return content
+            content = (meta_content(html, [attr]) or '').strip()
+            if len(content) > 30:
+                return content
+
+        soup = BeautifulSoup(html, 'html.parser')
 
         # Try parsing visible text from main/article element
         for container_tag in ['article', 'main']:
@@ -1,9 +1,14 @@
 import arxiv
+import heapq
+import math
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import yaml
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional
 from src.collectors.base import BaseCollector
 from src.state import Article
+from src.storage.arxiv_store import ArxivStore
+from src.utils.rate_limiter import TokenBucket
 import os
 
 class ArxivCollector(BaseCollector):
@@ -11,6 +16,20 @@ class ArxivCollector(BaseCollector):
         self.config = self._load_config(config_path)
         self.categories = self.config.get("collector", {}).get("arxiv_categories", ["cs.AI", "cs.LG", "cs.CL"])
         self.lookback_days = self.config.get("collector", {}).get("arxiv_lookback_days", 3)  # 기본 3일
+        # Incremental mode: page each category down to its persisted watermark and serve from the local store
+        self.incremental = self.config.get("collector", {}).get("arxiv_incremental", True)
+        self.store_path = self.config.get("collector", {}).get("arxiv_store_path", "data/arxiv.sqlite")
+        self.page_size = self.config.get("collector", {}).get("arxiv_page_size", 100)
+        self.max_fetch = self.config.get("collector", {}).get("arxiv_max_fetch", 2000)
+        self.max_results = self.config.get("collector", {}).get("arxiv_max_results", 10)
+        # Per-category cap on returned papers so a busy category cannot crowd out the others
+        self.category_quota = self.config.get("collector", {}).get("arxiv_category_quota") or \
+            math.ceil(self.max_results / max(1, len(self.categories)))
+        # Categories are queried in parallel, but every API page request shares one limiter
+        # (arXiv asks for at most one request every 3 seconds)
+        self.rate_limiter = TokenBucket(
+            self.config.get("collector", {}).get("arxiv_requests_per_minute", 20), capacity=1
+        )
 
     def _load_config(self, path: str) -> dict:
         try:
@@ -20,48 +39,164 @@ class ArxivCollector(BaseCollector):
             return {}
 
     def fetch_data(self) -> List[Article]:
+        if self.incremental:
+            return self._fetch_incremental()
+        return self._fetch_latest()
+
+    def _new_client(self) -> arxiv.Client:
+        # Pacing is done by the shared rate limiter, so the client's own per-instance delay is disabled
+        return arxiv.Client(page_size=self.page_size, delay_seconds=0)
+
+    def _paced(self, results: Iterable) -> Iterator:
+        """Yields from an `arxiv.Client.results` generator, taking a rate-limit token before each page request."""
+        iterator = iter(results)
+        count = 0
+        while True:
+            if count % self.page_size == 0:
+                self.rate_limiter.acquire()
+            try:
+                result = next(iterator)
+            except StopIteration:
+                return
+            count += 1
+            yield result
+
+    def _per_category(self, fn) -> List:
+        """Runs `fn(category)` for every category in parallel, returning results in category order."""
+        with ThreadPoolExecutor(max_workers=max(1, len(self.categories))) as pool:
+            return list(pool.map(fn, self.categories))
+
+    def _merge(self, per_category: List[List[Article]]) -> List[Article]:
+        """K-way merges newest-first category lists, dropping cross-listed duplicates, up to `arxiv_max_results`."""
         articles = []
-        # Calculate time range: last 24 hours
-        # arxiv date filtering is a bit complex in search query, usually better to fetch recent and filter
-        # But we can try submittedDate
-        
-        # Construct query for multiple categories
-        query = " OR ".join([f"cat:{cat}" for cat in self.categories])
-        
-        max_results = self.config.get("collector", {}).get("arxiv_max_results", 10)
-
-        client = arxiv.Client()
+        seen_ids = set()
+        for article in heapq.merge(*per_category, key=lambda a: a.date, reverse=True):
+            entry_id = article.raw_data["entry_id"]
+            if entry_id in seen_ids:
+                continue
+            seen_ids.add(entry_id)
+            articles.append(article)
+            if len(articles) >= self.max_results:
+                break
+        return articles
+
+    def _fetch_incremental(self) -> List[Article]:
+        """Harvests new entries per category into the local store, then returns the lookback window from it."""
+        store = ArxivStore(self.store_path)
+        cutoff = datetime.now(datetime.now().astimezone().tzinfo) - timedelta(days=self.lookback_days)
+
+        def harvest(category: str) -> List[Article]:
+            fetched = self._harvest_category(self._new_client(), store, category, cutoff)
+            print(f"[ArxivCollector] {category}: {fetched} new entries")
+            return [self._to_article(entry) for entry in store.entries([category], cutoff, limit=self.category_quota)]
+
+        return self._merge(self._per_category(harvest))
+
+    def _harvest_category(self, client: arxiv.Client, store: ArxivStore, category: str, cutoff: datetime) -> int:
+        """Pages newest-first until the watermark (or the lookback cutoff); returns the number of entries fetched."""
+        mark = store.watermark(category)
+        # Cold start (empty store, e.g. a fresh CI checkout): read only the newest `category_quota` entries,
+        # one request like the non-incremental mode, instead of paging the whole lookback window within the
+        # collector deadline. Only the span of those entries counts as covered; later runs backfill to the cutoff.
+        cold = mark is None
+        # Below the covered floor we still need older entries, so the watermark cannot stop the scan
+        covered = mark is not None and mark["floor"] <= cutoff
         search = arxiv.Search(
-            query=query,
-            max_results=max_results,
+            query=f"cat:{category}",
+            max_results=self.category_quota if cold else self.max_fetch,
             sort_by=arxiv.SortCriterion.SubmittedDate,
             sort_order=arxiv.SortOrder.Descending
         )
-        
+
+        entries = []
+        complete = False  # reached the watermark, the cutoff or the end of the results
+        reached_cutoff = False
+        for result in self._paced(client.results(search)):
+            if result.published < cutoff:
+                complete = reached_cutoff = True
+                break
+            if covered and (result.entry_id == mark["entry_id"] or result.published < mark["published"]):
+                complete = True
+                break
+            entries.append({
+                "entry_id": result.entry_id,
+                "title": result.title,
+                "summary": result.summary,
+                "authors": ", ".join([a.name for a in result.authors]),
+                "pdf_url": result.pdf_url,
+                "primary_category": result.primary_category,
+                "published": result.published,
+            })
+        else:
+            complete = True
+        # A full quota page that did not reach the cutoff leaves older in-window entries unread
+        partial = cold and not reached_cutoff and len(entries) >= self.category_quota
+        store.upsert(category, entries)
+
+        if not complete:
+            # Entries between the last page and the watermark are missing; keep the old watermark so the next run retries
+            print(f"[ArxivCollector] {category}: stopped after {self.max_fetch} entries (arxiv_max_fetch)")
+            return len(entries)
+
+        newest = max(entries, key=lambda e: e["published"], default=None)
+        if newest is None and mark is None:
+            return 0
+        if mark is None or (newest and newest["published"] >= mark["published"]):
+            entry_id, published = newest["entry_id"], newest["published"]
+        else:
+            entry_id, published = mark["entry_id"], mark["published"]
+        if partial:
+            floor = min(e["published"] for e in entries)
+        else:
+            floor = min(mark["floor"], cutoff) if mark else cutoff
+        store.set_watermark(category, entry_id, published, floor)
+        return len(entries)
+
+    @staticmethod
+    def _to_article(entry: dict) -> Article:
+        return Article(
+            source="arxiv",
+            title=entry["title"],
+            url=entry["pdf_url"],
+            content=entry["summary"],
+            author=entry["authors"],
+            date=entry["published"],
+            category=entry["primary_category"],
+            raw_data={"entry_id": entry["entry_id"]}
+        )
+
+    def _fetch_latest(self) -> List[Article]:
+        """Non-incremental mode: the newest `arxiv_category_quota` papers of each category."""
         cutoff_date = datetime.now(datetime.now().astimezone().tzinfo) - timedelta(days=self.lookback_days)
+        return self._merge(self._per_category(lambda category: self._fetch_category_latest(category, cutoff_date)))
+
+    def _fetch_category_latest(self, category: str, cutoff_date: datetime) -> List[Article]:
+        articles = []
+        client = self._new_client()
+        search = arxiv.Search(
+            query=f"cat:{category}",
+            max_results=self.category_quota,
+            sort_by=arxiv.SortCriterion.SubmittedDate,
+            sort_order=arxiv.SortOrder.Descending
+        )
+
+        for result in self._paced(client.results(search)):
+            # Sorted by date descending, so we can stop at the first paper older than the lookback
+            if result.published < cutoff_date:
+                break
 
-        for result in client.results(search):
-            published_date = result.published
-            # Ensure timezone awareness compatibility
-            if published_date < cutoff_date:
-                 # Since it's sorted by date descending, we can stop early if we hit older papers
-                 # However, ArXiv updates are batched, so safe to check a bit more or just filter
-                 break
-            
             # ArXiv results are already timezone aware
-            if result.published >= cutoff_date:
-                article = Article(
-                    source="arxiv",
-                    title=result.title,
-                    url=result.pdf_url,
-                    content=result.summary,
-                    author=", ".join([a.name for a in result.authors]),
-                    date=result.published.isoformat(),
-                    category=result.primary_category,
-                    raw_data={"entry_id": result.entry_id}
-                )
-                articles.append(article)
-                
+            articles.append(Article(
+                source="arxiv",
+                title=result.title,
+                url=result.pdf_url,
+                content=result.summary,
+                author=", ".join([a.name for a in result.authors]),
+                date=result.published.isoformat(),
+                category=result.primary_category,
+                raw_data={"entry_id": result.entry_id}
+            ))
+
         return articles
 
 if __name__ == "__main__":
@@ -7,3 +7,8 @@ class BaseCollector(ABC):
     def fetch_data(self) -> List[Article]:
         """Fetches data from the source and returns a list of Article objects."""
         pass
+
+    def commit_state(self):
+        """Persists source state staged by `fetch_data` (e.g. feed validators). Called once the run has
+        published, so an aborted run fetches the same items again next time."""
+        pass
@@ -0,0 +1,139 @@
+import asyncio
+import threading
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from src.collectors.base import BaseCollector
+from src.state import Article
+
+
+class CollectorExecutor:
+    """Runs every registered collector concurrently.
+
+    Each collector runs in its own daemon thread and is given a timeout measured
+    from the common start time. Collectors that raise or time out contribute no
+    articles, but never block the results of the others (partial results).
+    """
+
+    def __init__(
+        self,
+        collectors: Dict[str, BaseCollector],
+        default_timeout: float = 120.0,
+        timeouts: Optional[Dict[str, float]] = None,
+    ):
+        self.collectors = collectors
+        self.default_timeout = default_timeout
+        self.timeouts = timeouts or {}
+        # Collectors whose articles the last run used; only their staged state may be committed
+        self._used: set = set()
+
+    def run(self) -> Tuple[List[Article], Dict[str, dict]]:
+        """Run all collectors and return (articles, per-collector stats)."""
+        results: Dict[str, dict] = {}
+        threads: Dict[str, threading.Thread] = {}
+        start = time.monotonic()
+        self._used = set()
+
+        for name, collector in self.collectors.items():
+            results[name] = {"status": "running"}
+            thread = threading.Thread(
+                target=self._run_one,
+                args=(name, collector, results[name]),
+                name=f"collector-{name}",
+                daemon=True,
+            )
+            threads[name] = thread
+            thread.start()
+
+        articles: List[Article] = []
+        stats: Dict[str, dict] = {}
+        for name, thread in threads.items():
+            timeout = self.timeouts.get(name, self.default_timeout)
+            thread.join(max(0.0, start + timeout - time.monotonic()))
+            outcome = results[name]
+
+            if thread.is_alive():
+                print(f"[CollectorExecutor] {name} timed out after {timeout}s")
+                stats[name] = {"status": "timeout", "articles": 0, "latency_s": round(timeout, 3), "error": None}
+                continue
+
+            items = outcome.get("articles", [])
+            articles.extend(items)
+            stats[name] = self._stats(outcome)
+            if outcome["status"] == "ok":
+                self._used.add(name)
+
+        return articles, stats
+
+    async def astream(self) -> AsyncIterator[Tuple[str, List[Article], dict]]:
+        """Like `run`, but yields (name, articles, stats) for each collector as soon as it finishes or times out."""
+        loop = asyncio.get_running_loop()
+        finished: asyncio.Queue = asyncio.Queue()
+        outcomes: Dict[str, dict] = {}
+        start = time.monotonic()
+        self._used = set()
+
+        def target(name: str, collector: BaseCollector):
+            self._run_one(name, collector, outcomes[name])
+            try:
+                loop.call_soon_threadsafe(finished.put_nowait, name)
+            except RuntimeError:
+                pass  # the loop is gone: this collector was already reported as timed out
+
+        for name, collector in self.collectors.items():
+            outcomes[name] = {"status": "running"}
+            threading.Thread(target=target, args=(name, collector), name=f"collector-{name}", daemon=True).start()
+
+        pending = set(self.collectors)
+        while pending:
+            deadlines = {name: start + self.timeouts.get(name, self.default_timeout) for name in pending}
+            try:
+                name = await asyncio.wait_for(finished.get(), max(0.0, min(deadlines.values()) - time.monotonic()))
+            except asyncio.TimeoutError:
+                now = time.monotonic()
+                for name in [n for n, deadline in deadlines.items() if deadline <= now]:
+                    pending.discard(name)
+                    timeout = self.timeouts.get(name, self.default_timeout)
+                    print(f"[CollectorExecutor] {name} timed out after {timeout}s")
+                    yield name, [], {"status": "timeout", "articles": 0, "latency_s": round(timeout, 3), "error": None}
+                continue
+
+            if name in pending:
+                pending.discard(name)
+                if outcomes[name]["status"] == "ok":
+                    self._used.add(name)
+                yield name, outcomes[name].get("articles", []), self._stats(outcomes[name])
+
+    def commit_state(self):
+        """Persists the staged state (see `BaseCollector.commit_state`) of the collectors whose articles the
+        last `run`/`astream` returned. A collector that failed or timed out may still stage state from a
+        late-finishing thread, for articles this run never saw, so it is skipped."""
+        for name, collector in self.collectors.items():
+            if name not in self._used:
+                continue
+            try:
+                collector.commit_state()
+            except Exception as e:
+                print(f"[CollectorExecutor] {name} failed to save its state: {e}")
+
+    @staticmethod
+    def _stats(outcome: dict) -> dict:
+        return {
+            "status": outcome["status"],
+            "articles": len(outcome.get("articles", [])),
+            "latency_s": round(outcome["latency_s"], 3),
+            "error": outcome.get("error"),
+        }
+
+    @staticmethod
+    def _run_one(name: str, collector: BaseCollector, outcome: dict):
+        started = time.monotonic()
+        try:
+            outcome["articles"] = collector.fetch_data()
+            outcome["status"] = "ok"
+        except Exception as e:
+            print(f"[CollectorExecutor] {name} failed: {e}")
+            outcome["articles"] = []
+            outcome["status"] = "error"
+            outcome["error"] = str(e)
+        outcome["latency_s"] = time.monotonic() - started
@@ -0,0 +1,203 @@
+"""Single-pass decoder for Next.js RSC Flight data embedded in HTML pages.
+
+Next.js App Router pages stream their server component payload as a series of
+``self.__next_f.push([1, "<json string>"])`` script calls. Joined together the
+chunks form a stream of rows: ``<id>:<json>`` rows separated by newlines, and
+``<id>:T<hex length>,<text>`` rows carrying raw text. Sanity CMS posts appear
+in the JSON rows as objects with a ``publishedOn`` field, a nested
+``slug.current``, ``subjects[].label`` and ``directories[].value``.
+
+`iter_flight_posts` unescapes each chunk once, walks the stream row by row,
+decodes JSON rows with the C JSON parser and yields posts as they are found.
+Text that is not a well-formed row (e.g. a payload cut mid-record) goes
+through a bracket-aware tokenizer instead, so fields are always attributed to
+the object that actually contains them (no overlapping look-around windows).
+"""
+import json
+import re
+from typing import Dict, Iterator, List, Optional
+
+# Chunk bodies are JSON string literals; the unrolled [^"\\]*(?:\\.[^"\\]*)* form avoids per-character alternation
+CHUNK_RE = re.compile(r'self\.__next_f\.push\(\[\d+,"([^"\\]*(?:\\.[^"\\]*)*)"\]\)', re.DOTALL)
+ROW_RE = re.compile(r"([0-9a-fA-F]+):([A-Z]{0,2})")
+# A JSON string (optionally followed by ':' when it is a key) or a structural bracket
+TOKEN_RE = re.compile(r'"((?:[^"\\]|\\.)*)"(\s*:)?|([{}\[\]])')
+SLUG_RE = re.compile(r"[\w-]+")
+
+
+def _unescape_chunk(chunk: str) -> str:
+    try:
+        return json.loads(f'"{chunk}"')
+    except json.JSONDecodeError:
+        return chunk.replace('\\"', '"').replace('\\n', '\n').replace('\\t', '\t')
+
+
+def _decode_value(value: str) -> str:
+    try:
+        return json.loads(f'"{value}"')
+    except json.JSONDecodeError:
+        return value
+
+
+def _to_post(fields: Dict[str, str], page_path: str) -> Optional[dict]:
+    """Builds a post from flattened record fields ("publishedOn", "slug.current", "subjects.label", ...)."""
+    slug = fields.get("slug.current") or fields.get("current")
+    title = fields.get("title")
+    if not slug or not SLUG_RE.fullmatch(slug) or not title:
+        return None
+
+    # The first Sanity directory decides the URL prefix (/news/ or /research/)
+    directory = fields.get("directories.value")
+    label = fields.get("subjects.label") or fields.get("label")
+    return {
+        "slug": slug,
+        "title": title,
+        "date": fields["publishedOn"],
+        "summary": fields.get("summary"),
+        "category": label.lower() if label else "anthropic-news",
+        "url_prefix": f"/{directory}" if directory and SLUG_RE.fullmatch(directory) else page_path,
+    }
+
+
+def _flatten(record: dict) -> Dict[str, str]:
+    """The string fields `_to_post` reads from a decoded record, keyed like the tokenizer's ("slug.current")."""
+    fields = {key: record[key] for key in ("publishedOn", "title", "summary", "current", "label")
+              if isinstance(record.get(key), str)}
+    for key, child_key in (("slug", "current"), ("directories", "value"), ("subjects", "label")):
+        value = record.get(key)
+        for child in value if isinstance(value, list) else [value]:
+            if isinstance(child, dict) and isinstance(child.get(child_key), str):
+                fields[f"{key}.{child_key}"] = child[child_key]
+                break
+    return fields
+
+
+def _decode_json_records(body: str) -> List[Dict[str, str]]:
+    """Decodes a JSON row, returning the flattened fields of every dated object in it.
+
+    Raises json.JSONDecodeError. The object hook runs inside the C decoder as
+    each object closes, so no second walk over the decoded tree is needed.
+    """
+    records: List[Dict[str, str]] = []
+
+    def hook(obj: dict) -> dict:
+        if isinstance(obj.get("publishedOn"), str):
+            records.append(_flatten(obj))
+        return obj
+
+    json.loads(body, object_hook=hook)
+    return records
+
+
+class _Frame:
+    """An open object or array in the tokenizer; `context` is the key that introduced it."""
+
+    __slots__ = ("context", "fields", "is_array")
+
+    def __init__(self, context: Optional[str], is_array: bool = False):
+        self.context = context
+        self.is_array = is_array
+        self.fields: Dict[str, str] = {}
+
+
+def _iter_token_records(text: str) -> Iterator[Dict[str, str]]:
+    """Fallback for text that is not valid JSON; yields the same flattened fields as `_flatten`."""
+    stack: List[_Frame] = [_Frame(None)]
+    pending_key: Optional[str] = None
+
+    def decoded(fields: Dict[str, str]) -> Dict[str, str]:
+        return {key: _decode_value(value) for key, value in fields.items()}
+
+    for match in TOKEN_RE.finditer(text):
+        string, colon, bracket = match.groups()
+
+        if string is not None:
+            if colon:
+                pending_key = string
+                continue
+            frame = stack[-1]
+            if pending_key and not frame.is_array:
+                if pending_key == "publishedOn" and "publishedOn" in frame.fields:
+                    # Flat (unbracketed) records: a second date starts the next post
+                    yield decoded(frame.fields)
+                    frame.fields = {}
+                frame.fields.setdefault(pending_key, string)
+            pending_key = None
+            continue
+
+        if bracket in "{[":
+            top = stack[-1]
+            stack.append(_Frame(pending_key or (top.context if top.is_array else None), is_array=bracket == "["))
+        elif len(stack) > 1:
+            closed = stack.pop()
+            if not closed.is_array:
+                if "publishedOn" in closed.fields:
+                    yield decoded(closed.fields)
+                elif closed.context:
+                    # Expose the child's own fields to the parent as "context.key" (e.g. slug.current);
+                    # deeper descendants are not propagated, so each field is copied at most once
+                    parent = next(f for f in reversed(stack) if not f.is_array)
+                    for key, value in closed.fields.items():
+                        if "." not in key:
+                            parent.fields.setdefault(f"{closed.context}.{key}", value)
+        pending_key = None
+
+    # Records that were never closed (e.g. a truncated stream) are flushed at the end
+    for frame in reversed(stack):
+        if not frame.is_array and "publishedOn" in frame.fields:
+            yield decoded(frame.fields)
+
+
+def _skip_bytes(payload: str, pos: int, size: int) -> int:
+    """Index just past `size` UTF-8 bytes of `payload` starting at `pos` (T row lengths are in bytes)."""
+    candidate = payload[pos:pos + size]
+    if candidate.isascii():
+        return pos + len(candidate)
+    end, consumed = pos, 0
+    while end < len(payload) and consumed < size:
+        consumed += len(payload[end].encode("utf-8"))
+        end += 1
+    return end
+
+
+def iter_flight_chunks(html: str) -> Iterator[str]:
+    """Yields the unescaped Flight payload chunks of a page, in order."""
+    for match in CHUNK_RE.finditer(html):
+        yield _unescape_chunk(match.group(1))
+
+
+def iter_flight_records(payload: str) -> Iterator[Dict[str, str]]:
+    """Walks the Flight row stream once, yielding the flattened fields of every dated record."""
+    pos, length = 0, len(payload)
+    while pos < length:
+        row = ROW_RE.match(payload, pos)
+        if row and row.group(2) == "T":
+            comma = payload.find(",", row.end())
+            size = payload[row.end():comma]
+            if comma != -1 and size and all(c in "0123456789abcdefABCDEF" for c in size):
+                pos = _skip_bytes(payload, comma + 1, int(size, 16))
+                continue
+
+        end = payload.find("\n", pos)
+        if end == -1:
+            end = length
+        body = payload[row.end() if row else pos:end]
+        pos = end + 1
+
+        if '"publishedOn"' not in body:
+            continue
+        try:
+            records = _decode_json_records(body)
+        except json.JSONDecodeError:
+            records = _iter_token_records(body)
+        yield from records
+
+
+def iter_flight_posts(html: str, page_path: str) -> Iterator[dict]:
+    """Yields Sanity post dicts (slug, title, date, summary, category, url_prefix) found in the page."""
+    seen_slugs = set()
+    for fields in iter_flight_records("".join(iter_flight_chunks(html))):
+        post = _to_post(fields, page_path)
+        if post and post["slug"] not in seen_slugs:
+            seen_slugs.add(post["slug"])
+            yield post
@@ -0,0 +1,65 @@
+"""Cheap lookups on server-rendered pages without building a full DOM.
+
+Detail pages are hundreds of kilobytes of markup, but the collectors only need
+a couple of ``<meta>`` tags from ``<head>`` and the ``__NEXT_DATA__`` script.
+`meta_content` parses just the head (with lxml when it is installed, else a
+``SoupStrainer`` that only keeps ``<meta>`` tags) and `next_data_json` slices
+the script out directly. Both return None when nothing is found, so callers
+fall back to a full BeautifulSoup parse only when they need the body.
+"""
+import re
+from typing import Iterable, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+except ImportError:  # optional: the SoupStrainer path below is used instead
+    lxml = None
+
+HEAD_END_RE = re.compile(r"</head\s*>", re.IGNORECASE)
+NEXT_DATA_RE = re.compile(
+    r"<script\b[^>]*\bid\s*=\s*[\"']__NEXT_DATA__[\"'][^>]*>(.*?)</script\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def html_head(html: str) -> Optional[str]:
+    """The page up to and including ``</head>``, or None when the page has no closing head tag."""
+    match = HEAD_END_RE.search(html)
+    return html[:match.end()] if match else None
+
+
+def meta_content(html: str, attrs: Iterable[dict]) -> Optional[str]:
+    """Returns the ``content`` of the first head ``<meta>`` matching one of `attrs`, in order of preference.
+
+    `attrs` are single-attribute dicts such as ``{"name": "description"}``.
+    Pages without a closing ``</head>`` are searched whole.
+    """
+    head = html_head(html) or html
+
+    if lxml is not None:
+        try:
+            root = lxml.html.fromstring(head)
+        except (ValueError, lxml.etree.ParserError):
+            return None
+        for attr in attrs:
+            (key, value), = attr.items()
+            for content in root.xpath(f"//meta[@{key}=$value]/@content", value=value):
+                return str(content)
+        return None
+
+    soup = BeautifulSoup(head, "html.parser", parse_only=SoupStrainer("meta"))
+    for attr in attrs:
+        tag = soup.find("meta", attrs=attr)
+        if tag and tag.get("content") is not None:
+            return tag["content"]
+    return None
+
+
+def next_data_json(html: str) -> Optional[str]:
+    """The raw text of the ``__NEXT_DATA__`` script, or None."""
+    if "__NEXT_DATA__" not in html:
+        return None
+    match = NEXT_DATA_RE.search(html)
+    return match.group(1) if match else None
@@ -1,10 +1,15 @@
 import feedparser
+import httpx
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from dateutil import parser
+import json
+import os
 import yaml
-from typing import List
+from typing import List, Optional
 from src.collectors.base import BaseCollector
 from src.state import Article
+from src.utils.http_client import get_http_client
 import time
 
 class RSSCollector(BaseCollector):
@@ -12,6 +17,12 @@ class RSSCollector(BaseCollector):
         self.config = self._load_config(config_path)
         self.feed_urls = self.config.get("collector", {}).get("rss_feeds", [])
         self.lookback_days = self.config.get("collector", {}).get("rss_lookback_days", 3)  # 기본 3일
+        self.max_workers = self.config.get("collector", {}).get("rss_max_workers", 8)
+        # ETag / Last-Modified per feed, persisted between runs for conditional GET
+        self.state_path = self.config.get("collector", {}).get("rss_state_path", "data/rss_feed_state.json")
+        # Validators of the last fetch, saved by `commit_state` only after the run has published
+        self._staged_feed_state: Optional[dict] = None
+        self.http = get_http_client(self.config.get("http", {}))
 
     def _load_config(self, path: str) -> dict:
         try:
@@ -20,13 +31,78 @@ class RSSCollector(BaseCollector):
         except FileNotFoundError:
             return {}
 
+    def _load_feed_state(self) -> dict:
+        if not self.state_path:
+            return {}
+        try:
+            with open(self.state_path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_feed_state(self, feed_state: dict):
+        if not self.state_path:
+            return
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(feed_state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def _fetch_feed(self, url: str, validators: dict) -> Optional[httpx.Response]:
+        """Fetch one feed, sending If-None-Match / If-Modified-Since when known."""
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("modified"):
+            headers["If-Modified-Since"] = validators["modified"]
+        try:
+            resp = self.http.get(url, headers=headers)
+            if resp.status_code != 304:
+                resp.raise_for_status()
+            return resp
+        except httpx.HTTPError as e:
+            print(f"[RSSCollector] Failed to fetch {url}: {e}")
+            return None
+
+    def commit_state(self):
+        if self._staged_feed_state is not None:
+            self._save_feed_state(self._staged_feed_state)
+            self._staged_feed_state = None
+
     def fetch_data(self) -> List[Article]:
         articles = []
         cutoff_date = datetime.now().astimezone() - timedelta(days=self.lookback_days)
+        feed_state = self._load_feed_state()
+        state_changed = False
+        not_modified = 0
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(self.feed_urls) or 1))) as pool:
+            responses = list(pool.map(lambda u: self._fetch_feed(u, feed_state.get(u, {})), self.feed_urls))
+
+        for url, resp in zip(self.feed_urls, responses):
+            if resp is None:
+                continue
+
+            # 304 Not Modified: nothing new since the last run, skip parsing entirely
+            if resp.status_code == 304:
+                not_modified += 1
+                continue
+
+            validators = {}
+            for key, header in (("etag", "ETag"), ("modified", "Last-Modified")):
+                if resp.headers.get(header):
+                    validators[key] = resp.headers[header]
+            if validators and feed_state.get(url) != validators:
+                feed_state[url] = validators
+                state_changed = True
+
+            # Headers let feedparser resolve relative links and pick the right encoding
+            feed = feedparser.parse(resp.content, response_headers={
+                "content-location": str(resp.url),
+                "content-type": resp.headers.get("content-type", ""),
+            })
 
-        for url in self.feed_urls:
-            feed = feedparser.parse(url)
-            
             for entry in feed.entries:
                 # Normalize date
                 published = None
@@ -50,6 +126,11 @@ class RSSCollector(BaseCollector):
                         raw_data={"feed_url": url}
                     )
                     articles.append(article)
+
+        # A 304 on the next run skips the feed, so its new validators wait until this run's articles are out
+        self._staged_feed_state = feed_state if state_changed else None
+        if not_modified:
+            print(f"[RSSCollector] {not_modified}/{len(self.feed_urls)} feeds not modified since last run")
         
         return articles
 
@@ -1,47 +1,188 @@
+import os
+import sqlite3
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite import SqliteSaver
 from langgraph.graph import StateGraph, END
 from src.state import AgentState, Article
 from src.collectors.arxiv_collector import ArxivCollector
 from src.collectors.rss_crawler import RSSCollector
 from src.collectors.anthropic_news_collector import AnthropicNewsCollector
-from src.processors.filters import RelevanceFilter
-from src.processors.summarizer import Summarizer
-from src.processors.insight_generator import InsightGenerator
+from src.collectors.executor import CollectorExecutor
+from src.processors.dedup import NearDuplicateDetector
+from src.processors.pipeline import AsyncProcessingPipeline, failed_transiently
+from src.processors.ranker import EmbeddingRanker
+from src.processors.registry import get_processor_registry
 from src.publishers.email_sender import EmailSender
 from src.publishers.slack_bot import SlackBot
-from typing import List
+from src.storage.article_store import ArticleStore
+from src.storage.seen_store import SeenStore
+from src.streaming import StreamingRunner
+from src.utils.embedding_cache import EmbeddingCache
+from src.utils.llm_cache import SQLiteLLMCache
+from src.utils.metrics import get_run_metrics
+from src.utils.rate_limiter import get_rate_limiter
+from typing import List, Optional
+import yaml
 
 class InsightBotGraph:
-    def __init__(self):
+    def __init__(self, config_path: str = "config/settings.yaml"):
+        self.config = self._load_config(config_path)
+        collector_cfg = self.config.get("collector", {})
+
         self.arxiv_collector = ArxivCollector()
         self.rss_collector = RSSCollector()
         self.anthropic_collector = AnthropicNewsCollector()
-        self.filter = RelevanceFilter()
-        self.summarizer = Summarizer()
-        self.insight_generator = InsightGenerator()
+        self.collector_executor = CollectorExecutor(
+            {
+                "arxiv": self.arxiv_collector,
+                "rss": self.rss_collector,
+                "anthropic": self.anthropic_collector,
+            },
+            default_timeout=collector_cfg.get("timeout_seconds", 120),
+            timeouts=collector_cfg.get("timeouts", {}),
+        )
+        dedup_cfg = self.config.get("dedup", {})
+        self.dedup_enabled = dedup_cfg.get("enabled", True)
+        self.dedup_detector = NearDuplicateDetector(
+            max_distance=dedup_cfg.get("max_distance", 3),
+            bands=dedup_cfg.get("bands", 4),
+        )
+        # Processors (and their compiled chains and HTTP pool) are shared by every graph on this config
+        self.processors = get_processor_registry(config_path)
+        self.filter = self.processors.relevance_filter
+        self.summarizer = self.processors.summarizer
+        self.insight_generator = self.processors.insight_generator
+        processing_cfg = self.config.get("processing", {})
+        combined_sources = processing_cfg.get("combined_sources", [])
+        self.combined_processor = self.processors.combined_processor if combined_sources else None
+        self.processing_pipeline = AsyncProcessingPipeline(
+            self.summarizer,
+            self.insight_generator,
+            max_concurrency=processing_cfg.get("max_concurrency", 8),
+            # Shared with the relevance filter: one request budget for all LLM calls
+            rate_limiter=get_rate_limiter(processing_cfg.get("requests_per_minute", 500)),
+            max_retries=processing_cfg.get("max_retries", 3),
+            combined_processor=self.combined_processor,
+            combined_sources=combined_sources,
+        )
+        ranking_cfg = self.config.get("ranking", {})
+        self.ranker = None
+        if ranking_cfg.get("enabled", False):
+            client = self.processors.client
+            self.ranker = EmbeddingRanker(
+                client.get_embeddings(),
+                cache=EmbeddingCache(
+                    ranking_cfg.get("cache_path", "data/embeddings.sqlite"),
+                    ttl_hours=ranking_cfg.get("cache_ttl_hours", 24 * 30),
+                    max_entries=ranking_cfg.get("cache_max_entries", 50000),
+                ),
+                model_name=client.embedding_model,
+                top_n=ranking_cfg.get("top_n", 15),
+                diversity=ranking_cfg.get("diversity", 0.3),
+                num_topics=ranking_cfg.get("num_topics"),
+            )
         self.email_sender = EmailSender()
         self.slack_bot = SlackBot()
 
+        storage_cfg = self.config.get("storage", {})
+        self.seen_store = SeenStore(storage_cfg.get("seen_store_path", "data/seen.sqlite"))
+        self.seen_retention_days = storage_cfg.get("seen_retention_days", 90)
+        # Every article each node handled, with its score/summary/insight (searchable, reused on reruns)
+        self.article_store = ArticleStore(storage_cfg.get("article_store_path", "data/articles.sqlite"))
+        self.checkpoint_path = storage_cfg.get("checkpoint_path", "data/checkpoints.sqlite")
+
+    def _load_config(self, path: str) -> dict:
+        try:
+            with open(path, 'r') as f:
+                return yaml.safe_load(f)
+        except FileNotFoundError:
+            return {}
+
+    def open_checkpointer(self) -> SqliteSaver:
+        """SQLite checkpointer for `build_graph`; the state is saved after every node, per run id."""
+        os.makedirs(os.path.dirname(self.checkpoint_path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.checkpoint_path, check_same_thread=False)
+        # Articles are dataclasses, which the checkpoint serializer only restores when allowed explicitly
+        serde = JsonPlusSerializer(allowed_msgpack_modules=[("src.state", "Article")])
+        return SqliteSaver(conn, serde=serde)
+
+    def _timed(self, name: str, node):
+        """Wraps a node so its wall time lands in the run metrics."""
+        def wrapper(state: AgentState) -> AgentState:
+            with get_run_metrics().time_node(name):
+                return node(state)
+        return wrapper
+
+    def write_run_report(self, stats: dict, run_id: Optional[str] = None) -> dict:
+        """Writes the JSON run report (and the Prometheus textfile if configured)."""
+        metrics_cfg = self.config.get("metrics", {})
+        metrics = get_run_metrics()
+        report = metrics.build_report(stats, pricing=metrics_cfg.get("pricing_per_1m_tokens", {}))
+        if run_id:
+            report["run_id"] = run_id
+        path = metrics.write_json(report, metrics_cfg.get("report_dir", "data/reports"))
+        print(f"Run report written to {path}")
+        if metrics_cfg.get("prometheus_textfile"):
+            metrics.write_prometheus(report, metrics_cfg["prometheus_textfile"])
+        return report
+
     def fetch_data_node(self, state: AgentState) -> AgentState:
         print("--- [Node] Fetching Data ---")
-        arxiv_data = self.arxiv_collector.fetch_data()
-        rss_data = self.rss_collector.fetch_data()
-        anthropic_data = self.anthropic_collector.fetch_data()
-        all_articles = arxiv_data + rss_data + anthropic_data
+        # All collectors run concurrently; a slow or failing source only loses its own articles
+        all_articles, collector_stats = self.collector_executor.run()
+        for name, stat in collector_stats.items():
+            print(f"  {name}: {stat['status']} - {stat['articles']} articles in {stat['latency_s']}s")
         print(f"Fetched {len(all_articles)} articles.")
-        return {"articles": all_articles}
+        self.article_store.upsert(all_articles, "fetched")
+        return {"articles": all_articles, "stats": {"collectors": collector_stats}}
 
-    def filter_data_node(self, state: AgentState) -> AgentState:
-        print("--- [Node] Filtering Data ---")
+    def skip_seen_node(self, state: AgentState) -> AgentState:
+        print("--- [Node] Skipping Already Seen Articles ---")
+        removed = self.seen_store.compact(self.seen_retention_days)
+        unseen, seen = self.seen_store.filter_unseen(state["articles"])
+        print(f"Skipped {len(seen)} previously published/rejected articles, {len(unseen)} remaining.")
+        return {"articles": unseen, "stats": {"seen": {"skipped": len(seen), "compacted": removed}}}
+
+    def dedup_node(self, state: AgentState) -> AgentState:
+        print("--- [Node] Removing Near-Duplicates ---")
+        articles = state["articles"]
+        if not self.dedup_enabled:
+            return {"articles": articles}
+        unique = self.dedup_detector.deduplicate(articles)
+        print(f"Merged {len(articles) - len(unique)} near-duplicate articles, {len(unique)} remaining.")
+        return {"articles": unique, "stats": {"dedup": {"merged": len(articles) - len(unique)}}}
+
+    def score_and_split(self, articles: List[Article]) -> tuple:
+        """Scores articles and records the outcome; returns (relevant, rejected) in input order."""
         filtered_articles = []
-        for article in state["articles"]:
-            is_relevant, score = self.filter.filter_article(article)
+        rejected_articles = []
+        # Articles scored on an earlier (interrupted) run keep their stored score
+        unscored = self.article_store.restore_scores(articles)
+        for article, score in zip(unscored, self.filter.score_articles(unscored)):
             article.relevance_score = score
-            if is_relevant:
+        print(f"Reused {len(articles) - len(unscored)} stored relevance scores.")
+
+        for article in articles:
+            score = article.relevance_score
+            if score >= self.filter.threshold:
                 print(f"✅ Relevant ({score}): {article.title}")
                 filtered_articles.append(article)
             else:
                 # print(f"❌ Low Relevance ({score}): {article.title}") # Optional verbose log
-                pass
+                rejected_articles.append(article)
+
+        # Rejected articles are not scored again on the following runs (scoring failures are retried)
+        self.seen_store.mark(
+            [a for a in rejected_articles if "relevance_error" not in a.raw_data], "rejected"
+        )
+        self.article_store.upsert(rejected_articles, "rejected")
+        self.article_store.upsert(filtered_articles, "scored")
+        return filtered_articles, rejected_articles
+
+    def filter_data_node(self, state: AgentState) -> AgentState:
+        print("--- [Node] Filtering Data ---")
+        filtered_articles, _ = self.score_and_split(state["articles"])
         
         # Sort by relevance score descending
         filtered_articles.sort(key=lambda x: x.relevance_score, reverse=True)
@@ -49,31 +190,61 @@ class InsightBotGraph:
         print(f"Filtered down to {len(filtered_articles)} articles.")
         return {"articles": filtered_articles}
 
+    def rank_node(self, state: AgentState) -> AgentState:
+        print("--- [Node] Ranking (Embeddings + MMR) ---")
+        articles = state["articles"]
+        if not self.ranker or len(articles) <= self.ranker.top_n:
+            return {"articles": articles}
+        try:
+            ranked = self.ranker.rank(articles)
+        except Exception as e:
+            # Without embeddings, fall back to the plain relevance order
+            print(f"Embedding ranking failed, keeping the top {self.ranker.top_n} by relevance: {e}")
+            return {"articles": articles[:self.ranker.top_n]}
+        topics = len({a.raw_data.get("topic") for a in articles})
+        print(f"Selected {len(ranked)} of {len(articles)} articles across {topics} topics.")
+        stats = {"ranking": {"candidates": len(articles), "selected": len(ranked), "topics": topics}}
+        if self.ranker.cache:
+            stats["ranking"]["embedding_cache"] = self.ranker.cache.stats()
+        return {"articles": ranked, "stats": stats}
+
     def process_data_node(self, state: AgentState) -> AgentState:
         print("--- [Node] Processing (Summary & Insight) ---")
-        processed_articles = []
-        for article in state["articles"]:
-            try:
-                # Summary
-                summary = self.summarizer.summarize(article)
-                article.summary = summary
-                
-                # Insight
-                insight = self.insight_generator.generate_insight(article, summary)
-                article.insight = insight
-                
-                processed_articles.append(article)
-                print(f"Processed: {article.title}")
-            except Exception as e:
-                print(f"Error processing {article.title}: {e}")
-        
-        return {"articles": processed_articles}
+        articles = state["articles"]
+        pending = self.article_store.restore_processed(articles)
+        print(f"Reused {len(articles) - len(pending)} stored summaries.")
+        # Each article is stored as soon as it is done, so a crashed run resumes after the last completed one
+        processed = {id(a) for a in self.processing_pipeline.run(
+            pending, on_processed=lambda article: self.article_store.upsert([article], "processed")
+        )}
+        pending_ids = {id(a) for a in pending}
+        # Keep the ranking order; pending articles that failed processing are dropped
+        processed_articles = [a for a in articles if id(a) not in pending_ids or id(a) in processed]
+        failed = [a for a in pending if id(a) not in processed]
+        if failed and not processed and (failed_transiently(failed) or not processed_articles):
+            # Nothing succeeded and the API looks down (or there is nothing else to publish): stop here so the
+            # run can be resumed from this node. Permanent errors (e.g. a 400) only drop their articles.
+            raise RuntimeError(f"Processing failed for all {len(pending)} pending articles")
+        if failed:
+            print(f"Dropped {len(failed)} articles that failed processing.")
+        return {"articles": processed_articles, "stats": self.llm_cache_stats()}
+
+    def llm_cache_stats(self) -> dict:
+        """{"llm_cache": {...}} when the persistent LLM cache is in use, else {}."""
+        cache = getattr(self.summarizer.llm, "cache", None)
+        if not isinstance(cache, SQLiteLLMCache):
+            return {}
+        # Cumulative for the run: includes the relevance scoring calls of the filter node
+        stats = cache.stats()
+        print(f"LLM cache: {stats['hits']} hits, {stats['misses']} misses")
+        return {"llm_cache": stats}
 
     def publish_data_node(self, state: AgentState) -> AgentState:
         print("--- [Node] Publishing Data ---")
         articles = state["articles"]
         if not articles:
             print("No articles to publish.")
+            self.collector_executor.commit_state()
             return state
 
         # Send to Email
@@ -83,24 +254,46 @@ class InsightBotGraph:
         # Send to Slack
         print("Sending Slack Notification...")
         self.slack_bot.send_message(articles)
+
+        self.seen_store.mark(articles, "published")
+        self.article_store.upsert(articles, "published")
+        # Only now may the collectors skip what this run fetched (e.g. RSS conditional GET)
+        self.collector_executor.commit_state()
         
         return state
 
-    def build_graph(self):
+    def run_streaming(self, run_id: Optional[str] = None) -> dict:
+        """Runs fetch → filter → process as overlapping stages (see `StreamingRunner`), then publishes."""
+        processing_cfg = self.config.get("processing", {})
+        runner = StreamingRunner(
+            self,
+            queue_size=processing_cfg.get("streaming_queue_size", 100),
+        )
+        return runner.run(run_id)
+
+    def build_graph(self, checkpointer: Optional[BaseCheckpointSaver] = None):
+        """Compiles the workflow. With a checkpointer (see `open_checkpointer`), runs must be invoked with
+        {"configurable": {"thread_id": run_id}} and can be resumed by invoking None under the same id."""
         workflow = StateGraph(AgentState)
 
         # Add Nodes
-        workflow.add_node("fetch", self.fetch_data_node)
-        workflow.add_node("filter", self.filter_data_node)
-        workflow.add_node("process", self.process_data_node)
-        workflow.add_node("publish", self.publish_data_node)
+        workflow.add_node("fetch", self._timed("fetch", self.fetch_data_node))
+        workflow.add_node("skip_seen", self._timed("skip_seen", self.skip_seen_node))
+        workflow.add_node("dedup", self._timed("dedup", self.dedup_node))
+        workflow.add_node("filter", self._timed("filter", self.filter_data_node))
+        workflow.add_node("rank", self._timed("rank", self.rank_node))
+        workflow.add_node("process", self._timed("process", self.process_data_node))
+        workflow.add_node("publish", self._timed("publish", self.publish_data_node))
         
         # Add Edges
         workflow.set_entry_point("fetch")
         
-        workflow.add_edge("fetch", "filter")
-        workflow.add_edge("filter", "process")
+        workflow.add_edge("fetch", "skip_seen")
+        workflow.add_edge("skip_seen", "dedup")
+        workflow.add_edge("dedup", "filter")
+        workflow.add_edge("filter", "rank")
+        workflow.add_edge("rank", "process")
         workflow.add_edge("process", "publish")
         workflow.add_edge("publish", END)
 
-        return workflow.compile()
+        return workflow.compile(checkpointer=checkpointer)
@@ -1,5 +1,8 @@
+import argparse
 import os
 import sys
+import uuid
+from datetime import datetime
 from dotenv import load_dotenv
 
 # Add project root to path
@@ -7,20 +10,62 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.graph import InsightBotGraph
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="InsightBot daily briefing")
+    parser.add_argument("--resume", metavar="RUN_ID", help="resume a failed run from its last checkpoint")
+    parser.add_argument("--streaming", action="store_true",
+                        help="overlap fetching, filtering and processing instead of running stage by stage")
+    args = parser.parse_args()
+    if args.resume and args.streaming:
+        parser.error("--resume only applies to checkpointed (non-streaming) runs")
+    return args
+
+def run_graph(bot: InsightBotGraph, run_id: str, resume: bool) -> dict:
+    """Runs (or resumes) the checkpointed stage-by-stage graph."""
+    graph = bot.build_graph(checkpointer=bot.open_checkpointer())
+    run_config = {"configurable": {"thread_id": run_id}}
+
+    if resume:
+        snapshot = graph.get_state(run_config)
+        if not snapshot.values:
+            sys.exit(f"No checkpoint found for run {run_id}")
+        if not snapshot.next:
+            sys.exit(f"Run {run_id} already completed")
+        print(f"Resuming run {run_id} at: {', '.join(snapshot.next)}")
+        # Invoking with no input continues from the last saved checkpoint
+        initial_state = None
+    else:
+        print(f"Run ID: {run_id}")
+        # Initialize with empty state
+        initial_state = {"run_id": run_id, "articles": [], "stats": {}}
+
+    try:
+        return graph.invoke(initial_state, run_config)
+    except Exception:
+        print(f"\n❌ Run {run_id} failed. Resume it with: python src/main.py --resume {run_id}")
+        raise
+
 def main():
+    args = parse_args()
     load_dotenv()
     
     print("🚀 Starting InsightBot...")
-    graph = InsightBotGraph().build_graph()
-    
-    # Initialize with empty state
-    initial_state = {"articles": []}
-    
-    result = graph.invoke(initial_state)
+    bot = InsightBotGraph()
+    run_id = args.resume or f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+    if args.streaming:
+        print(f"Run ID: {run_id} (streaming)")
+        # Not checkpointed, but per-article results still land in the article store and are reused on rerun
+        result = bot.run_streaming(run_id)
+    else:
+        result = run_graph(bot, run_id, resume=bool(args.resume))
     
     print("\n🎉 Workflow Completed!")
     final_articles = result.get("articles", [])
     print(f"Final Count: {len(final_articles)}")
+
+    report = bot.write_run_report(result.get("stats", {}), run_id=run_id)
+    print(f"Run time: {report['duration_s']}s, estimated LLM cost: ${report['estimated_cost_usd']:.4f}")
     
     # Temporary output for verification
     for idx, article in enumerate(final_articles, 1):
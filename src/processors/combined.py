@@ -0,0 +1,118 @@
+from src.utils.llm_client import LLMClient
+from src.utils.rate_limiter import get_rate_limiter
+from src.utils.retry import call_all
+from src.utils.token_budget import TokenBudget
+from src.state import Article
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.output_parsers import StrOutputParser
+from typing import List, Optional
+import json
+import re
+
+class CombinedProcessor:
+    """Produces the summary and the insight of an article in a single JSON-mode LLM call.
+
+    Uses the same summary formats as `Summarizer` and the same insight style as
+    `InsightGenerator`, but sends the article only once. Raises ValueError when
+    the response is not the expected JSON, so callers can fall back to the
+    two-call path. That is also the case for content over the "combined" token
+    budget when long content is map-reduced, which only `Summarizer` does.
+    """
+
+    PROMPT = """
+        You are writing a daily AI briefing for a Korean AI Engineer.
+        
+        1. Summary instructions:
+        {summary_instructions}
+        
+        2. Insight instructions:
+        Provide a one-sentence technical insight in Korean.
+        Explain WHY this is important or how it can be applied in practice.
+        Example: "기존 RAG의 검색 정확도 한계를 지식 그래프 결합으로 극복할 수 있는 가능성을 보여줌."
+        
+        Input Text:
+        Title: {title}
+        Content: {content}
+        
+        Respond ONLY with a JSON object of the form {{"summary": "...", "insight": "..."}}.
+        """
+
+    PAPER_INSTRUCTIONS = """Summarize the AI research paper using the following format strictly:
+        **배경 (Problem):** [Problems they are trying to solve]
+        **방법론 (Method):** [Key technical approach]
+        **결과 (Result):** [Main performance improvements or quantitative results]"""
+
+    NEWS_INSTRUCTIONS = """Summarize the AI news in 3 bullet point sentences in Korean.
+        Focus on facts and tech details."""
+
+    def __init__(self, client: Optional[LLMClient] = None, budget: Optional[TokenBudget] = None):
+        client = client or LLMClient()
+        # JSON mode guarantees a syntactically valid object from the API
+        self.llm = client.get_chat_model(temperature=0.1, task="combined").bind(
+            response_format={"type": "json_object"})
+        self.budget = budget or TokenBudget.from_config(client.config)
+        processing_cfg = client.config.get("processing", {})
+        # `run_many` calls share the pipeline's request budget and 429/5xx retries
+        self.rate_limiter = get_rate_limiter(processing_cfg.get("requests_per_minute", 500))
+        self.max_retries = processing_cfg.get("max_retries", 3)
+        # Compiled once and reused for every article
+        self.chain = self._build_chain()
+
+    def process(self, article: Article) -> tuple[str, str]:
+        result = self.chain.invoke(self._inputs(article))
+        return self._parse(result)
+
+    async def aprocess(self, article: Article) -> tuple[str, str]:
+        result = await self.chain.ainvoke(self._inputs(article))
+        return self._parse(result)
+
+    def run_many(self, articles: List[Article], max_concurrency: int = 8) -> list:
+        """(summary, insight) for many articles in input order, up to `max_concurrency` requests at a time.
+        A failed or unparseable article yields its exception, so callers can fall back per article."""
+        results: list = [None] * len(articles)
+        inputs = {}
+        for idx, article in enumerate(articles):
+            try:
+                inputs[idx] = self._inputs(article)
+            except ValueError as e:
+                results[idx] = e
+        outputs = call_all(self.chain.invoke, list(inputs.values()), max_concurrency,
+                           self.rate_limiter, self.max_retries)
+        for idx, output in zip(inputs, outputs):
+            results[idx] = output if isinstance(output, Exception) else self._parse_or_error(output)
+        return results
+
+    @classmethod
+    def _parse_or_error(cls, result: str):
+        try:
+            return cls._parse(result)
+        except ValueError as e:
+            return e
+
+    def _build_chain(self):
+        prompt = ChatPromptTemplate.from_template(self.PROMPT)
+        return prompt | self.llm | StrOutputParser()
+
+    def _inputs(self, article: Article) -> dict:
+        if self.budget.map_reduce and not self.budget.fits(article, "combined"):
+            raise ValueError("Content exceeds the combined token budget")
+        instructions = self.PAPER_INSTRUCTIONS if article.source == 'arxiv' else self.NEWS_INSTRUCTIONS
+        return {"summary_instructions": instructions, "title": article.title,
+                "content": self.budget.fit(article, "combined")}
+
+    @staticmethod
+    def _parse(result: str) -> tuple[str, str]:
+        text = re.sub(r"^```(?:json)?\s*|\s*```$", "", result.strip())
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Unparseable combined response: {e}")
+        if not isinstance(data, dict):
+            raise ValueError("Combined response is not a JSON object")
+
+        summary, insight = data.get("summary"), data.get("insight")
+        if isinstance(summary, list):
+            summary = "\n".join(f"- {item}" for item in summary)
+        if not isinstance(summary, str) or not isinstance(insight, str) or not summary.strip() or not insight.strip():
+            raise ValueError("Combined response is missing summary or insight")
+        return summary.strip(), insight.strip()
@@ -0,0 +1,141 @@
+import hashlib
+import re
+from collections import defaultdict
+from typing import Dict, List
+
+from src.state import Article
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """64-bit SimHash over word shingles of `text`."""
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < shingle_size:
+        shingles = [" ".join(words)] if words else []
+    else:
+        shingles = [" ".join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+
+    weights = [0] * 64
+    for shingle in shingles:
+        h = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class NearDuplicateDetector:
+    """Clusters near-duplicate articles across sources using SimHash.
+
+    The 64-bit fingerprints are split into `bands` bit ranges; articles sharing
+    any band become candidate pairs (LSH), and candidates within
+    `max_distance` bits are merged into one cluster. Each cluster keeps a
+    single representative, with the other copies' URLs attached to it.
+    """
+
+    # Preferred representative when the same story arrives from several sources
+    SOURCE_PRIORITY = {"anthropic": 0, "arxiv": 1, "rss": 2}
+
+    def __init__(self, max_distance: int = 3, bands: int = 4):
+        if max_distance >= bands:
+            # Pigeonhole: two fingerprints within max_distance bits must agree on at least one of max_distance + 1 bands
+            bands = max_distance + 1
+        self.max_distance = max_distance
+        self.bands = bands
+
+    def _band_keys(self, fingerprint: int) -> List[tuple]:
+        width = 64 // self.bands
+        keys = []
+        for band in range(self.bands):
+            shift = band * width
+            size = width if band < self.bands - 1 else 64 - shift
+            keys.append((band, fingerprint >> shift & ((1 << size) - 1)))
+        return keys
+
+    def cluster(self, articles: List[Article]) -> List[List[int]]:
+        """Returns clusters of article indices; singletons included, in first-seen order."""
+        fingerprints = [simhash(f"{a.title}\n{a.content}") for a in articles]
+        parent = list(range(len(articles)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        buckets: Dict[tuple, List[int]] = defaultdict(list)
+        for idx, fingerprint in enumerate(fingerprints):
+            for key in self._band_keys(fingerprint):
+                for other in buckets[key]:
+                    root, other_root = find(idx), find(other)
+                    if root != other_root and hamming_distance(fingerprint, fingerprints[other]) <= self.max_distance:
+                        parent[max(root, other_root)] = min(root, other_root)
+                buckets[key].append(idx)
+
+        clusters: Dict[int, List[int]] = {}
+        for idx in range(len(articles)):
+            clusters.setdefault(find(idx), []).append(idx)
+        return list(clusters.values())
+
+    def _representative(self, members: List[Article]) -> Article:
+        return min(
+            members,
+            key=lambda a: (self.SOURCE_PRIORITY.get(a.source, len(self.SOURCE_PRIORITY)), -len(a.content or "")),
+        )
+
+    def deduplicate(self, articles: List[Article]) -> List[Article]:
+        """Keeps one article per near-duplicate cluster, recording the others under raw_data['duplicate_urls']."""
+        result = []
+        for indices in self.cluster(articles):
+            members = [articles[i] for i in indices]
+            keeper = self._representative(members)
+            duplicates = [a for a in members if a is not keeper]
+            if duplicates:
+                keeper.raw_data["duplicate_urls"] = [
+                    {"source": a.source, "url": a.url} for a in duplicates if a.url and a.url != keeper.url
+                ]
+            result.append(keeper)
+        return result
+
+
+class NearDuplicateIndex:
+    """Incremental counterpart of `NearDuplicateDetector` for articles that arrive one at a time.
+
+    The first article of a cluster to arrive is kept (it may already be on its
+    way downstream); later near-duplicates are attached to its
+    raw_data['duplicate_urls'] instead of being re-elected by source priority.
+    """
+
+    def __init__(self, detector: NearDuplicateDetector):
+        self.detector = detector
+        self._buckets: Dict[tuple, List[int]] = defaultdict(list)
+        self._fingerprints: List[int] = []
+        self._keepers: List[Article] = []
+
+    def add(self, article: Article) -> bool:
+        """Indexes an article; returns False if it duplicates one added earlier."""
+        fingerprint = simhash(f"{article.title}\n{article.content}")
+        keys = self.detector._band_keys(fingerprint)
+        for key in keys:
+            for idx in self._buckets[key]:
+                if hamming_distance(fingerprint, self._fingerprints[idx]) <= self.detector.max_distance:
+                    keeper = self._keepers[idx]
+                    if article.url and article.url != keeper.url:
+                        keeper.raw_data.setdefault("duplicate_urls", []).append(
+                            {"source": article.source, "url": article.url}
+                        )
+                    return False
+
+        idx = len(self._keepers)
+        self._fingerprints.append(fingerprint)
+        self._keepers.append(article)
+        for key in keys:
+            self._buckets[key].append(idx)
+        return True
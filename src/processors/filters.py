@@ -1,21 +1,17 @@
 from src.utils.llm_client import LLMClient
+from src.utils.rate_limiter import get_rate_limiter
+from src.utils.retry import call_all
+from src.utils.token_budget import TokenBudget
+from src.processors.prefilter import KeywordPreFilter
 from src.state import Article
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from typing import Dict, List, Optional
+import json
+import re
 
 class RelevanceFilter:
-    def __init__(self):
-        self.llm = LLMClient().get_chat_model(temperature=0.0)
-        self.threshold = 0.7
-
-    def filter_article(self, article: Article) -> tuple[bool, float]:
-        """
-        Evaluates if the article is relevant for an AI Engineer.
-        Returns (is_relevant, score).
-        """
-        prompt_text = """
-        You are an expert AI Editor. Analyze the following article title and content to determine if it is relevant and valuable for an "AI Engineer" or "Machine Learning Researcher".
-        
+    CRITERIA = """
         Criteria for good articles (Score 0.8-1.0):
         - Creating new state-of-the-art results.
         - Introducing new architectures (e.g., Transformer variants, Mamba).
@@ -26,22 +22,236 @@ class RelevanceFilter:
         - Generic AI buzzwords without technical depth.
         - Clickbait / Marketing heavy.
         - Irrelevant topics (e.g., crypto, generic tech news).
-        
+        """
+
+    SINGLE_PROMPT = """
+        You are an expert AI Editor. Analyze the following article title and content to determine if it is relevant and valuable for an "AI Engineer" or "Machine Learning Researcher".
+        """ + CRITERIA + """
         Article Title: {title}
         Article Content: {content}
         
         Output ONLY a single float number between 0.0 and 1.0 representing the relevance score.
         """
+
+    BATCH_PROMPT = """
+        You are an expert AI Editor. For each of the following articles, determine if it is relevant and valuable for an "AI Engineer" or "Machine Learning Researcher".
+        """ + CRITERIA + """
+        Articles:
+        {articles}
         
-        prompt = ChatPromptTemplate.from_template(prompt_text)
-        chain = prompt | self.llm | StrOutputParser()
-        
+        Output ONLY a JSON object mapping every article id to a float relevance score between 0.0 and 1.0, e.g. {{"0": 0.85, "1": 0.2}}.
+        """
+
+    def __init__(self, client: Optional[LLMClient] = None, budget: Optional[TokenBudget] = None):
+        client = client or LLMClient()
+        self.llm = client.get_chat_model(temperature=0.0, task="relevance")
+        processing_cfg = client.config.get("processing", {})
+        self.threshold = processing_cfg.get("relevance_threshold", 0.7)
+        # Number of articles packed into one scoring prompt (1 disables batching)
+        self.batch_size = processing_cfg.get("relevance_batch_size", 20)
+        # Scoring prompts in flight at once (batches, and single-article fallbacks)
+        self.max_concurrency = max(1, processing_cfg.get("relevance_max_concurrency", 1))
+        # Same request budget and 429/5xx retries as the processing pipeline
+        self.rate_limiter = get_rate_limiter(processing_cfg.get("requests_per_minute", 500))
+        self.max_retries = processing_cfg.get("max_retries", 3)
+        # Article content is sent without markup and cut to the "relevance" token budget (shared through the
+        # processor registry, so each article is cleaned and counted once for all prompts)
+        self.budget = budget or TokenBudget.from_config(client.config)
+
+        # Chains are compiled once per model: {id(llm): (llm, single chain, batch chain)}
+        self._chains = {}
+
+        # Cascade: scores within `margin` of the threshold are re-scored by a larger model
+        cascade_cfg = processing_cfg.get("relevance_cascade", {})
+        self.cascade_margin = cascade_cfg.get("margin", 0.1)
+        self.cascade_llm = None
+        if cascade_cfg.get("enabled", False):
+            self.cascade_llm = client.get_chat_model(temperature=0.0, task="relevance_cascade")
+
+        # Local keyword tier: only the uncertain middle band reaches the LLM
+        prefilter_cfg = processing_cfg.get("prefilter", {})
+        self.prefilter = None
+        if prefilter_cfg.get("enabled", True):
+            self.prefilter = KeywordPreFilter(
+                weights=prefilter_cfg.get("keywords"),
+                bias=prefilter_cfg.get("bias", -1.0),
+                reject_below=prefilter_cfg.get("reject_below", 0.15),
+                accept_above=prefilter_cfg.get("accept_above", 0.98),
+            )
+
+    def _chains_for(self, llm=None) -> tuple:
+        """(single, batch) scoring chains for `llm` (default: the relevance model), compiled on first use."""
+        llm = llm or self.llm
+        entry = self._chains.get(id(llm))
+        if entry is None:
+            entry = self._chains[id(llm)] = (
+                llm,
+                ChatPromptTemplate.from_template(self.SINGLE_PROMPT) | llm | StrOutputParser(),
+                ChatPromptTemplate.from_template(self.BATCH_PROMPT) | llm | StrOutputParser(),
+            )
+        return entry[1], entry[2]
+
+    def _single_inputs(self, article: Article) -> dict:
+        return {"title": article.title, "content": self.budget.fit(article, "relevance")}
+
+    def _batch_inputs(self, articles: List[Article]) -> dict:
+        articles_block = "\n".join(
+            f"[id: {idx}]\nTitle: {article.title}\nContent: {self.budget.fit(article, 'relevance')}\n"
+            for idx, article in enumerate(articles)
+        )
+        return {"articles": articles_block}
+
+    def _single_result(self, article: Article, result) -> tuple[bool, float]:
         try:
-            # Truncate content to avoid context limit if necessary, though gpt-4o-mini has 128k context
-            content_snippet = article.content[:2000] 
-            result = chain.invoke({"title": article.title, "content": content_snippet})
+            if isinstance(result, Exception):
+                raise result
             score = float(result.strip())
             return score >= self.threshold, score
         except Exception as e:
             print(f"Error filtering article {article.title}: {e}")
+            article.raw_data["relevance_error"] = str(e)
             return False, 0.0
+
+    def filter_article(self, article: Article, llm=None) -> tuple[bool, float]:
+        """
+        Evaluates if the article is relevant for an AI Engineer.
+        Returns (is_relevant, score). `llm` defaults to the relevance model.
+        """
+        chain, _ = self._chains_for(llm)
+        result, = self._invoke_all(chain, [self._single_inputs(article)])
+        return self._single_result(article, result)
+
+    def run_many(self, articles: List[Article], llm=None) -> List[tuple[bool, float]]:
+        """
+        `filter_article` for many articles, up to `max_concurrency` requests at a time.
+        Results are in input order; failures score 0.0 as in `filter_article`.
+        """
+        if not articles:
+            return []
+        chain, _ = self._chains_for(llm)
+        results = self._invoke_all(chain, [self._single_inputs(article) for article in articles])
+        return [self._single_result(article, result) for article, result in zip(articles, results)]
+
+    def score_batch(self, articles: List[Article], llm=None) -> Dict[str, float]:
+        """
+        Scores several articles with a single LLM call.
+        Returns {article_id: score} where article_id is the article's index in `articles`.
+        Raises ValueError if the response cannot be parsed.
+        """
+        _, chain = self._chains_for(llm)
+        result, = self._invoke_all(chain, [self._batch_inputs(articles)])
+        if isinstance(result, Exception):
+            raise result
+        return self._parse_batch_scores(result, len(articles))
+
+    def _invoke_all(self, chain, inputs: List[dict]) -> list:
+        """
+        Invokes `chain` on every input, up to `max_concurrency` at a time. Each call takes a rate limiter
+        token and is retried on 429/5xx. Results are in input order, with the exception of a failed call in its place.
+        """
+        return call_all(chain.invoke, inputs, self.max_concurrency, self.rate_limiter, self.max_retries)
+
+    @staticmethod
+    def _parse_batch_scores(result: str, count: int) -> Dict[str, float]:
+        # Models occasionally wrap JSON in a markdown code fence
+        text = re.sub(r"^```(?:json)?\s*|\s*```$", "", result.strip())
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Unparseable batch score response: {e}")
+        if not isinstance(data, dict):
+            raise ValueError("Batch score response is not a JSON object")
+
+        scores = {}
+        for key, value in data.items():
+            key = str(key).strip()
+            if not key.isdigit() or int(key) >= count:
+                continue
+            try:
+                scores[key] = float(value)
+            except (TypeError, ValueError):
+                continue
+        return scores
+
+    def score_articles(self, articles: List[Article]) -> List[float]:
+        """
+        Scores all articles. Clear cases are decided by the local pre-filter;
+        the rest go to the LLM (see `_score_with_llm`).
+        """
+        if not self.prefilter:
+            return self._score_with_llm(articles)
+
+        scores: List[float] = [0.0] * len(articles)
+        escalated = []
+        for idx, (article, (decision, pre_score)) in enumerate(zip(articles, self.prefilter.triage(articles))):
+            article.raw_data["prefilter_score"] = round(pre_score, 4)
+            if decision == "escalate":
+                escalated.append(idx)
+                continue
+            article.raw_data["relevance_source"] = "prefilter"
+            # Accepted articles must clear the LLM threshold; rejected ones keep their low pre-score
+            scores[idx] = max(pre_score, self.threshold) if decision == "accept" else pre_score
+
+        llm_scores = self._score_with_llm([articles[idx] for idx in escalated])
+        for idx, score in zip(escalated, llm_scores):
+            scores[idx] = score
+
+        decided = len(articles) - len(escalated)
+        if decided:
+            print(f"Pre-filter decided {decided} articles locally, {len(escalated)} escalated to the LLM.")
+        return scores
+
+    def _score_with_llm(self, articles: List[Article]) -> List[float]:
+        """
+        Scores articles with the relevance model (see `_score_in_batches`). With the cascade
+        enabled, scores near the threshold are then replaced by the cascade model's.
+        """
+        scores = self._score_in_batches(articles, self.llm)
+        if self.cascade_llm:
+            self._cascade(articles, scores)
+        return scores
+
+    def _cascade(self, articles: List[Article], scores: List[float]):
+        borderline = [
+            idx for idx, (article, score) in enumerate(zip(articles, scores))
+            if "relevance_error" not in article.raw_data and abs(score - self.threshold) <= self.cascade_margin
+        ]
+        if not borderline:
+            return
+        rescored = self._score_in_batches([articles[idx] for idx in borderline], self.cascade_llm)
+        for idx, score in zip(borderline, rescored):
+            article = articles[idx]
+            if article.raw_data.pop("relevance_error", None) is not None:
+                continue  # the cascade model failed: keep the first score
+            article.raw_data["relevance_first_score"] = scores[idx]
+            article.raw_data["relevance_source"] = "cascade"
+            scores[idx] = score
+        print(f"Cascade re-scored {len(borderline)} borderline articles.")
+
+    def _score_in_batches(self, articles: List[Article], llm) -> List[float]:
+        """
+        Scores articles with `llm`, `batch_size` at a time, sending up to `max_concurrency` batches at once.
+        Articles whose batch fails to parse (or that the model skipped) are re-scored one by one.
+        """
+        batch_size = max(1, self.batch_size)
+        # Start index of every batch worth a batch prompt (a lone article is scored singly)
+        starts = [start for start in range(0, len(articles), batch_size) if len(articles) - start > 1]
+        _, chain = self._chains_for(llm)
+        results = self._invoke_all(chain, [self._batch_inputs(articles[start:start + batch_size]) for start in starts])
+
+        scores: List[Optional[float]] = [None] * len(articles)
+        for start, result in zip(starts, results):
+            try:
+                if isinstance(result, Exception):
+                    raise result
+                batch_scores = self._parse_batch_scores(result, len(articles[start:start + batch_size]))
+            except Exception as e:
+                print(f"Batch scoring failed, falling back to single-article scoring: {e}")
+                continue
+            for key, score in batch_scores.items():
+                scores[start + int(key)] = score
+
+        missing = [idx for idx, score in enumerate(scores) if score is None]
+        for idx, (_, score) in zip(missing, self.run_many([articles[idx] for idx in missing], llm)):
+            scores[idx] = score
+        return scores
@@ -1,14 +1,13 @@
 from src.utils.llm_client import LLMClient
+from src.utils.rate_limiter import get_rate_limiter
+from src.utils.retry import call_all
 from src.state import Article
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from typing import List, Optional
 
 class InsightGenerator:
-    def __init__(self):
-        self.llm = LLMClient().get_chat_model(temperature=0.3)
-
-    def generate_insight(self, article: Article, summary: str) -> str:
-        prompt_text = """
+    PROMPT = """
         Based on the following article summary, provide a one-sentence technical insight for an AI Engineer in Korean.
         Explain WHY this is important or how it can be applied in practice.
         
@@ -19,6 +18,38 @@ class InsightGenerator:
         
         Insight:
         """
-        prompt = ChatPromptTemplate.from_template(prompt_text)
-        chain = prompt | self.llm | StrOutputParser()
-        return chain.invoke({"title": article.title, "summary": summary})
+
+    def __init__(self, client: Optional[LLMClient] = None):
+        client = client or LLMClient()
+        self.llm = client.get_chat_model(temperature=0.3, task="insight")
+        processing_cfg = client.config.get("processing", {})
+        # `run_many` calls share the pipeline's request budget and 429/5xx retries
+        self.rate_limiter = get_rate_limiter(processing_cfg.get("requests_per_minute", 500))
+        self.max_retries = processing_cfg.get("max_retries", 3)
+        # Compiled once and reused for every article
+        self.chain = self._build_chain()
+
+    def generate_insight(self, article: Article, summary: str) -> str:
+        return self.chain.invoke({"title": article.title, "summary": summary})
+
+    async def agenerate_insight(self, article: Article, summary: str) -> str:
+        return await self.chain.ainvoke({"title": article.title, "summary": summary})
+
+    def run_many(self, articles: List[Article], summaries: List[str], max_concurrency: int = 8,
+                 return_exceptions: bool = False) -> list:
+        """Insights for many (article, summary) pairs in input order, up to `max_concurrency` requests at a time.
+        With `return_exceptions`, a failed article yields its exception instead of aborting the rest."""
+        results = call_all(
+            self.chain.invoke,
+            [{"title": article.title, "summary": summary} for article, summary in zip(articles, summaries)],
+            max_concurrency, self.rate_limiter, self.max_retries,
+        )
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+        return results
+
+    def _build_chain(self):
+        prompt = ChatPromptTemplate.from_template(self.PROMPT)
+        return prompt | self.llm | StrOutputParser()
@@ -0,0 +1,120 @@
+import asyncio
+import openai
+from typing import Callable, Iterable, List, Optional
+
+from src.processors.combined import CombinedProcessor
+from src.processors.insight_generator import InsightGenerator
+from src.processors.summarizer import Summarizer
+from src.state import Article
+from src.utils.llm_client import aclose_llm_connections
+from src.utils.rate_limiter import TokenBucket
+from src.utils.retry import aretry_call, is_retryable
+
+
+def failed_transiently(failed: Iterable[Article]) -> bool:
+    """True if any of the articles `process_article` gave up on hit a retryable error (rate limit, 5xx,
+    connection), i.e. the API looks down and a resumed run may still succeed."""
+    return any(article.raw_data.get("processing_error_retryable") for article in failed)
+
+
+class AsyncProcessingPipeline:
+    """Generates summaries and insights for many articles concurrently.
+
+    At most `max_concurrency` articles are in flight at once, every LLM call
+    first takes a token from the shared rate limiter, and 429/5xx failures are
+    retried with jittered exponential backoff. Output order matches input order.
+
+    Articles whose source is in `combined_sources` get summary and insight from
+    one `CombinedProcessor` call, falling back to the two-call path when its
+    response cannot be parsed or the request is rejected (HTTP 400, e.g. a
+    model without JSON mode).
+
+    Content the summarizer map-reduces is condensed one chunk at a time, each
+    chunk a separate rate-limited and retried call, so an article never has
+    more than one request in flight.
+    """
+
+    def __init__(
+        self,
+        summarizer: Summarizer,
+        insight_generator: InsightGenerator,
+        max_concurrency: int = 8,
+        rate_limiter: Optional[TokenBucket] = None,
+        max_retries: int = 3,
+        combined_processor: Optional[CombinedProcessor] = None,
+        combined_sources: Iterable[str] = (),
+    ):
+        self.summarizer = summarizer
+        self.insight_generator = insight_generator
+        self.max_concurrency = max(1, max_concurrency)
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.combined_processor = combined_processor
+        self.combined_sources = set(combined_sources)
+
+    def run(self, articles: List[Article], on_processed: Optional[Callable[[Article], None]] = None) -> List[Article]:
+        async def run_and_close():
+            try:
+                return await self.arun(articles, on_processed)
+            finally:
+                # The connections of this loop cannot be reused once `asyncio.run` closes it
+                await aclose_llm_connections()
+
+        return asyncio.run(run_and_close())
+
+    async def arun(
+        self, articles: List[Article], on_processed: Optional[Callable[[Article], None]] = None
+    ) -> List[Article]:
+        """Processes all articles. `on_processed` is called with each article as soon as it succeeds,
+        so callers can persist progress before the whole batch is done."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(article: Article) -> Optional[Article]:
+            async with semaphore:
+                result = await self.process_article(article)
+            if result is not None and on_processed:
+                on_processed(result)
+            return result
+
+        # gather keeps input order, so the relevance ranking from the filter stage is preserved
+        results = await asyncio.gather(*(bounded(article) for article in articles))
+        return [article for article in results if article is not None]
+
+    async def process_article(self, article: Article) -> Optional[Article]:
+        """Returns the article with summary and insight, or None after recording the error in its raw_data."""
+        article.raw_data.pop("processing_error", None)
+        article.raw_data.pop("processing_error_retryable", None)
+        try:
+            if self.combined_processor and article.source in self.combined_sources:
+                try:
+                    article.summary, article.insight = await self._call(
+                        lambda: self.combined_processor.aprocess(article)
+                    )
+                    print(f"Processed: {article.title}")
+                    return article
+                except (ValueError, openai.BadRequestError) as e:
+                    print(f"Combined processing failed for {article.title}, using two-call path: {e}")
+
+            notes = None
+            if self.summarizer.needs_chunking(article):
+                notes = [await self._call(lambda inputs=inputs: self.summarizer.anote(inputs))
+                         for inputs in self.summarizer.chunk_inputs(article)]
+            article.summary = await self._call(lambda: self.summarizer.asummarize(article, notes))
+            article.insight = await self._call(
+                lambda: self.insight_generator.agenerate_insight(article, article.summary)
+            )
+            print(f"Processed: {article.title}")
+            return article
+        except Exception as e:
+            print(f"Error processing {article.title}: {e}")
+            article.raw_data["processing_error"] = str(e)
+            article.raw_data["processing_error_retryable"] = is_retryable(e)
+            return None
+
+    async def _call(self, fn):
+        async def limited():
+            if self.rate_limiter:
+                await self.rate_limiter.aacquire()
+            return await fn()
+
+        return await aretry_call(limited, max_retries=self.max_retries)
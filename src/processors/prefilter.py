@@ -0,0 +1,71 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+
+from src.state import Article
+
+
+class KeywordPreFilter:
+    """Cheap local relevance pre-scoring ahead of the LLM filter.
+
+    Each article gets a score in [0, 1] from a small linear model over keyword
+    counts (title hits weighted double, counts log-scaled) squashed by a
+    sigmoid. Articles below `reject_below` are rejected and above
+    `accept_above` accepted without an LLM call; everything in between is
+    escalated to the LLM scorer.
+    """
+
+    DEFAULT_WEIGHTS: Dict[str, float] = {
+        # Technical depth / core topics
+        "llm": 0.8, "large language model": 1.0, "language model": 0.8, "transformer": 0.8,
+        "diffusion": 0.6, "fine-tuning": 0.8, "fine-tune": 0.6, "quantization": 1.0, "inference": 0.6,
+        "benchmark": 0.6, "state-of-the-art": 0.8, "architecture": 0.5, "reinforcement learning": 0.7,
+        "rag": 0.7, "retrieval": 0.5, "agent": 0.5, "agents": 0.5, "multimodal": 0.6, "reasoning": 0.6,
+        "alignment": 0.6, "embedding": 0.5, "embeddings": 0.5, "gpu": 0.4, "training": 0.4,
+        "neural network": 0.6, "machine learning": 0.5, "deep learning": 0.6, "open-weight": 0.8,
+        "gpt": 0.6, "claude": 0.6, "gemini": 0.6, "llama": 0.6, "mistral": 0.6,
+        # Off-topic / marketing
+        "crypto": -1.5, "cryptocurrency": -1.5, "bitcoin": -1.5, "blockchain": -1.2, "nft": -1.5,
+        "stock": -0.8, "election": -1.0, "webinar": -1.0, "sponsored": -1.2, "giveaway": -1.5,
+        "discount": -1.0, "podcast": -0.8, "event recap": -0.8, "customer story": -0.6, "hiring": -0.6,
+    }
+
+    def __init__(
+        self,
+        weights: Optional[Dict[str, float]] = None,
+        bias: float = -1.0,
+        reject_below: float = 0.15,
+        accept_above: float = 0.98,
+    ):
+        self.weights = {term.lower(): weight for term, weight in (weights or self.DEFAULT_WEIGHTS).items()}
+        self.bias = bias
+        self.reject_below = reject_below
+        self.accept_above = accept_above
+        # One alternation over all terms, longest first so phrases win over their sub-words
+        terms = sorted(self.weights, key=len, reverse=True)
+        self._pattern = re.compile(r"\b(" + "|".join(re.escape(t) for t in terms) + r")\b", re.IGNORECASE)
+
+    def score(self, article: Article) -> float:
+        counts = Counter(m.lower() for m in self._pattern.findall(article.content or ""))
+        for m in self._pattern.findall(article.title or ""):
+            counts[m.lower()] += 2
+
+        logit = self.bias + sum(self.weights[term] * math.log1p(count) for term, count in counts.items())
+        return 1.0 / (1.0 + math.exp(-logit))
+
+    def classify(self, score: float) -> str:
+        """Returns 'reject', 'accept' or 'escalate' for a pre-score."""
+        if score < self.reject_below:
+            return "reject"
+        if score > self.accept_above:
+            return "accept"
+        return "escalate"
+
+    def triage(self, articles: List[Article]) -> List[tuple]:
+        """Returns (decision, score) per article."""
+        results = []
+        for article in articles:
+            score = self.score(article)
+            results.append((self.classify(score), score))
+        return results
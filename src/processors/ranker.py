@@ -0,0 +1,130 @@
+import math
+from typing import List, Optional
+
+import numpy as np
+
+from src.state import Article
+from src.utils.embedding_cache import EmbeddingCache
+
+
+def kmeans(vectors: np.ndarray, k: int, iterations: int = 25, seed: int = 0) -> tuple:
+    """Spherical k-means over L2-normalized rows (cosine similarity), k-means++ seeded.
+
+    Returns (labels, centroids). Fully vectorized: each iteration is one matrix product.
+    """
+    n = len(vectors)
+    k = max(1, min(k, n))
+    rng = np.random.default_rng(seed)
+
+    centroids = [vectors[rng.integers(n)]]
+    for _ in range(1, k):
+        # Next seed is drawn proportionally to its cosine distance from the closest chosen seed
+        distance = 1.0 - np.max(vectors @ np.array(centroids).T, axis=1)
+        distance = np.clip(distance, 0.0, None)
+        total = distance.sum()
+        centroids.append(vectors[rng.choice(n, p=distance / total)] if total > 0 else vectors[rng.integers(n)])
+    centroids = np.array(centroids)
+
+    labels = np.full(n, -1)
+    for _ in range(iterations):
+        new_labels = np.argmax(vectors @ centroids.T, axis=1)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, vectors)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        # Empty clusters keep their previous centroid
+        centroids = np.where(norms > 0, sums / np.where(norms > 0, norms, 1.0), centroids)
+    return labels, centroids
+
+
+def mmr(vectors: np.ndarray, relevance: np.ndarray, top_n: int, diversity: float = 0.3) -> List[int]:
+    """Maximal Marginal Relevance: greedily picks items with high relevance and low similarity to those
+    already picked. `diversity` in [0, 1] is the weight of the redundancy penalty. Returns indices in pick order."""
+    n = len(vectors)
+    top_n = min(top_n, n)
+    if top_n <= 0:
+        return []
+    similarity = vectors @ vectors.T
+    selected = [int(np.argmax(relevance))]
+    # Highest similarity of every item to the picked set, updated incrementally
+    max_similarity = similarity[selected[0]].copy()
+    available = np.ones(n, dtype=bool)
+    available[selected[0]] = False
+    while len(selected) < top_n:
+        scores = (1.0 - diversity) * relevance - diversity * max_similarity
+        scores[~available] = -np.inf
+        pick = int(np.argmax(scores))
+        selected.append(pick)
+        available[pick] = False
+        max_similarity = np.maximum(max_similarity, similarity[pick])
+    return selected
+
+
+class EmbeddingRanker:
+    """Selects a diverse top-N of the relevant articles before summarization.
+
+    Articles are embedded (vectors cached by text hash), clustered into topics
+    with k-means, and picked by MMR over the LLM relevance scores, so the
+    briefing covers several topics instead of many copies of the top one.
+    Each article is tagged with raw_data['topic'] (cluster id) and
+    raw_data['topic_title'] (the title of the article closest to the centroid).
+    """
+
+    MAX_CHARS = 2000  # of title + content embedded per article
+
+    def __init__(
+        self,
+        embeddings,
+        cache: Optional[EmbeddingCache] = None,
+        model_name: str = "embeddings",
+        top_n: int = 15,
+        diversity: float = 0.3,
+        num_topics: Optional[int] = None,
+    ):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model_name = model_name
+        self.top_n = top_n
+        self.diversity = diversity
+        self.num_topics = num_topics
+
+    def _text(self, article: Article) -> str:
+        return f"{article.title}\n{article.content or ''}"[:self.MAX_CHARS]
+
+    def embed(self, articles: List[Article]) -> np.ndarray:
+        """Returns L2-normalized embedding rows, computing only those missing from the cache."""
+        texts = [self._text(a) for a in articles]
+        keys = [EmbeddingCache.key(self.model_name, text) for text in texts]
+        cached = self.cache.get_many(keys) if self.cache else {}
+
+        missing = {key: text for key, text in zip(keys, texts) if key not in cached}
+        if missing:
+            computed = dict(zip(missing, self.embeddings.embed_documents(list(missing.values()))))
+            computed = {key: np.asarray(vector, dtype=np.float32) for key, vector in computed.items()}
+            if self.cache:
+                self.cache.put_many(computed)
+            cached = {**cached, **computed}
+
+        vectors = np.array([cached[key] for key in keys], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms > 0, norms, 1.0)
+
+    def rank(self, articles: List[Article]) -> List[Article]:
+        """Returns at most `top_n` articles in MMR pick order, tagged with their topic."""
+        if not articles:
+            return []
+        vectors = self.embed(articles)
+
+        k = self.num_topics or max(1, round(math.sqrt(len(articles) / 2)))
+        labels, centroids = kmeans(vectors, k)
+        for topic in set(labels.tolist()):
+            members = np.flatnonzero(labels == topic)
+            representative = members[np.argmax(vectors[members] @ centroids[topic])]
+            for idx in members:
+                articles[idx].raw_data["topic"] = int(topic)
+                articles[idx].raw_data["topic_title"] = articles[representative].title
+
+        relevance = np.array([a.relevance_score for a in articles], dtype=np.float32)
+        return [articles[idx] for idx in mmr(vectors, relevance, self.top_n, self.diversity)]
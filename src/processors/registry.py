@@ -0,0 +1,81 @@
+import os
+import threading
+from typing import Dict, Optional
+
+from src.processors.combined import CombinedProcessor
+from src.processors.filters import RelevanceFilter
+from src.processors.insight_generator import InsightGenerator
+from src.processors.summarizer import Summarizer
+from src.utils.llm_client import LLMClient
+from src.utils.token_budget import TokenBudget
+
+
+class ProcessorRegistry:
+    """Builds each LLM processor once and hands out the same instance afterwards.
+
+    All processors share one `LLMClient` (one config read, one LLM cache) and
+    one `TokenBudget` (an article is cleaned and counted once, however many
+    prompts it goes into), their chat models share the process-wide HTTP pool
+    (see `get_llm_http_clients`), and each compiles its prompt chains in its
+    constructor, so per-article calls only pay for the request itself.
+    """
+
+    def __init__(self, config_path: str = "config/settings.yaml"):
+        self.config_path = config_path
+        self._client: Optional[LLMClient] = None
+        self._budget: Optional[TokenBudget] = None
+        self._processors: Dict[type, object] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> LLMClient:
+        with self._lock:
+            if self._client is None:
+                self._client = LLMClient(self.config_path)
+            return self._client
+
+    @property
+    def token_budget(self) -> TokenBudget:
+        client = self.client
+        with self._lock:
+            if self._budget is None:
+                self._budget = TokenBudget.from_config(client.config)
+            return self._budget
+
+    def get(self, processor_cls: type, **kwargs):
+        """The shared instance of `processor_cls` (constructed with the shared client and `kwargs` on first use)."""
+        client = self.client
+        with self._lock:
+            processor = self._processors.get(processor_cls)
+            if processor is None:
+                processor = self._processors[processor_cls] = processor_cls(client, **kwargs)
+            return processor
+
+    @property
+    def relevance_filter(self) -> RelevanceFilter:
+        return self.get(RelevanceFilter, budget=self.token_budget)
+
+    @property
+    def summarizer(self) -> Summarizer:
+        return self.get(Summarizer, budget=self.token_budget)
+
+    @property
+    def insight_generator(self) -> InsightGenerator:
+        return self.get(InsightGenerator)
+
+    @property
+    def combined_processor(self) -> CombinedProcessor:
+        return self.get(CombinedProcessor, budget=self.token_budget)
+
+
+_registries: Dict[str, ProcessorRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_processor_registry(config_path: str = "config/settings.yaml") -> ProcessorRegistry:
+    """Returns the process-wide registry for a settings file."""
+    key = os.path.abspath(config_path)
+    with _registries_lock:
+        if key not in _registries:
+            _registries[key] = ProcessorRegistry(config_path)
+        return _registries[key]
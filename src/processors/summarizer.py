@@ -1,20 +1,14 @@
 from src.utils.llm_client import LLMClient
+from src.utils.rate_limiter import get_rate_limiter
+from src.utils.retry import call_all
+from src.utils.token_budget import TokenBudget
 from src.state import Article
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from typing import List, Optional
 
 class Summarizer:
-    def __init__(self):
-        self.llm = LLMClient().get_chat_model(temperature=0.1)
-
-    def summarize(self, article: Article) -> str:
-        if article.source == 'arxiv':
-            return self._summarize_paper(article)
-        else:
-            return self._summarize_news(article)
-
-    def _summarize_paper(self, article: Article) -> str:
-        prompt_text = """
+    PAPER_PROMPT = """
         Summarize the following AI research paper for a Korean AI Engineer.
         Use the following format strictly:
         
@@ -26,12 +20,8 @@ class Summarizer:
         Title: {title}
         Abstract: {content}
         """
-        prompt = ChatPromptTemplate.from_template(prompt_text)
-        chain = prompt | self.llm | StrOutputParser()
-        return chain.invoke({"title": article.title, "content": article.content})
 
-    def _summarize_news(self, article: Article) -> str:
-        prompt_text = """
+    NEWS_PROMPT = """
         Summarize the following AI news in 3 bullet point sentences in Korean.
         Focus on facts and tech details.
         
@@ -39,6 +29,101 @@ class Summarizer:
         Title: {title}
         Content: {content}
         """
+
+    # Map step for content over the "summary" token budget: each chunk is condensed to notes,
+    # and the joined notes are summarized with the regular prompt
+    CHUNK_PROMPT = """
+        Extract the key technical facts (problem, method, results, numbers, names) from this part of an article as short bullet points.
+        
+        Title: {title}
+        Part {part} of {parts}:
+        {content}
+        """
+
+    def __init__(self, client: Optional[LLMClient] = None, budget: Optional[TokenBudget] = None):
+        client = client or LLMClient()
+        self.llm = client.get_chat_model(temperature=0.1, task="summary")
+        self.budget = budget or TokenBudget.from_config(client.config)
+        processing_cfg = client.config.get("processing", {})
+        # `run_many` calls share the pipeline's request budget and 429/5xx retries
+        self.rate_limiter = get_rate_limiter(processing_cfg.get("requests_per_minute", 500))
+        self.max_retries = processing_cfg.get("max_retries", 3)
+        # Compiled once and reused for every article
+        self.paper_chain = self._build_chain(self.PAPER_PROMPT)
+        self.news_chain = self._build_chain(self.NEWS_PROMPT)
+        self.chunk_chain = self._build_chain(self.CHUNK_PROMPT)
+
+    def summarize(self, article: Article) -> str:
+        notes = None
+        if self.needs_chunking(article):
+            notes = [self.chunk_chain.invoke(inputs) for inputs in self.chunk_inputs(article)]
+        return self._chain(article).invoke(self._inputs(article, notes))
+
+    async def asummarize(self, article: Article, notes: Optional[List[str]] = None) -> str:
+        """Summary of the article. Over-budget content (see `needs_chunking`) is summarized from `notes`,
+        one `anote` per `chunk_inputs` entry; when not given they are computed here, one chunk at a time."""
+        if notes is None and self.needs_chunking(article):
+            notes = [await self.anote(inputs) for inputs in self.chunk_inputs(article)]
+        return await self._chain(article).ainvoke(self._inputs(article, notes))
+
+    async def anote(self, chunk_inputs: dict) -> str:
+        """Notes on one chunk of an over-budget article (the map step)."""
+        return await self.chunk_chain.ainvoke(chunk_inputs)
+
+    def run_many(self, articles: List[Article], max_concurrency: int = 8, return_exceptions: bool = False) -> list:
+        """Summaries of many articles in input order, up to `max_concurrency` requests at a time.
+        With `return_exceptions`, a failed article yields its exception instead of aborting the rest."""
+        results: list = [None] * len(articles)
+
+        # Map step of every over-budget article in one batch
+        chunked = [(idx, inputs) for idx, article in enumerate(articles) if self.needs_chunking(article)
+                   for inputs in self.chunk_inputs(article)]
+        notes = self._invoke_all(self.chunk_chain, [inputs for _, inputs in chunked], max_concurrency)
+        contents = {}
+        for (idx, _), note in zip(chunked, notes):
+            if isinstance(note, Exception):
+                results[idx] = note
+            else:
+                contents.setdefault(idx, []).append(note)
+
+        for chain in (self.paper_chain, self.news_chain):
+            indices = [idx for idx, article in enumerate(articles)
+                       if self._chain(article) is chain and results[idx] is None]
+            if not indices:
+                continue
+            inputs = [self._inputs(articles[idx], contents.get(idx)) for idx in indices]
+            for idx, output in zip(indices, self._invoke_all(chain, inputs, max_concurrency)):
+                results[idx] = output
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+        return results
+
+    def _invoke_all(self, chain, inputs: List[dict], max_concurrency: int) -> list:
+        """`chain.invoke` on every input through the rate limiter and retries; a failure is returned in place."""
+        return call_all(chain.invoke, inputs, max_concurrency, self.rate_limiter, self.max_retries)
+
+    def _build_chain(self, prompt_text: str):
         prompt = ChatPromptTemplate.from_template(prompt_text)
-        chain = prompt | self.llm | StrOutputParser()
-        return chain.invoke({"title": article.title, "content": article.content})
+        return prompt | self.llm | StrOutputParser()
+
+    def _chain(self, article: Article):
+        return self.paper_chain if article.source == 'arxiv' else self.news_chain
+
+    def needs_chunking(self, article: Article) -> bool:
+        """True when the article's content is map-reduced: over the "summary" budget with long_content: map_reduce."""
+        return self.budget.map_reduce and not self.budget.fits(article, "summary")
+
+    def chunk_inputs(self, article: Article) -> List[dict]:
+        chunks = self.budget.chunks(article)
+        return [{"title": article.title, "part": part, "parts": len(chunks), "content": chunk}
+                for part, chunk in enumerate(chunks, 1)]
+
+    def _reduce(self, notes: List[str]) -> str:
+        return self.budget.truncate("\n".join(note.strip() for note in notes), "summary")
+
+    def _inputs(self, article: Article, notes: Optional[List[str]] = None) -> dict:
+        """Prompt inputs: the chunk `notes` when given, else the content cut to the "summary" budget."""
+        content = self._reduce(notes) if notes is not None else self.budget.fit(article, "summary")
+        return {"title": article.title, "content": content}
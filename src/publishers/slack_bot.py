@@ -1,7 +1,7 @@
 import os
-import requests
 from typing import List
 from src.state import Article
+from src.utils.http_client import get_http_client
 from datetime import datetime
 
 class SlackBot:
@@ -30,6 +30,9 @@ class SlackBot:
             title_link = f"<{article.url}|*{article.title}*>"
             score = f"`Relevance: {article.relevance_score:.2f}`"
             source = f"_{article.source.upper()}_"
+            # Same story seen on other sources (merged by near-duplicate detection)
+            for dup in article.raw_data.get("duplicate_urls", []):
+                source += f" <{dup['url']}|_{dup['source'].upper()}_>"
             
             summary_text = article.summary.replace("\n", " ") if article.summary else "No summary."
             # Truncate summary if too long
@@ -70,7 +73,7 @@ class SlackBot:
         payload = self._format_message(articles)
         
         try:
-            response = requests.post(self.webhook_url, json=payload)
+            response = get_http_client().post(self.webhook_url, json=payload)
             if response.status_code == 200:
                 print("💬 Slack message sent successfully.")
             else:
@@ -16,6 +16,13 @@ class Article:
     insight: Optional[str] = None
     raw_data: dict = field(default_factory=dict)
 
+def merge_stats(left: dict, right: dict) -> dict:
+    """Reducer for run stats: each node contributes its own top-level keys."""
+    return {**(left or {}), **(right or {})}
+
 class AgentState(TypedDict):
+    # Also the LangGraph thread id under which the run is checkpointed (see `main.py --resume`)
+    run_id: str
     articles: List[Article]
-    # We can add logs or status flags here if needed
+    # Per-run observability, e.g. {"collectors": {"arxiv": {"status": "ok", ...}}}
+    stats: Annotated[dict, merge_stats]
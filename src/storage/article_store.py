@@ -0,0 +1,202 @@
+import argparse
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from src.state import Article
+from src.storage.seen_store import url_fingerprint
+from src.storage.sqlite import chunked_lookup, connect
+
+# Pipeline stages in order; a stored article never moves back to an earlier one
+STATUS_RANK = {"fetched": 0, "rejected": 1, "scored": 1, "processed": 2, "published": 3}
+
+
+def article_key(article: Article) -> str:
+    """Stable identity of an article: its normalized URL, or source + title when it has none."""
+    if article.url:
+        return url_fingerprint(article.url)
+    return "t:" + hashlib.sha1(f"{article.source}\n{article.title}".encode("utf-8")).hexdigest()
+
+
+class ArticleStore:
+    """Persistent corpus of every article the pipeline has seen, with a full-text index.
+
+    Each node upserts the articles it handled, so a row carries the furthest
+    stage reached (fetched, scored/rejected, processed, published) along with
+    its relevance score, summary and insight. Title, content, summary and
+    insight are indexed with FTS5 for `search`, and stored scores and
+    summaries are reused when a rerun sees the same article again.
+    """
+
+    COLUMNS = (
+        "key", "url", "source", "title", "content", "author", "date", "category",
+        "relevance_score", "summary", "insight", "raw_data", "status", "status_rank", "first_seen", "updated_at",
+    )
+
+    def __init__(self, path: str = "data/articles.sqlite"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(
+            """CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY,
+                key TEXT NOT NULL UNIQUE,
+                url TEXT,
+                source TEXT NOT NULL,
+                title TEXT NOT NULL,
+                content TEXT,
+                author TEXT,
+                date TEXT,
+                category TEXT,
+                relevance_score REAL,
+                summary TEXT,
+                insight TEXT,
+                raw_data TEXT,
+                status TEXT NOT NULL,
+                status_rank INTEGER NOT NULL,
+                first_seen REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_articles_url ON articles(url);
+            CREATE INDEX IF NOT EXISTS idx_articles_source ON articles(source);
+            CREATE INDEX IF NOT EXISTS idx_articles_date ON articles(date);
+            CREATE INDEX IF NOT EXISTS idx_articles_first_seen ON articles(first_seen);
+            CREATE INDEX IF NOT EXISTS idx_articles_relevance ON articles(relevance_score);
+
+            CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                title, content, summary, insight, content='articles', content_rowid='id'
+            );
+            CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+                INSERT INTO articles_fts(rowid, title, content, summary, insight)
+                VALUES (new.id, new.title, new.content, new.summary, new.insight);
+            END;
+            CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+                INSERT INTO articles_fts(articles_fts, rowid, title, content, summary, insight)
+                VALUES ('delete', old.id, old.title, old.content, old.summary, old.insight);
+                INSERT INTO articles_fts(rowid, title, content, summary, insight)
+                VALUES (new.id, new.title, new.content, new.summary, new.insight);
+            END;
+            CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+                INSERT INTO articles_fts(articles_fts, rowid, title, content, summary, insight)
+                VALUES ('delete', old.id, old.title, old.content, old.summary, old.insight);
+            END;"""
+        )
+        self._conn.commit()
+
+    def upsert(self, articles: Iterable[Article], status: str):
+        """Records articles at a pipeline stage. Scores, summaries and insights already stored are kept
+        unless the new values replace them, and the status only moves forward."""
+        now = time.time()
+        scored = STATUS_RANK[status] >= STATUS_RANK["scored"]
+        rows = [(
+            article_key(a), a.url, a.source, a.title, a.content, a.author, a.date, a.category,
+            # Failed scoring leaves a placeholder 0.0 that must not be reused on the next run
+            a.relevance_score if scored and "relevance_error" not in a.raw_data else None, a.summary, a.insight,
+            json.dumps(a.raw_data, ensure_ascii=False, default=str), status, STATUS_RANK[status], now, now,
+        ) for a in articles]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                f"""INSERT INTO articles ({", ".join(self.COLUMNS)}) VALUES ({", ".join("?" * len(self.COLUMNS))})
+                    ON CONFLICT(key) DO UPDATE SET
+                        url = excluded.url, title = excluded.title, content = excluded.content,
+                        author = excluded.author, date = excluded.date, category = excluded.category,
+                        relevance_score = COALESCE(excluded.relevance_score, relevance_score),
+                        summary = COALESCE(excluded.summary, summary),
+                        insight = COALESCE(excluded.insight, insight),
+                        raw_data = excluded.raw_data,
+                        status = CASE WHEN excluded.status_rank >= status_rank THEN excluded.status ELSE status END,
+                        status_rank = MAX(excluded.status_rank, status_rank),
+                        updated_at = excluded.updated_at""",
+                rows,
+            )
+            self._conn.commit()
+
+    def lookup(self, articles: List[Article]) -> Dict[str, dict]:
+        """Stored rows of the given articles, keyed by `article_key`."""
+        keys = list({article_key(a) for a in articles})
+        with self._lock:
+            rows = chunked_lookup(self._conn, "SELECT * FROM articles WHERE key IN ({placeholders})", keys)
+        return {row["key"]: dict(row) for row in rows}
+
+    def restore_scores(self, articles: List[Article]) -> List[Article]:
+        """Copies stored relevance scores onto articles; returns the articles that still need scoring."""
+        stored = self.lookup(articles)
+        unscored = []
+        for article in articles:
+            row = stored.get(article_key(article))
+            if row and row["relevance_score"] is not None:
+                article.relevance_score = row["relevance_score"]
+            else:
+                unscored.append(article)
+        return unscored
+
+    def restore_processed(self, articles: List[Article]) -> List[Article]:
+        """Copies stored summaries and insights onto articles; returns the articles that still need processing."""
+        stored = self.lookup(articles)
+        pending = []
+        for article in articles:
+            row = stored.get(article_key(article))
+            if row and row["status_rank"] >= STATUS_RANK["processed"] and row["summary"] and row["insight"]:
+                article.summary, article.insight = row["summary"], row["insight"]
+            else:
+                pending.append(article)
+        return pending
+
+    def search(
+        self,
+        query: str,
+        days: Optional[float] = 30,
+        source: Optional[str] = None,
+        min_score: Optional[float] = None,
+        limit: int = 20,
+    ) -> List[dict]:
+        """Full-text search (FTS5 query syntax) over articles first seen in the last `days`, best matches first."""
+        sql = """SELECT a.*, bm25(articles_fts) AS rank FROM articles_fts
+                 JOIN articles a ON a.id = articles_fts.rowid
+                 WHERE articles_fts MATCH ?"""
+        params: list = [query]
+        if days is not None:
+            sql += " AND a.first_seen >= ?"
+            params.append(time.time() - days * 86400)
+        if source:
+            sql += " AND a.source = ?"
+            params.append(source)
+        if min_score is not None:
+            sql += " AND a.relevance_score >= ?"
+            params.append(min_score)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search the local article store.")
+    parser.add_argument("query", help='FTS5 query, e.g. "quantization" or "agent AND eval*"')
+    parser.add_argument("--days", type=float, default=30, help="only articles first seen in the last N days")
+    parser.add_argument("--source", help="arxiv, rss or anthropic")
+    parser.add_argument("--min-score", type=float, help="minimum relevance score")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--db", default="data/articles.sqlite")
+    args = parser.parse_args()
+
+    store = ArticleStore(args.db)
+    for row in store.search(args.query, days=args.days, source=args.source, min_score=args.min_score, limit=args.limit):
+        score = f"{row['relevance_score']:.2f}" if row["relevance_score"] is not None else "-"
+        print(f"[{row['source']}] {row['date'] or '?'}  score={score}  {row['status']}")
+        print(f"  {row['title']}")
+        print(f"  {row['url']}")
+
+
+if __name__ == "__main__":
+    main()
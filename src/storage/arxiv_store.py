@@ -0,0 +1,119 @@
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional
+
+from src.storage.sqlite import connect
+
+
+class ArxivStore:
+    """Local copy of harvested arXiv entries plus a per-category watermark.
+
+    The watermark records the newest entry fetched for a category and the
+    oldest publication time down to which the category is fully covered
+    (`floor`). Incremental harvesting only pages through the API until it
+    reaches the watermark, and articles are served from the local table, so
+    reruns and wider lookbacks within the covered range cost no API calls.
+    """
+
+    def __init__(self, path: str = "data/arxiv.sqlite"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.executescript(
+            """CREATE TABLE IF NOT EXISTS entries (
+                entry_id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                summary TEXT,
+                authors TEXT,
+                pdf_url TEXT,
+                primary_category TEXT,
+                published REAL NOT NULL,
+                published_iso TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS category_entries (
+                category TEXT NOT NULL,
+                entry_id TEXT NOT NULL,
+                published REAL NOT NULL,
+                PRIMARY KEY (category, entry_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_category_entries_published ON category_entries(category, published);
+            CREATE TABLE IF NOT EXISTS watermarks (
+                category TEXT PRIMARY KEY,
+                entry_id TEXT NOT NULL,
+                published REAL NOT NULL,
+                floor REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );"""
+        )
+        self._conn.commit()
+
+    def watermark(self, category: str) -> Optional[dict]:
+        """Returns {entry_id, published, floor} (datetimes in UTC) for a category, or None before its first harvest."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT entry_id, published, floor FROM watermarks WHERE category = ?", (category,)
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            "entry_id": row[0],
+            "published": datetime.fromtimestamp(row[1], timezone.utc),
+            "floor": datetime.fromtimestamp(row[2], timezone.utc),
+        }
+
+    def set_watermark(self, category: str, entry_id: str, published: datetime, floor: datetime):
+        with self._lock:
+            self._conn.execute(
+                """INSERT INTO watermarks (category, entry_id, published, floor, updated_at) VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(category) DO UPDATE SET entry_id = excluded.entry_id, published = excluded.published,
+                   floor = excluded.floor, updated_at = excluded.updated_at""",
+                (category, entry_id, published.timestamp(), floor.timestamp(), time.time()),
+            )
+            self._conn.commit()
+
+    def upsert(self, category: str, entries: Iterable[dict]):
+        """Stores entries (entry_id, title, summary, authors, pdf_url, primary_category, published) under a category."""
+        now = time.time()
+        entry_rows, category_rows = [], []
+        for entry in entries:
+            published = entry["published"]
+            entry_rows.append((
+                entry["entry_id"], entry["title"], entry.get("summary"), entry.get("authors"),
+                entry.get("pdf_url"), entry.get("primary_category"), published.timestamp(), published.isoformat(), now,
+            ))
+            category_rows.append((category, entry["entry_id"], published.timestamp()))
+        if not entry_rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                """INSERT INTO entries (entry_id, title, summary, authors, pdf_url, primary_category,
+                                        published, published_iso, fetched_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(entry_id) DO UPDATE SET title = excluded.title, summary = excluded.summary,
+                   authors = excluded.authors, pdf_url = excluded.pdf_url, fetched_at = excluded.fetched_at""",
+                entry_rows,
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO category_entries (category, entry_id, published) VALUES (?, ?, ?)",
+                category_rows,
+            )
+            self._conn.commit()
+
+    def entries(self, categories: List[str], since: datetime, limit: Optional[int] = None) -> List[dict]:
+        """Entries of any of `categories` published at or after `since`, newest first, each entry once."""
+        placeholders = ",".join("?" * len(categories))
+        query = f"""SELECT e.entry_id, e.title, e.summary, e.authors, e.pdf_url, e.primary_category, e.published_iso
+                    FROM entries e
+                    WHERE e.entry_id IN (SELECT entry_id FROM category_entries
+                                         WHERE category IN ({placeholders}) AND published >= ?)
+                    ORDER BY e.published DESC, e.entry_id"""
+        params = [*categories, since.timestamp()]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        keys = ("entry_id", "title", "summary", "authors", "pdf_url", "primary_category", "published")
+        return [dict(zip(keys, row)) for row in rows]
@@ -0,0 +1,139 @@
+import hashlib
+import re
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from src.state import Article
+from src.storage.sqlite import chunked_lookup, chunks, connect
+
+# Query parameters that never change the document being pointed at
+TRACKING_PARAMS = re.compile(r"^(utm_\w+|ref|source|fbclid|gclid)$", re.IGNORECASE)
+MIN_CONTENT_CHARS = 40
+
+
+def url_fingerprint(url: str) -> str:
+    """Hash of the URL with scheme/host case, fragments, tracking params and trailing slashes normalized away."""
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not TRACKING_PARAMS.match(k)
+    ))
+    scheme = parts.scheme.lower()
+    normalized = urlunsplit((
+        "https" if scheme == "http" else scheme,
+        parts.netloc.lower().removeprefix("www."),
+        parts.path.rstrip("/") or "/",
+        query,
+        "",
+    ))
+    return "u:" + hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def content_fingerprint(article: Article) -> Optional[str]:
+    """Hash of the article's title and content with case, punctuation and whitespace removed.
+
+    Returns None for near-empty articles, whose text is too generic to identify them.
+    """
+    text = f"{article.title}\n{article.content}".lower()
+    text = re.sub(r"[\W_]+", " ", text).strip()
+    if len(text) < MIN_CONTENT_CHARS:
+        return None
+    return "c:" + hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class SeenStore:
+    """Persistent index of articles that were already published or rejected.
+
+    Each article is recorded under two fingerprints (normalized URL and
+    normalized title+content), so an item is recognized even when it is
+    re-posted under a new URL. Lookups go through the table's primary key
+    and are batched, which keeps them fast at hundreds of thousands of rows.
+    """
+
+    def __init__(self, path: str = "data/seen.sqlite"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS seen (
+                fingerprint TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL
+            ) WITHOUT ROWID"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_last_seen ON seen(last_seen)")
+        self._conn.commit()
+
+    @staticmethod
+    def fingerprints(article: Article) -> List[str]:
+        prints = []
+        if article.url:
+            prints.append(url_fingerprint(article.url))
+        # Copies of the same story merged away by near-duplicate detection
+        for duplicate in article.raw_data.get("duplicate_urls", []):
+            prints.append(url_fingerprint(duplicate["url"]))
+        content_fp = content_fingerprint(article)
+        if content_fp:
+            prints.append(content_fp)
+        return prints
+
+    def _known(self, fingerprints: List[str]) -> set:
+        with self._lock:
+            rows = chunked_lookup(self._conn, "SELECT fingerprint FROM seen WHERE fingerprint IN ({placeholders})",
+                                  fingerprints)
+        return {row[0] for row in rows}
+
+    def filter_unseen(self, articles: List[Article]) -> Tuple[List[Article], List[Article]]:
+        """Splits articles into (unseen, already_seen), preserving order."""
+        prints = [self.fingerprints(article) for article in articles]
+        known = self._known([fp for article_prints in prints for fp in article_prints])
+
+        unseen, seen = [], []
+        for article, article_prints in zip(articles, prints):
+            if any(fp in known for fp in article_prints):
+                seen.append(article)
+            else:
+                unseen.append(article)
+        # Items still served by a source stay known, however long ago they were marked
+        self._touch(sorted(known))
+        return unseen, seen
+
+    def _touch(self, fingerprints: List[str]):
+        """Sets `last_seen` of the given fingerprints to now."""
+        if not fingerprints:
+            return
+        now = time.time()
+        with self._lock:
+            for chunk, placeholders in chunks(fingerprints):
+                self._conn.execute(
+                    f"UPDATE seen SET last_seen = ? WHERE fingerprint IN ({placeholders})", [now, *chunk]
+                )
+            self._conn.commit()
+
+    def mark(self, articles: Iterable[Article], status: str):
+        """Records articles as seen with the given status ('published' or 'rejected')."""
+        now = time.time()
+        rows = [(fp, status, now, now) for article in articles for fp in self.fingerprints(article)]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                """INSERT INTO seen (fingerprint, status, first_seen, last_seen) VALUES (?, ?, ?, ?)
+                   ON CONFLICT(fingerprint) DO UPDATE SET status = excluded.status, last_seen = excluded.last_seen""",
+                rows,
+            )
+            self._conn.commit()
+
+    def compact(self, max_age_days: float) -> int:
+        """Drops entries neither marked nor matched by `filter_unseen` for `max_age_days`; returns the number removed."""
+        cutoff = time.time() - max_age_days * 86400
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM seen WHERE last_seen < ?", (cutoff,)).rowcount
+            self._conn.commit()
+        return removed
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
@@ -0,0 +1,31 @@
+"""Connection setup and batched key lookups shared by the SQLite stores and caches."""
+import os
+import sqlite3
+from typing import Iterator, List, Sequence, Tuple
+
+LOOKUP_CHUNK = 500  # stays below SQLite's bound-parameter limit
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Opens a database file (creating its directory) in WAL mode, usable from any thread.
+    ":memory:" gives a private in-memory database."""
+    if path != ":memory:":
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+def chunks(keys: Sequence) -> Iterator[Tuple[list, str]]:
+    """Splits keys for `IN (...)` clauses: yields (chunk, "?,?,...") pairs of at most `LOOKUP_CHUNK` keys."""
+    for start in range(0, len(keys), LOOKUP_CHUNK):
+        chunk = list(keys[start:start + LOOKUP_CHUNK])
+        yield chunk, ",".join("?" * len(chunk))
+
+
+def chunked_lookup(conn: sqlite3.Connection, query: str, keys: Sequence) -> List:
+    """Rows of `query` for all keys, where the query has one `IN ({placeholders})` clause for them."""
+    rows = []
+    for chunk, placeholders in chunks(keys):
+        rows.extend(conn.execute(query.format(placeholders=placeholders), chunk))
+    return rows
@@ -0,0 +1,135 @@
+import asyncio
+from typing import List, Optional
+
+from src.processors.dedup import NearDuplicateIndex
+from src.processors.pipeline import failed_transiently
+from src.state import Article
+from src.utils.llm_client import aclose_llm_connections
+from src.utils.metrics import get_run_metrics
+
+_DONE = object()  # end-of-stream marker passed down the queues
+
+
+class StreamingRunner:
+    """Streaming execution mode for `InsightBotGraph`.
+
+    Instead of running each graph node over the whole article list, fetch,
+    filter and process run as concurrent stages connected by bounded asyncio
+    queues, so scoring starts as soon as the first collector returns and
+    summaries are generated while slower collectors are still fetching. A full
+    queue blocks the stage feeding it (backpressure).
+
+    - fetch: each collector's articles are skipped if already seen, checked
+      for near-duplicates against everything admitted so far, and queued.
+    - filter: queued articles are scored in micro-batches of up to the
+      relevance batch size (whatever is already waiting), off the event loop.
+    - process: `max_concurrency` workers summarize relevant articles.
+
+    Publishing waits for all stages and applies the global relevance sort.
+    Unlike the graph, a near-duplicate cluster keeps the copy that arrived
+    first, since it may already be in flight.
+    """
+
+    def __init__(self, bot, queue_size: int = 100):
+        self.bot = bot
+        self.queue_size = max(1, queue_size)
+
+    def run(self, run_id: Optional[str] = None) -> dict:
+        async def run_and_close():
+            try:
+                return await self.arun(run_id)
+            finally:
+                await aclose_llm_connections()
+
+        return asyncio.run(run_and_close())
+
+    async def arun(self, run_id: Optional[str] = None) -> dict:
+        """Returns the final state: {"run_id", "articles", "stats"} like the graph."""
+        bot = self.bot
+        # SQLite and publishing calls block, so they run off the event loop like the scoring
+        compacted = await asyncio.to_thread(bot.seen_store.compact, bot.seen_retention_days)
+        stats = {
+            "collectors": {},
+            "seen": {"skipped": 0, "compacted": compacted},
+            "dedup": {"merged": 0},
+        }
+        to_filter: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        to_process: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        workers = bot.processing_pipeline.max_concurrency
+        processed: List[Article] = []  # restored from the article store or generated in this run
+        generated: List[Article] = []
+        failed: List[Article] = []
+
+        print("--- [Streaming] Fetch → Filter → Process ---")
+        with get_run_metrics().time_node("stream"):
+            await asyncio.gather(
+                self._fetch(to_filter, stats),
+                self._filter(to_filter, to_process, workers),
+                *(self._process(to_process, processed, generated, failed) for _ in range(workers)),
+            )
+        # Same rule as the graph's process node: only an outage, or nothing to publish, fails the run
+        if failed and not generated and (failed_transiently(failed) or not processed):
+            raise RuntimeError(f"Processing failed for all {len(failed)} pending articles")
+
+        # Stages finish in arrival order; publish in global relevance order like the graph
+        processed.sort(key=lambda a: a.relevance_score, reverse=True)
+        stats.update(bot.llm_cache_stats())
+        with get_run_metrics().time_node("publish"):
+            await asyncio.to_thread(bot.publish_data_node, {"articles": processed})
+        return {"run_id": run_id, "articles": processed, "stats": stats}
+
+    async def _fetch(self, to_filter: asyncio.Queue, stats: dict):
+        bot = self.bot
+        index = NearDuplicateIndex(bot.dedup_detector) if bot.dedup_enabled else None
+        async for name, articles, collector_stats in bot.collector_executor.astream():
+            stats["collectors"][name] = collector_stats
+            print(f"  {name}: {collector_stats['status']} - {collector_stats['articles']} articles "
+                  f"in {collector_stats['latency_s']}s")
+            await asyncio.to_thread(bot.article_store.upsert, articles, "fetched")
+
+            unseen, seen = await asyncio.to_thread(bot.seen_store.filter_unseen, articles)
+            stats["seen"]["skipped"] += len(seen)
+            for article in unseen:
+                if index and not index.add(article):
+                    stats["dedup"]["merged"] += 1
+                    continue
+                await to_filter.put(article)
+        await to_filter.put(_DONE)
+
+    async def _filter(self, to_filter: asyncio.Queue, to_process: asyncio.Queue, workers: int):
+        bot = self.bot
+        batch_size = max(1, bot.filter.batch_size)
+        done = False
+        while not done:
+            batch = [await to_filter.get()]
+            # Score whatever else is already waiting together, up to one LLM batch
+            while len(batch) < batch_size and not to_filter.empty():
+                batch.append(to_filter.get_nowait())
+            if batch[-1] is _DONE:
+                done = True
+                batch.pop()
+            if batch:
+                relevant, _ = await asyncio.to_thread(bot.score_and_split, batch)
+                for article in relevant:
+                    await to_process.put(article)
+        for _ in range(workers):
+            await to_process.put(_DONE)
+
+    async def _process(
+        self, to_process: asyncio.Queue, processed: List[Article], generated: List[Article], failed: List[Article]
+    ):
+        bot = self.bot
+        while True:
+            article = await to_process.get()
+            if article is _DONE:
+                return
+            if not await asyncio.to_thread(bot.article_store.restore_processed, [article]):
+                processed.append(article)
+                continue
+            result = await bot.processing_pipeline.process_article(article)
+            if result is None:
+                failed.append(article)
+                continue
+            await asyncio.to_thread(bot.article_store.upsert, [result], "processed")
+            processed.append(result)
+            generated.append(result)
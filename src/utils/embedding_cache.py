@@ -0,0 +1,93 @@
+import hashlib
+import threading
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from src.storage.sqlite import chunked_lookup, chunks, connect
+
+
+class EmbeddingCache:
+    """Disk-backed cache of embedding vectors keyed by a hash of model name and text.
+
+    An article's vector is computed once and reused on every later run that
+    sees the same text, whatever its URL. Vectors are stored as float32 blobs.
+    Like the LLM cache, entries older than ``ttl_hours`` are ignored, and the
+    least recently used entries are evicted beyond ``max_entries``.
+    """
+
+    def __init__(self, path: str = "data/embeddings.sqlite", ttl_hours: float = 24 * 30, max_entries: int = 50000):
+        self.path = path
+        self.ttl_seconds = ttl_hours * 3600 if ttl_hours else None
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                vector BLOB NOT NULL,
+                created_at REAL NOT NULL
+            ) WITHOUT ROWID"""
+        )
+        # Caches written before eviction existed have no access time; they start from their creation time
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(embeddings)")}
+        if "last_access" not in columns:
+            self._conn.execute("ALTER TABLE embeddings ADD COLUMN last_access REAL NOT NULL DEFAULT 0")
+            self._conn.execute("UPDATE embeddings SET last_access = created_at")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings(last_access)")
+        self._conn.commit()
+        self._evict()
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\x00{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        unique = list(dict.fromkeys(keys))
+        now = time.time()
+        expired = now - self.ttl_seconds if self.ttl_seconds else 0.0
+        with self._lock:
+            rows = chunked_lookup(
+                self._conn, "SELECT key, vector, created_at FROM embeddings WHERE key IN ({placeholders})", unique
+            )
+            found = {
+                key: np.frombuffer(blob, dtype=np.float32) for key, blob, created_at in rows if created_at >= expired
+            }
+            for chunk, placeholders in chunks(list(found)):
+                self._conn.execute(
+                    f"UPDATE embeddings SET last_access = ? WHERE key IN ({placeholders})", [now, *chunk]
+                )
+            self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(unique) - len(found)
+        return found
+
+    def put_many(self, vectors: Dict[str, np.ndarray]):
+        now = time.time()
+        rows = [(key, np.asarray(vector, dtype=np.float32).tobytes(), now, now) for key, vector in vectors.items()]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, created_at, last_access) VALUES (?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+        if rows:
+            self._evict()
+
+    def _evict(self):
+        with self._lock:
+            if self.ttl_seconds:
+                self._conn.execute("DELETE FROM embeddings WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+            if self.max_entries:
+                self._conn.execute(
+                    """DELETE FROM embeddings WHERE key IN (
+                        SELECT key FROM embeddings ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                    )""",
+                    (self.max_entries,),
+                )
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,123 @@
+import importlib.util
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.utils.retry import backoff_delay
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRY_AFTER = 60.0  # seconds; longer server hints are capped
+
+
+class HTTPClient:
+    """Shared, pooled HTTP client for collectors and publishers.
+
+    Wraps one ``httpx.Client`` so keep-alive connections, TLS sessions and DNS
+    results are reused across every caller. HTTP/2 is negotiated when the
+    optional ``h2`` package is installed, and httpx advertises gzip/deflate
+    (plus brotli/zstd when their decoders are installed) and decodes
+    transparently. Requests are retried on connection errors and
+    429/5xx responses, honoring Retry-After, and each host has a cap on
+    in-flight requests.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff_seconds: float = 0.5,
+        max_connections: int = 20,
+        per_host_limit: int = 4,
+        user_agent: str = "Mozilla/5.0 (compatible; InsightBot/1.0)",
+    ):
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.per_host_limit = per_host_limit
+        self.http2 = importlib.util.find_spec("h2") is not None
+        self.client = httpx.Client(
+            http2=self.http2,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            headers={"User-Agent": user_agent},
+            follow_redirects=True,
+        )
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_slots[host]
+
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> Optional[float]:
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                return None
+
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Sends a request with retries. Raises httpx.HTTPError once retries are exhausted.
+
+        Non-idempotent requests (POST) are only retried when they cannot have
+        been processed: failed connects and 429 responses.
+        """
+        idempotent = method.upper() in ("GET", "HEAD", "OPTIONS")
+        retry_statuses = RETRY_STATUSES if idempotent else {429}
+        retry_errors = httpx.TransportError if idempotent else (httpx.ConnectError, httpx.ConnectTimeout)
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self._host_slot(url):
+                    response = self.client.request(method, url, **kwargs)
+            except retry_errors:
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(backoff_delay(attempt, self.backoff_seconds))
+                continue
+
+            if response.status_code not in retry_statuses or attempt >= self.max_retries:
+                return response
+            delay = self._retry_after(response)
+            if delay is None:
+                delay = backoff_delay(attempt, self.backoff_seconds)
+            time.sleep(min(delay, MAX_RETRY_AFTER))
+        return response
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("POST", url, **kwargs)
+
+
+_http_client: Optional[HTTPClient] = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client(http_cfg: Optional[dict] = None) -> HTTPClient:
+    """Returns the process-wide HTTP client, creating it from the `http` config section on first use."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            http_cfg = http_cfg or {}
+            _http_client = HTTPClient(
+                timeout=http_cfg.get("timeout_seconds", 30),
+                max_retries=http_cfg.get("max_retries", 3),
+                backoff_seconds=http_cfg.get("backoff_seconds", 0.5),
+                max_connections=http_cfg.get("max_connections", 20),
+                per_host_limit=http_cfg.get("per_host_limit", 4),
+                user_agent=http_cfg.get("user_agent", "Mozilla/5.0 (compatible; InsightBot/1.0)"),
+            )
+        return _http_client
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from typing import Dict, Optional
+
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, Generation
+
+from src.storage.sqlite import connect
+
+
+class SQLiteLLMCache(BaseCache):
+    """Disk-backed LangChain cache for LLM responses.
+
+    Entries are keyed on a hash of the whitespace-normalized rendered prompt
+    (prompt template + article content) and LangChain's ``llm_string``, which
+    encodes the model name, temperature and other call parameters. Entries
+    older than ``ttl_hours`` are ignored, and the least recently used entries
+    are evicted once the cache grows beyond ``max_entries``.
+    """
+
+    EVICT_EVERY = 100  # updates between size checks
+
+    def __init__(self, path: str = "data/llm_cache.sqlite", ttl_hours: float = 24 * 7, max_entries: int = 50000):
+        self.path = path
+        self.ttl_seconds = ttl_hours * 3600 if ttl_hours else None
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._updates = 0
+        self._lock = threading.Lock()
+
+        self._conn = connect(path)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache(last_access)")
+        self._conn.commit()
+        self._evict()
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        # Chat prompts arrive JSON-serialized, so escaped newlines/tabs count as whitespace too
+        normalized = re.sub(r"(?:\s|\\[ntr])+", " ", prompt).strip()
+        return hashlib.sha256(f"{llm_string}\x00{normalized}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+            if not row:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+
+        return [
+            ChatGeneration(message=AIMessage(content=gen["text"])) if gen.get("chat") else Generation(text=gen["text"])
+            for gen in json.loads(row[0])
+        ]
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        # Only the generated text is stored: a replayed response carries no token usage
+        response = json.dumps([
+            {"text": gen.text, "chat": isinstance(gen, ChatGeneration)} for gen in return_val
+        ])
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (self._key(prompt, llm_string), response, now, now),
+            )
+            self._conn.commit()
+            self._updates += 1
+            if self._updates % self.EVICT_EVERY:
+                return
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            if self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+            if self.max_entries:
+                self._conn.execute(
+                    """DELETE FROM llm_cache WHERE key IN (
+                        SELECT key FROM llm_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                    )""",
+                    (self.max_entries,),
+                )
+            self._conn.commit()
+
+    def clear(self, **kwargs) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+_caches: Dict[str, SQLiteLLMCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_llm_cache(path: str, ttl_hours: float = 24 * 7, max_entries: int = 50000) -> SQLiteLLMCache:
+    """Returns the process-wide cache for `path`, so all LLM users share one connection and one set of stats."""
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = SQLiteLLMCache(path, ttl_hours=ttl_hours, max_entries=max_entries)
+        return _caches[path]
@@ -1,29 +1,167 @@
-from langchain_openai import ChatOpenAI
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from dotenv import load_dotenv
+import asyncio
+import openai
 import os
+import sys
+import threading
 import yaml
+from typing import Dict, Optional, Tuple
+from src.utils.llm_cache import get_llm_cache
+from src.utils.metrics import MetricsCallbackHandler, get_run_metrics
 
 load_dotenv()
 
+# The HTTP package the openai SDK is built on (httpx, or httpx2 in newer releases); custom transports must
+# come from the same package
+_httpx = sys.modules[openai.DefaultHttpxClient.__mro__[1].__module__.split(".")[0]]
+
+_configs: Dict[str, Tuple[float, dict]] = {}
+_configs_lock = threading.Lock()
+
+
+def load_config(path: str) -> dict:
+    """Parsed settings file, cached per path until the file changes. Returns {} if it does not exist.
+    The dict is shared between callers and must not be modified."""
+    path = os.path.abspath(path)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+    with _configs_lock:
+        cached = _configs.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+    with open(path, 'r') as f:
+        config = yaml.safe_load(f) or {}
+    with _configs_lock:
+        _configs[path] = (mtime, config)
+    return config
+
+
+class _LoopLocalTransport(_httpx.AsyncBaseTransport):
+    """Async transport keeping one connection pool per event loop.
+
+    Pooled connections cannot outlive the loop that opened them, and the
+    pipeline starts a new loop per batch (`asyncio.run`), so each loop gets its
+    own pool. A pool holds on to its loop until it is closed: code running its
+    own loop must call `aclose_llm_connections` before the loop finishes.
+    """
+
+    def __init__(self, limits, new_pool=None):
+        self._limits = limits
+        self._new_pool = new_pool or (lambda: _httpx.AsyncHTTPTransport(limits=self._limits))
+        self._pools = {}  # event loop -> AsyncHTTPTransport
+        self._lock = threading.Lock()
+
+    async def handle_async_request(self, request):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pool = self._pools.get(loop)
+            if pool is None:
+                pool = self._pools[loop] = self._new_pool()
+        return await pool.handle_async_request(request)
+
+    async def aclose(self):
+        """Closes the running loop's pool (other loops keep theirs)."""
+        with self._lock:
+            pool = self._pools.pop(asyncio.get_running_loop(), None)
+        if pool is not None:
+            await pool.aclose()
+
+
+_http_clients: Optional[tuple] = None
+_async_transport: Optional[_LoopLocalTransport] = None
+_http_clients_lock = threading.Lock()
+
+
+def get_llm_http_clients(max_connections: int = 20) -> tuple:
+    """Returns the process-wide (sync, async) HTTP clients shared by every chat model, so all LLM
+    calls reuse one set of keep-alive connections. `max_connections` applies on first use."""
+    global _http_clients, _async_transport
+    with _http_clients_lock:
+        if _http_clients is None:
+            limits = _httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+            _async_transport = _LoopLocalTransport(limits)
+            _http_clients = (
+                openai.DefaultHttpxClient(limits=limits),
+                openai.DefaultAsyncHttpxClient(transport=_async_transport),
+            )
+        return _http_clients
+
+
+async def aclose_llm_connections():
+    """Closes the running event loop's LLM connections; call it before a loop started with `asyncio.run` ends."""
+    if _async_transport is not None:
+        await _async_transport.aclose()
+
+
 class LLMClient:
     def __init__(self, config_path: str = "config/settings.yaml"):
         self.config = self._load_config(config_path)
         self.model_name = self.config.get("processing", {}).get("summary_model", "gpt-4o-mini")
+        # Per-task model, max_tokens and timeout_seconds (tasks not listed use `summary_model` uncapped)
+        self.routes = self.config.get("processing", {}).get("models") or {}
+        self.embedding_model = self.config.get("ranking", {}).get("embedding_model", "text-embedding-3-small")
         self.api_key = os.getenv("OPENAI_API_KEY")
-        
+        # OpenAI-compatible endpoint (e.g. benchmarks/mock_openai_server.py); None means the public API
+        self.base_url = self.config.get("processing", {}).get("llm_base_url") or os.getenv("OPENAI_BASE_URL")
+        self.max_connections = self.config.get("processing", {}).get("llm_max_connections", 20)
+
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY not found in environment variables.")
 
+        cache_cfg = self.config.get("cache", {})
+        self.cache = None
+        if cache_cfg.get("enabled", True):
+            self.cache = get_llm_cache(
+                cache_cfg.get("path", "data/llm_cache.sqlite"),
+                ttl_hours=cache_cfg.get("ttl_hours", 168),
+                max_entries=cache_cfg.get("max_entries", 50000),
+            )
+
     def _load_config(self, path: str) -> dict:
-        try:
-            with open(path, 'r') as f:
-                return yaml.safe_load(f)
-        except FileNotFoundError:
-            return {}
+        # Every processor builds its own client; the file is only parsed again when it changes
+        return load_config(path)
+
+    def route(self, task: Optional[str] = None) -> dict:
+        """Model settings for a task ("relevance", "relevance_cascade", "summary", "insight", "combined")."""
+        route = (self.routes.get(task) or {}) if task else {}
+        return {
+            "model": route.get("model") or self.model_name,
+            "max_tokens": route.get("max_tokens"),
+            "timeout_seconds": route.get("timeout_seconds"),
+        }
 
-    def get_chat_model(self, temperature: float = 0.0):
+    def get_chat_model(self, temperature: float = 0.0, task: Optional[str] = None):
+        route = self.route(task)
+        http_client, http_async_client = get_llm_http_clients(self.max_connections)
         return ChatOpenAI(
-            model=self.model_name,
+            model=route["model"],
             temperature=temperature,
-            openai_api_key=self.api_key
+            max_tokens=route["max_tokens"],
+            timeout=route["timeout_seconds"],
+            openai_api_key=self.api_key,
+            base_url=self.base_url,
+            # Callers retry 429/5xx themselves (rate-limited, see utils/retry.py); SDK retries would multiply them
+            max_retries=0,
+            # One connection pool for all models and processors
+            http_client=http_client,
+            http_async_client=http_async_client,
+            # Cache hits are served from disk without any network call
+            cache=self.cache,
+            # Records latency and token usage of every call for the run report
+            callbacks=[MetricsCallbackHandler(get_run_metrics())],
+        )
+
+    def get_embeddings(self):
+        http_client, http_async_client = get_llm_http_clients(self.max_connections)
+        return OpenAIEmbeddings(
+            model=self.embedding_model,
+            openai_api_key=self.api_key,
+            base_url=self.base_url,
+            http_client=http_client,
+            http_async_client=http_async_client,
+            # Compatible servers take plain strings, not the client-side token arrays sent to OpenAI
+            check_embedding_ctx_length=self.base_url is None,
         )
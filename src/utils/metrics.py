@@ -0,0 +1,201 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+
+class RunMetrics:
+    """Collects wall time, token usage and cost for one pipeline run.
+
+    Node timings are recorded by the graph, LLM calls by `MetricsCallbackHandler`
+    (attached to every chat model by `LLMClient`). Collector timings and cache
+    hits already live in the run stats and are merged in by `build_report`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = datetime.now().astimezone()
+        self._start = time.perf_counter()
+        self.nodes: Dict[str, float] = {}
+        self.llm_calls: Dict[str, dict] = {}
+
+    @contextmanager
+    def time_node(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.nodes[name] = self.nodes.get(name, 0.0) + time.perf_counter() - start
+
+    def record_llm_call(
+        self,
+        model: str,
+        seconds: float,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        cached: bool = False,
+        error: bool = False,
+    ):
+        with self._lock:
+            entry = self.llm_calls.setdefault(model, {
+                "calls": 0, "cached_calls": 0, "errors": 0,
+                "prompt_tokens": 0, "completion_tokens": 0, "latencies": [],
+            })
+            entry["calls"] += 1
+            entry["cached_calls"] += int(cached)
+            entry["errors"] += int(error)
+            entry["prompt_tokens"] += prompt_tokens
+            entry["completion_tokens"] += completion_tokens
+            if not cached:
+                entry["latencies"].append(seconds)
+
+    @staticmethod
+    def _price_for(model: str, pricing: Dict[str, dict]) -> Optional[dict]:
+        # API responses report dated model names (gpt-4o-mini-2024-07-18), so match the longest configured prefix
+        for name in sorted(pricing, key=len, reverse=True):
+            if model.startswith(name):
+                return pricing[name]
+        return None
+
+    @staticmethod
+    def _percentile(values: List[float], pct: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+    def build_report(self, stats: Optional[dict] = None, pricing: Optional[Dict[str, dict]] = None) -> dict:
+        """Returns the run report as a JSON-serializable dict."""
+        stats = stats or {}
+        pricing = pricing or {}
+        llm = {}
+        total_cost = 0.0
+        with self._lock:
+            for model, entry in self.llm_calls.items():
+                latencies = entry["latencies"]
+                price = self._price_for(model, pricing)
+                cost = None
+                if price:
+                    cost = (entry["prompt_tokens"] * price.get("input", 0.0)
+                            + entry["completion_tokens"] * price.get("output", 0.0)) / 1_000_000
+                    total_cost += cost
+                llm[model] = {
+                    "calls": entry["calls"],
+                    "cached_calls": entry["cached_calls"],
+                    "errors": entry["errors"],
+                    "prompt_tokens": entry["prompt_tokens"],
+                    "completion_tokens": entry["completion_tokens"],
+                    "latency_s": {
+                        "total": round(sum(latencies), 3),
+                        "p50": round(self._percentile(latencies, 50), 3),
+                        "p95": round(self._percentile(latencies, 95), 3),
+                        "max": round(max(latencies, default=0.0), 3),
+                    },
+                    "estimated_cost_usd": round(cost, 6) if cost is not None else None,
+                }
+            nodes = {name: round(seconds, 3) for name, seconds in self.nodes.items()}
+
+        return {
+            "started_at": self.started_at.isoformat(),
+            "duration_s": round(time.perf_counter() - self._start, 3),
+            "nodes_s": nodes,
+            "collectors": stats.get("collectors", {}),
+            "llm": llm,
+            "llm_cache": stats.get("llm_cache", {}),
+            "estimated_cost_usd": round(total_cost, 6),
+            "stats": {k: v for k, v in stats.items() if k not in ("collectors", "llm_cache")},
+        }
+
+    @staticmethod
+    def _atomic_write(path: str, text: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def write_json(self, report: dict, report_dir: str) -> str:
+        path = os.path.join(report_dir, f"run-{self.started_at.strftime('%Y%m%d-%H%M%S')}.json")
+        self._atomic_write(path, json.dumps(report, indent=2, ensure_ascii=False))
+        return path
+
+    def write_prometheus(self, report: dict, path: str):
+        """Writes the report in Prometheus textfile-collector format."""
+        lines = []
+
+        def metric(name: str, help_text: str, samples: List[tuple]):
+            lines.append(f"# HELP insightbot_{name} {help_text}")
+            lines.append(f"# TYPE insightbot_{name} gauge")
+            for labels, value in samples:
+                label_str = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f"insightbot_{name}{{{label_str}}} {value}" if label_str else f"insightbot_{name} {value}")
+
+        metric("run_duration_seconds", "Wall time of the whole run", [({}, report["duration_s"])])
+        metric("node_duration_seconds", "Wall time per pipeline node",
+               [({"node": n}, s) for n, s in report["nodes_s"].items()])
+        metric("collector_duration_seconds", "Wall time per collector",
+               [({"collector": n}, c.get("latency_s", 0)) for n, c in report["collectors"].items()])
+        metric("collector_articles", "Articles returned per collector",
+               [({"collector": n}, c.get("articles", 0)) for n, c in report["collectors"].items()])
+        metric("llm_calls", "LLM calls per model", [({"model": m}, e["calls"]) for m, e in report["llm"].items()])
+        metric("llm_tokens", "Tokens per model and direction",
+               [({"model": m, "type": t}, e[f"{t}_tokens"]) for m, e in report["llm"].items() for t in ("prompt", "completion")])
+        metric("llm_cache_hits", "LLM cache hits", [({}, report["llm_cache"].get("hits", 0))])
+        metric("llm_cache_misses", "LLM cache misses", [({}, report["llm_cache"].get("misses", 0))])
+        metric("estimated_cost_usd", "Estimated LLM cost of the run", [({}, report["estimated_cost_usd"])])
+        self._atomic_write(path, "\n".join(lines) + "\n")
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """LangChain callback that times every chat model call and records its token usage."""
+
+    def __init__(self, metrics: RunMetrics):
+        self.metrics = metrics
+        self._calls: Dict[UUID, tuple] = {}
+
+    def on_chat_model_start(self, serialized: dict, messages, *, run_id: UUID, **kwargs):
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model") or params.get("model_name") or params.get("_type", "unknown")
+        self._calls[run_id] = (model, time.perf_counter())
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs):
+        model, start = self._calls.pop(run_id, ("unknown", time.perf_counter()))
+        llm_output = response.llm_output or {}
+        usage = llm_output.get("token_usage") or {}
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        completion_tokens = usage.get("completion_tokens", 0)
+        if not usage:
+            for generations in response.generations:
+                for generation in generations:
+                    usage_metadata = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                    prompt_tokens += usage_metadata.get("input_tokens", 0)
+                    completion_tokens += usage_metadata.get("output_tokens", 0)
+
+        self.metrics.record_llm_call(
+            llm_output.get("model_name", model),
+            time.perf_counter() - start,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            # Responses replayed from the LLM cache carry no provider output
+            cached=response.llm_output is None,
+        )
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs):
+        model, start = self._calls.pop(run_id, ("unknown", time.perf_counter()))
+        self.metrics.record_llm_call(model, time.perf_counter() - start, error=True)
+
+
+_run_metrics = RunMetrics()
+
+
+def get_run_metrics() -> RunMetrics:
+    """Returns the process-wide metrics of the current run."""
+    return _run_metrics
@@ -0,0 +1,51 @@
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """Token-bucket rate limiter usable from both threads and asyncio tasks.
+
+    `rate_per_minute` tokens are refilled continuously up to `capacity`; every
+    request consumes one token and waits until one is available.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """Takes `tokens` from the bucket and returns how long the caller must wait."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= tokens
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0):
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: float = 1.0):
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(rate_per_minute: float) -> TokenBucket:
+    """Returns the process-wide bucket for a request rate, so every LLM caller draws from the same budget."""
+    with _limiters_lock:
+        if rate_per_minute not in _limiters:
+            _limiters[rate_per_minute] = TokenBucket(rate_per_minute)
+        return _limiters[rate_per_minute]
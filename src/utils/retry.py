@@ -0,0 +1,67 @@
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, List, Sequence, TypeVar
+
+import openai
+
+T = TypeVar("T")
+
+
+def is_retryable(exc: Exception) -> bool:
+    """True for rate limits (429), server errors (5xx) and connection failures."""
+    if isinstance(exc, openai.APIConnectionError):
+        return True
+    status = getattr(exc, "status_code", None)
+    return status == 429 or (isinstance(status, int) and status >= 500)
+
+
+def backoff_delay(attempt: int, base_delay: float = 1.0, max_delay: float = 30.0) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def retry_call(fn: Callable[[], T], max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 30.0) -> T:
+    """Blocking counterpart of `aretry_call`, for calls made from threads."""
+    for attempt in range(max_retries + 1):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            time.sleep(backoff_delay(attempt, base_delay, max_delay))
+
+
+def call_all(
+    fn: Callable, items: Sequence, max_concurrency: int = 1, rate_limiter=None, max_retries: int = 3
+) -> List:
+    """Calls `fn(item)` for every item, up to `max_concurrency` at a time on threads. Each call first takes a
+    token from `rate_limiter` (a `TokenBucket`) and is retried on 429/5xx. Results are in input order, with
+    the exception of a failed call in its place."""
+    def call(item):
+        def limited():
+            if rate_limiter:
+                rate_limiter.acquire()
+            return fn(item)
+        try:
+            return retry_call(limited, max_retries=max_retries)
+        except Exception as e:
+            return e
+
+    if max_concurrency <= 1 or len(items) <= 1:
+        return [call(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(items))) as pool:
+        return list(pool.map(call, items))
+
+
+async def aretry_call(
+    fn: Callable[[], Awaitable[T]], max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 30.0
+) -> T:
+    for attempt in range(max_retries + 1):
+        try:
+            return await fn()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            await asyncio.sleep(backoff_delay(attempt, base_delay, max_delay))
@@ -0,0 +1,236 @@
+"""Token-based limits for the article text placed in LLM prompts.
+
+Feed entries range from a one-line teaser to a whole HTML post, so prompts are
+bounded in model tokens rather than characters: `strip_html` reduces markup to
+text, `TokenCounter` counts and cuts with the model's tiktoken encoding (or an
+estimate when the encoding is unavailable, e.g. offline), and `TokenBudget`
+applies the per-task limits from ``processing.token_budget``. Cleaned text and
+token counts are cached per article content; the processors built by
+`ProcessorRegistry` share one budget, so an article scored, summarized and
+re-scored by the cascade is only cleaned and tokenized once.
+"""
+import hashlib
+import html
+import math
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+from src.state import Article
+
+try:
+    import tiktoken
+except ImportError:  # optional: token counts are estimated from the text instead
+    tiktoken = None
+
+try:
+    import lxml.html
+except ImportError:  # optional: BeautifulSoup's html.parser is used instead
+    lxml = None
+
+TAG_RE = re.compile(r"</?[a-zA-Z][^>]*>|<!--.*?-->", re.DOTALL)
+BLOCK_TAGS = ("p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre", "section")
+# Hangul and CJK characters take about one token each; other text about four characters per token
+WIDE_CHAR_RE = re.compile(r"[\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u3400-\u9fff\uac00-\ud7af\uf900-\ufaff]")
+
+
+def strip_html(text: Optional[str]) -> str:
+    """Visible text of an HTML fragment (scripts and styles dropped, entities decoded).
+    Block elements become line breaks; plain text only has its whitespace normalized."""
+    if not text:
+        return ""
+    text = _html_text(text) if TAG_RE.search(text) else html.unescape(text)
+    text = re.sub(r"[ \t\r\f\v\u00a0]+", " ", text)
+    text = re.sub(r" ?\n[ \n]*\n ?", "\n\n", text)
+    return re.sub(r" ?\n ?", "\n", text).strip()
+
+
+def _html_text(markup: str) -> str:
+    if lxml is not None:
+        try:
+            root = lxml.html.fromstring(markup)
+        except (ValueError, lxml.etree.ParserError):
+            return html.unescape(TAG_RE.sub(" ", markup))
+        for element in root.xpath("//script|//style"):
+            element.drop_tree()
+        for element in root.iter(*BLOCK_TAGS):
+            element.tail = "\n\n" + (element.tail or "")
+        return root.text_content()
+
+    soup = BeautifulSoup(markup, "html.parser")
+    for element in soup(["script", "style"]):
+        element.decompose()
+    return soup.get_text("\n\n")
+
+
+class TokenCounter:
+    """Counts and cuts text in tokens of a model's tiktoken encoding.
+
+    Without tiktoken or its encoding file (downloaded on first use), or with
+    `model=None`, counts are estimated: one token per Hangul/CJK character plus
+    one per four other characters. Counts are cached by text.
+    """
+
+    CACHE_SIZE = 10000
+
+    def __init__(self, model: Optional[str] = "gpt-4o-mini"):
+        self.encoding = None
+        if model and tiktoken is not None:
+            try:
+                try:
+                    self.encoding = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    self.encoding = tiktoken.get_encoding("o200k_base")
+            except Exception as e:
+                print(f"[TokenCounter] tiktoken encoding unavailable, estimating token counts: {e}")
+        self._counts: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def exact(self) -> bool:
+        return self.encoding is not None
+
+    def count(self, text: str) -> int:
+        key = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        with self._lock:
+            if key in self._counts:
+                self._counts.move_to_end(key)
+                return self._counts[key]
+        tokens = self._count(text)
+        with self._lock:
+            self._counts[key] = tokens
+            if len(self._counts) > self.CACHE_SIZE:
+                self._counts.popitem(last=False)
+        return tokens
+
+    def _count(self, text: str) -> int:
+        if self.encoding is not None:
+            return len(self.encoding.encode(text, disallowed_special=()))
+        wide = len(WIDE_CHAR_RE.findall(text))
+        return wide + math.ceil((len(text) - wide) / 4)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """The longest prefix of `text` within `max_tokens`."""
+        if self.count(text) <= max_tokens:
+            return text
+        if self.encoding is not None:
+            tokens = self.encoding.encode(text, disallowed_special=())[:max(0, max_tokens)]
+            # A cut inside a multi-byte character decodes to a trailing replacement character
+            return self.encoding.decode(tokens).rstrip("\ufffd")
+        low, high = 0, len(text)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self._count(text[:middle]) <= max_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        return text[:low]
+
+    def split(self, text: str, max_tokens: int) -> List[str]:
+        """Splits `text` into chunks of at most `max_tokens`, at paragraph breaks where possible."""
+        chunks: List[str] = []
+        current: List[str] = []
+
+        def flush():
+            if current:
+                chunks.append("\n\n".join(current))
+                current.clear()
+
+        for paragraph in text.split("\n\n"):
+            while self.count(paragraph) > max_tokens:
+                head = self.truncate(paragraph, max_tokens) or paragraph[:1]
+                flush()
+                chunks.append(head)
+                paragraph = paragraph[len(head):].lstrip()
+            if not paragraph:
+                continue
+            if current and self.count("\n\n".join(current + [paragraph])) > max_tokens:
+                flush()
+            current.append(paragraph)
+        flush()
+        return chunks
+
+
+_counters: Dict[Optional[str], TokenCounter] = {}
+_counters_lock = threading.Lock()
+
+
+def get_token_counter(model: Optional[str] = "gpt-4o-mini") -> TokenCounter:
+    """Returns the process-wide counter for a model (loading an encoding is expensive)."""
+    with _counters_lock:
+        if model not in _counters:
+            _counters[model] = TokenCounter(model)
+        return _counters[model]
+
+
+class TokenBudget:
+    """Per-task token limits for article content, e.g. {"relevance": 500, "summary": 3000}.
+
+    `fit` returns an article's cleaned content cut to a task's limit (tasks
+    without a limit get the whole cleaned text). With ``long_content:
+    map_reduce``, callers split over-budget content with `chunks` instead and
+    condense the chunks before the final prompt.
+    """
+
+    DEFAULT_LIMITS = {"relevance": 500, "summary": 3000, "combined": 3000}
+    CACHE_SIZE = 2000
+
+    def __init__(
+        self,
+        counter: TokenCounter,
+        limits: Optional[Dict[str, int]] = None,
+        long_content: str = "truncate",
+        chunk_tokens: int = 2000,
+        max_chunks: int = 8,
+    ):
+        self.counter = counter
+        self.limits = {**self.DEFAULT_LIMITS, **(limits or {})}
+        self.map_reduce = long_content == "map_reduce"
+        self.chunk_tokens = chunk_tokens
+        self.max_chunks = max(1, max_chunks)
+        self._cleaned: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: dict) -> "TokenBudget":
+        processing_cfg = config.get("processing", {})
+        budget_cfg = dict(processing_cfg.get("token_budget") or {})
+        options = {key: budget_cfg.pop(key) for key in ("long_content", "chunk_tokens", "max_chunks") if key in budget_cfg}
+        counter = get_token_counter(processing_cfg.get("summary_model", "gpt-4o-mini"))
+        return cls(counter, limits=budget_cfg, **options)
+
+    def clean(self, article: Article) -> str:
+        """The article content without markup (cached by content)."""
+        content = article.content or ""
+        key = hashlib.sha1(content.encode("utf-8")).hexdigest()
+        with self._lock:
+            if key in self._cleaned:
+                self._cleaned.move_to_end(key)
+                return self._cleaned[key]
+        text = strip_html(content)
+        with self._lock:
+            self._cleaned[key] = text
+            if len(self._cleaned) > self.CACHE_SIZE:
+                self._cleaned.popitem(last=False)
+        return text
+
+    def tokens(self, article: Article) -> int:
+        return self.counter.count(self.clean(article))
+
+    def fits(self, article: Article, task: str) -> bool:
+        limit = self.limits.get(task)
+        return limit is None or self.tokens(article) <= limit
+
+    def truncate(self, text: str, task: str) -> str:
+        limit = self.limits.get(task)
+        return text if limit is None else self.counter.truncate(text, limit)
+
+    def fit(self, article: Article, task: str) -> str:
+        return self.truncate(self.clean(article), task)
+
+    def chunks(self, article: Article) -> List[str]:
+        """The cleaned content in chunks of `chunk_tokens`; text beyond `max_chunks` chunks is dropped."""
+        return self.counter.split(self.clean(article), self.chunk_tokens)[:self.max_chunks]
@@ -5,7 +5,21 @@ import pytz
 from src.collectors.arxiv_collector import ArxivCollector
 from src.collectors.rss_crawler import RSSCollector
 from src.collectors.anthropic_news_collector import AnthropicNewsCollector
+from src.collectors.base import BaseCollector
+from src.collectors.executor import CollectorExecutor
+from src.collectors.flight_parser import iter_flight_posts
+from src.collectors import html_extract
 from src.state import Article
+from src.utils.http_client import HTTPClient
+from src.utils.rate_limiter import TokenBucket
+import httpx
+
+
+def _mock_http(handler) -> HTTPClient:
+    """HTTPClient whose requests are answered by `handler` instead of the network."""
+    http = HTTPClient(max_retries=0)
+    http.client = httpx.Client(transport=httpx.MockTransport(handler))
+    return http
 
 class TestCollectors(unittest.TestCase):
     
@@ -31,6 +45,8 @@ class TestCollectors(unittest.TestCase):
         mock_client_instance.results.return_value = [mock_result]
         
         collector = ArxivCollector(config_path="config/settings.yaml")
+        collector.store_path = ":memory:"
+        collector.rate_limiter = TokenBucket(60000)
         articles = collector.fetch_data()
         
         self.assertEqual(len(articles), 1)
@@ -38,6 +54,149 @@ class TestCollectors(unittest.TestCase):
         self.assertEqual(articles[0].source, "arxiv")
         self.assertEqual(articles[0].author, "John Doe")
 
+    @patch('src.collectors.arxiv_collector.arxiv.Client')
+    def test_arxiv_incremental_stops_at_watermark(self, MockClient):
+        import tempfile, os
+        now = datetime.now(pytz.utc)
+
+        def result(entry_id, hours_ago):
+            r = MagicMock()
+            r.entry_id = entry_id
+            r.title = f"Paper {entry_id}"
+            r.published = now - timedelta(hours=hours_ago)
+            r.pdf_url = f"http://arxiv.org/pdf/{entry_id}"
+            r.summary = "Summary"
+            r.authors = []
+            r.primary_category = "cs.AI"
+            return r
+
+        consumed = []
+
+        def results(search):
+            for r in feed:
+                consumed.append(r.entry_id)
+                yield r
+
+        MockClient.return_value.results.side_effect = results
+
+        with tempfile.TemporaryDirectory() as tmp:
+            collector = ArxivCollector(config_path="config/settings.yaml")
+            collector.categories = ["cs.AI"]
+            collector.store_path = os.path.join(tmp, "arxiv.sqlite")
+            collector.rate_limiter = TokenBucket(60000)
+
+            feed = [result("2", 1), result("1", 2), result("old", 24 * 10)]
+            self.assertEqual([a.raw_data["entry_id"] for a in collector.fetch_data()], ["2", "1"])
+
+            # Second run: only the entries above the watermark are read from the API
+            consumed.clear()
+            feed = [result("3", 0), result("2", 1), result("1", 2)]
+            articles = collector.fetch_data()
+            self.assertEqual(consumed, ["3", "2"])
+            self.assertEqual([a.raw_data["entry_id"] for a in articles], ["3", "2", "1"])
+
+    @patch('src.collectors.arxiv_collector.arxiv.Client')
+    def test_arxiv_cold_start_reads_only_the_quota(self, MockClient):
+        now = datetime.now(pytz.utc)
+
+        def result(entry_id):
+            r = MagicMock()
+            r.entry_id = entry_id
+            r.title = entry_id
+            r.published = now - timedelta(minutes=int(entry_id))
+            r.summary = "Summary"
+            r.authors = []
+            r.pdf_url = f"http://arxiv.org/pdf/{entry_id}"
+            r.primary_category = "cs.AI"
+            return r
+
+        searches = []
+
+        def results(search):
+            searches.append(search.max_results)
+            return [result(str(i)) for i in range(search.max_results)]
+
+        MockClient.return_value.results.side_effect = results
+        collector = ArxivCollector(config_path="config/settings.yaml")
+        collector.categories = ["cs.AI"]
+        collector.category_quota = 5
+        collector.store_path = ":memory:"
+        collector.rate_limiter = TokenBucket(60000)
+
+        articles = collector.fetch_data()
+
+        self.assertEqual(searches, [5])  # not arxiv_max_fetch
+        self.assertEqual(len(articles), 5)
+
+    @patch('src.collectors.arxiv_collector.arxiv.Client')
+    def test_arxiv_run_after_cold_start_backfills_the_window(self, MockClient):
+        import tempfile, os
+        now = datetime.now(pytz.utc)
+
+        def result(i):
+            r = MagicMock()
+            r.entry_id = str(i)
+            r.title = str(i)
+            r.published = now - timedelta(minutes=i)
+            r.summary = "Summary"
+            r.authors = []
+            r.pdf_url = f"http://arxiv.org/pdf/{i}"
+            r.primary_category = "cs.AI"
+            return r
+
+        feed = [result(i) for i in range(10)] + [result(60 * 24 * 30)]
+        MockClient.return_value.results.side_effect = lambda search: iter(feed[:search.max_results])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            collector = ArxivCollector(config_path="config/settings.yaml")
+            collector.categories = ["cs.AI"]
+            collector.category_quota = 2
+            collector.store_path = os.path.join(tmp, "arxiv.sqlite")
+            collector.rate_limiter = TokenBucket(60000)
+            self.assertEqual(len(collector.fetch_data()), 2)
+
+            collector.category_quota = collector.max_results = 10
+            articles = collector.fetch_data()
+
+        self.assertEqual([a.raw_data["entry_id"] for a in articles], [str(i) for i in range(10)])
+
+    @patch('src.collectors.arxiv_collector.arxiv.Client')
+    def test_arxiv_categories_merged_with_quotas(self, MockClient):
+        now = datetime.now(pytz.utc)
+
+        def result(entry_id, minutes_ago):
+            r = MagicMock()
+            r.entry_id = entry_id
+            r.title = entry_id
+            r.published = now - timedelta(minutes=minutes_ago)
+            r.summary = "Summary"
+            r.authors = []
+            return r
+
+        per_category = {
+            "cat:cs.LG": [result("lg1", 1), result("lg2", 2), result("lg3", 3), result("lg4", 4)],
+            "cat:cs.CL": [result("cross", 5), result("cl1", 30)],
+            "cat:cs.AI": [result("cross", 5)],
+        }
+        queries = []
+
+        def results(search):
+            queries.append(search.query)
+            return iter(per_category[search.query][:search.max_results])
+
+        MockClient.return_value.results.side_effect = results
+
+        collector = ArxivCollector(config_path="config/settings.yaml")
+        collector.incremental = False
+        collector.categories = ["cs.LG", "cs.CL", "cs.AI"]
+        collector.max_results = 5
+        collector.category_quota = 2
+        collector.rate_limiter = TokenBucket(60000)
+        articles = collector.fetch_data()
+
+        self.assertEqual(sorted(queries), ["cat:cs.AI", "cat:cs.CL", "cat:cs.LG"])
+        self.assertEqual([a.raw_data["entry_id"] for a in articles], ["lg1", "lg2", "cross", "cl1"])
+
     @patch('src.collectors.rss_crawler.feedparser.parse')
     def test_rss_collector(self, mock_parse):
         # Setup mock behavior
@@ -73,6 +232,7 @@ class TestCollectors(unittest.TestCase):
         collector = RSSCollector(config_path="config/settings.yaml")
         # Override feed urls for testing
         collector.feed_urls = ["http://example.com/rss"]
+        collector.http = _mock_http(lambda request: httpx.Response(200, content=b"<rss></rss>"))
         
         articles = collector.fetch_data()
         
@@ -80,6 +240,61 @@ class TestCollectors(unittest.TestCase):
         self.assertEqual(articles[0].title, "Test Blog Post")
         self.assertEqual(articles[0].source, "rss")
 
+    def test_rss_collector_conditional_get(self):
+        """Validators are persisted and sent back; a 304 feed is skipped without parsing."""
+        import tempfile, os
+        pub_date = datetime.now().strftime("%a, %d %b %Y %H:%M:%S +0000")
+        feed_xml = f"""<?xml version="1.0"?><rss version="2.0"><channel><title>Blog</title>
+        <item><title>Post</title><link>http://example.com/post</link><pubDate>{pub_date}</pubDate>
+        <description>Body</description></item></channel></rss>""".encode()
+        seen_headers = []
+
+        def handler(request):
+            seen_headers.append(dict(request.headers))
+            if request.headers.get("If-None-Match") == '"abc"':
+                return httpx.Response(304)
+            return httpx.Response(200, content=feed_xml, headers={
+                "ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT",
+            })
+
+        with tempfile.TemporaryDirectory() as tmp:
+            collector = RSSCollector(config_path="config/settings.yaml")
+            collector.feed_urls = ["http://example.com/rss"]
+            collector.state_path = os.path.join(tmp, "feeds.json")
+            collector.http = _mock_http(handler)
+
+            self.assertEqual(len(collector.fetch_data()), 1)
+            collector.commit_state()
+            with patch('src.collectors.rss_crawler.feedparser.parse') as mock_parse:
+                self.assertEqual(collector.fetch_data(), [])
+                mock_parse.assert_not_called()
+
+        self.assertEqual(seen_headers[1]["if-modified-since"], "Mon, 01 Jan 2024 00:00:00 GMT")
+
+    def test_rss_validators_wait_for_commit(self):
+        """A run that never publishes leaves the validators unsaved, so the next run gets the feed again."""
+        import tempfile, os
+        seen_headers = []
+
+        def handler(request):
+            seen_headers.append(dict(request.headers))
+            return httpx.Response(200, content=b"<rss></rss>", headers={"ETag": '"abc"'})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            collector = RSSCollector(config_path="config/settings.yaml")
+            collector.feed_urls = ["http://example.com/rss"]
+            collector.state_path = os.path.join(tmp, "feeds.json")
+            collector.http = _mock_http(handler)
+
+            collector.fetch_data()  # the run aborts before publishing
+            self.assertFalse(os.path.exists(collector.state_path))
+            collector.fetch_data()
+            collector.commit_state()
+            collector.fetch_data()
+
+        self.assertNotIn("if-none-match", seen_headers[1])
+        self.assertEqual(seen_headers[2]["if-none-match"], '"abc"')
+
     @patch('src.collectors.anthropic_news_collector.AnthropicNewsCollector._get_page')
     def test_anthropic_news_collector(self, mock_get_page):
         """Test AnthropicNewsCollector parses Sanity CMS Flight data and fetches article content."""
@@ -173,6 +388,25 @@ class TestCollectors(unittest.TestCase):
         self.assertIn("https://www.anthropic.com/news/model-release", urls)
         self.assertIn("https://www.anthropic.com/research/safety-paper", urls)
 
+    @patch('src.collectors.anthropic_news_collector.AnthropicNewsCollector._get_page')
+    def test_anthropic_full_first_page_skips_other_listings(self, mock_get_page):
+        """Other listing pages are only requested while max_results is not reached."""
+        now = datetime.now().strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        news_html = f'''
+        <html><body>
+        <script>self.__next_f.push([1,"\\"publishedOn\\":\\"{now}\\",\\"slug\\":{{\\"_type\\":\\"slug\\",\\"current\\":\\"model-release\\"}},\\"directories\\":[{{\\"value\\":\\"news\\"}}],\\"title\\":\\"Model Release\\",\\"summary\\":\\"New model\\""])</script>
+        </body></html>
+        '''
+        mock_get_page.side_effect = lambda url: news_html if url == "https://www.anthropic.com/news" else "<html></html>"
+
+        collector = AnthropicNewsCollector(config_path="config/settings.yaml")
+        collector.max_results = 1
+        articles = collector.fetch_data()
+
+        self.assertEqual([a.raw_data["slug"] for a in articles], ["model-release"])
+        self.assertEqual([c.args[0] for c in mock_get_page.call_args_list],
+                         ["https://www.anthropic.com/news", "https://www.anthropic.com/news/model-release"])
+
     @patch('src.collectors.anthropic_news_collector.AnthropicNewsCollector._get_page')
     def test_anthropic_research_url_prefix(self, mock_get_page):
         """Test that research articles get /research/ URL prefix from directories field."""
@@ -208,6 +442,38 @@ class TestCollectors(unittest.TestCase):
         # First directory value is "research", so URL should use /research/
         self.assertEqual(articles[0].url, "https://www.anthropic.com/research/alignment-study")
 
+    @patch('src.collectors.anthropic_news_collector.AnthropicNewsCollector._get_page')
+    def test_anthropic_detail_pages_fetched_concurrently(self, mock_get_page):
+        """Detail pages are fetched in parallel, and only for candidates within max_results."""
+        import time
+        now = datetime.now().strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        records = "".join(
+            f'{{\\"body\\":\\"{"x" * 400}\\",\\"publishedOn\\":\\"{now}\\",\\"slug\\":{{\\"current\\":\\"post-{i}\\"}},\\"title\\":\\"Post {i}\\"}},'
+            for i in range(6)
+        )
+        listing_html = f'<html><body><script>self.__next_f.push([1,"[{records}]"])</script></body></html>'
+        detail_urls = []
+
+        def side_effect(url):
+            if url == "https://www.anthropic.com/news":
+                return listing_html
+            detail_urls.append(url)
+            time.sleep(0.2)
+            return '<html><head><meta name="description" content="A sufficiently long description of this post." /></head></html>'
+
+        mock_get_page.side_effect = side_effect
+
+        collector = AnthropicNewsCollector(config_path="config/settings.yaml")
+        collector.pages = ["/news"]
+        collector.max_results = 4
+        collector.max_workers = 4
+        started = time.monotonic()
+        articles = collector.fetch_data()
+
+        self.assertLess(time.monotonic() - started, 0.6)
+        self.assertEqual([a.title for a in articles], ["Post 0", "Post 1", "Post 2", "Post 3"])
+        self.assertEqual(len(detail_urls), 4)
+
     @patch('src.collectors.anthropic_news_collector.AnthropicNewsCollector._get_page')
     def test_anthropic_news_collector_empty_page(self, mock_get_page):
         """Test collector handles empty/broken pages gracefully."""
@@ -259,5 +525,159 @@ class TestCollectors(unittest.TestCase):
         self.assertEqual(articles[0].source, "anthropic")
 
 
+class TestCollectorExecutor(unittest.TestCase):
+
+    class _StubCollector(BaseCollector):
+        def __init__(self, articles=None, delay=0.0, error=None):
+            self.articles = articles or []
+            self.delay = delay
+            self.error = error
+            self.staged = self.committed = False
+
+        def fetch_data(self):
+            import time
+            time.sleep(self.delay)
+            if self.error:
+                raise self.error
+            self.staged = True
+            return self.articles
+
+        def commit_state(self):
+            self.committed = self.staged
+
+    def test_partial_results_on_failure_and_timeout(self):
+        article = Article(source="rss", title="Fast", url="http://example.com/1", content="c")
+        executor = CollectorExecutor(
+            {
+                "fast": self._StubCollector([article]),
+                "broken": self._StubCollector(error=RuntimeError("boom")),
+                "slow": self._StubCollector([article], delay=2.0),
+            },
+            default_timeout=5.0,
+            timeouts={"slow": 0.2},
+        )
+        articles, stats = executor.run()
+
+        self.assertEqual(len(articles), 1)
+        self.assertEqual(stats["fast"]["status"], "ok")
+        self.assertEqual(stats["fast"]["articles"], 1)
+        self.assertEqual(stats["broken"]["status"], "error")
+        self.assertEqual(stats["broken"]["error"], "boom")
+        self.assertEqual(stats["slow"]["status"], "timeout")
+        self.assertEqual(stats["slow"]["articles"], 0)
+
+    def test_astream_yields_collectors_as_they_finish(self):
+        import asyncio
+        article = Article(source="rss", title="t", url="u", content="c")
+        executor = CollectorExecutor(
+            {
+                "slow": self._StubCollector([article], delay=0.3),
+                "fast": self._StubCollector([article, article]),
+                "hung": self._StubCollector(delay=2.0),
+            },
+            timeouts={"hung": 0.6},
+        )
+
+        async def collect():
+            return [(name, len(articles), stat["status"]) async for name, articles, stat in executor.astream()]
+
+        self.assertEqual(asyncio.run(collect()), [("fast", 2, "ok"), ("slow", 1, "ok"), ("hung", 0, "timeout")])
+
+    def test_commit_state_skips_collectors_whose_results_were_dropped(self):
+        import time
+        article = Article(source="rss", title="t", url="u", content="c")
+        collectors = {
+            "fast": self._StubCollector([article]),
+            "broken": self._StubCollector(error=RuntimeError("boom")),
+            "slow": self._StubCollector([article], delay=0.2),
+        }
+        executor = CollectorExecutor(collectors, timeouts={"slow": 0.05})
+        executor.run()
+        time.sleep(0.3)  # the timed-out collector finishes and stages its state anyway
+
+        executor.commit_state()
+
+        self.assertTrue(collectors["slow"].staged)
+        self.assertEqual({name: c.committed for name, c in collectors.items()},
+                         {"fast": True, "broken": False, "slow": False})
+
+    def test_collectors_run_concurrently(self):
+        import time
+        collectors = {f"c{i}": self._StubCollector(delay=0.3) for i in range(3)}
+        started = time.monotonic()
+        _, stats = CollectorExecutor(collectors).run()
+        self.assertLess(time.monotonic() - started, 0.8)
+        self.assertTrue(all(s["status"] == "ok" for s in stats.values()))
+
+
+class TestFlightParser(unittest.TestCase):
+
+    @staticmethod
+    def _page(payload: str, chunk_size: int = 50) -> str:
+        import json
+        chunks = [payload[i:i + chunk_size] for i in range(0, len(payload), chunk_size)]
+        return "".join(f"<script>self.__next_f.push([1,{json.dumps(c)}])</script>" for c in chunks)
+
+    def test_fields_attributed_to_their_own_record(self):
+        import json
+        records = [
+            {"title": "First", "publishedOn": "2026-02-01T00:00:00.000Z",
+             "slug": {"_type": "slug", "current": "first"},
+             "directories": [{"value": "research"}, {"value": "news"}],
+             "subjects": [{"label": "Research", "value": "research"}]},
+            {"publishedOn": "2026-02-02T00:00:00.000Z", "slug": {"current": "second"},
+             "title": "Second \"quoted\"", "summary": "Line\nbreak"},
+        ]
+        payload = "0:[\"$\",\"div\",null,{}]\n2:T10,0123456789abcdef1:" + json.dumps(["$", "ul", None, records]) + "\n"
+        posts = list(iter_flight_posts(self._page(payload), "/news"))
+
+        self.assertEqual([p["slug"] for p in posts], ["first", "second"])
+        self.assertEqual(posts[0]["title"], "First")
+        self.assertEqual(posts[0]["url_prefix"], "/research")
+        self.assertEqual(posts[0]["category"], "research")
+        self.assertIsNone(posts[0]["summary"])
+        self.assertEqual(posts[1]["title"], 'Second "quoted"')
+        self.assertEqual(posts[1]["summary"], "Line\nbreak")
+        self.assertEqual(posts[1]["url_prefix"], "/news")
+        self.assertEqual(posts[1]["category"], "anthropic-news")
+
+    def test_truncated_payload_falls_back_to_tokenizer(self):
+        payload = ('1:[{"publishedOn":"2026-02-01T00:00:00.000Z","slug":{"current":"first"},"title":"First"},'
+                   '{"publishedOn":"2026-02-02T00:00:00.000Z","slug":{"current":"cut"},"title":"Cut off')
+        posts = list(iter_flight_posts(self._page(payload), "/news"))
+        self.assertEqual([p["slug"] for p in posts], ["first"])
+
+    def test_duplicate_slugs_yielded_once(self):
+        record = '{"publishedOn":"2026-02-01T00:00:00.000Z","slug":{"current":"same"},"title":"Same"}'
+        posts = list(iter_flight_posts(self._page(f"1:[{record},{record}]\n"), "/news"))
+        self.assertEqual(len(posts), 1)
+
+
+class TestHtmlExtract(unittest.TestCase):
+
+    PAGE = (
+        '<html><HEAD><meta property="og:description" content="OG text">'
+        '<meta name="description" content="Description &amp; more"></head><body>'
+        '<meta name="description" content="Body meta is ignored"><p>text</p>'
+        '<script id="__NEXT_DATA__" type="application/json">{"props": {}}</script></body></html>'
+    )
+
+    def test_meta_content_reads_head_only(self):
+        attrs = [{"name": "description"}, {"property": "og:description"}]
+        self.assertEqual(html_extract.meta_content(self.PAGE, attrs), "Description & more")
+        self.assertEqual(html_extract.meta_content(self.PAGE, [{"property": "og:description"}]), "OG text")
+        self.assertIsNone(html_extract.meta_content(self.PAGE, [{"name": "keywords"}]))
+
+    def test_meta_content_without_lxml(self):
+        with patch.object(html_extract, "lxml", None):
+            self.assertEqual(html_extract.meta_content(self.PAGE, [{"name": "description"}]), "Description & more")
+            page = '<meta name="description" content="No closing head">'
+            self.assertEqual(html_extract.meta_content(page, [{"name": "description"}]), "No closing head")
+
+    def test_next_data_json(self):
+        self.assertEqual(html_extract.next_data_json(self.PAGE), '{"props": {}}')
+        self.assertIsNone(html_extract.next_data_json("<html><body></body></html>"))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,225 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from src.collectors.base import BaseCollector
+from src.collectors.executor import CollectorExecutor
+from src.graph import InsightBotGraph
+from src.processors.dedup import NearDuplicateDetector
+from src.processors.pipeline import AsyncProcessingPipeline
+from src.state import Article
+from src.storage.article_store import ArticleStore, article_key
+from src.storage.seen_store import SeenStore
+
+SCORES = {"Alpha": 0.8, "Beta": 0.95, "Gamma": 0.3, "Delta": 0.9, "Old": 0.99}
+
+
+def _article(title: str, url: str = None) -> Article:
+    return Article(
+        source="rss", title=title, url=url or f"https://example.com/{title.lower()}",
+        content=f"{title} walks through a new training recipe, its ablations and the deployment numbers in {title} detail.",
+    )
+
+
+class _StubCollector(BaseCollector):
+    def __init__(self, titles):
+        self.titles = titles
+        self.calls = 0
+        self.commits = 0
+
+    def fetch_data(self):
+        self.calls += 1
+        return [_article(*title) if isinstance(title, tuple) else _article(title) for title in self.titles]
+
+    def commit_state(self):
+        self.commits += 1
+
+
+class _FakeFilter:
+    threshold = 0.7
+    batch_size = 2
+
+    def __init__(self):
+        self.scored = []
+
+    def score_articles(self, articles):
+        self.scored.extend(a.title for a in articles)
+        return [SCORES[a.title] for a in articles]
+
+
+class _StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class _FakeSummarizer:
+    llm = None  # no persistent LLM cache
+
+    def __init__(self):
+        self.summarized = []
+        self.fail = {}  # title -> HTTP status to fail with
+
+    def needs_chunking(self, article):
+        return False
+
+    async def asummarize(self, article, notes=None):
+        self.summarized.append(article.title)
+        if article.title in self.fail:
+            raise _StatusError(self.fail[article.title])
+        return f"summary of {article.title}"
+
+
+class _FakeInsightGenerator:
+    async def agenerate_insight(self, article, summary):
+        return f"insight from {summary}"
+
+
+def _bot(collectors) -> InsightBotGraph:
+    """An InsightBotGraph wired to stub collectors, fake processors and in-memory stores."""
+    bot = InsightBotGraph.__new__(InsightBotGraph)
+    bot.config = {}
+    bot.collector_executor = CollectorExecutor(collectors, default_timeout=5)
+    bot.dedup_enabled = True
+    bot.dedup_detector = NearDuplicateDetector()
+    bot.filter = _FakeFilter()
+    bot.summarizer = _FakeSummarizer()
+    bot.processing_pipeline = AsyncProcessingPipeline(bot.summarizer, _FakeInsightGenerator(), max_concurrency=2,
+                                                      max_retries=0)
+    bot.ranker = None
+    bot.email_sender = MagicMock()
+    bot.slack_bot = MagicMock()
+    bot.seen_store = SeenStore(":memory:")
+    bot.seen_retention_days = 90
+    bot.article_store = ArticleStore(":memory:")
+    bot.checkpoint_path = ":memory:"
+    return bot
+
+
+class TestStreamingRunner(unittest.TestCase):
+
+    def test_streams_unseen_unique_articles_to_publish_in_relevance_order(self):
+        bot = _bot({
+            # The mirror has Beta's title and content under another URL
+            "news": _StubCollector(["Alpha", "Beta", ("Beta", "https://mirror.example.org/beta"), "Old"]),
+            "blog": _StubCollector(["Gamma", "Delta"]),
+        })
+        bot.seen_store.mark([_article("Old")], "published")
+
+        state = bot.run_streaming(run_id="run-1")
+
+        self.assertEqual([a.title for a in state["articles"]], ["Beta", "Delta", "Alpha"])
+        self.assertEqual(state["articles"][0].summary, "summary of Beta")
+        self.assertEqual(state["articles"][0].raw_data["duplicate_urls"],
+                         [{"source": "rss", "url": "https://mirror.example.org/beta"}])
+        self.assertEqual(sorted(bot.filter.scored), ["Alpha", "Beta", "Delta", "Gamma"])
+        self.assertEqual(sorted(bot.summarizer.summarized), ["Alpha", "Beta", "Delta"])
+
+        stats = state["stats"]
+        self.assertEqual({name: s["status"] for name, s in stats["collectors"].items()}, {"news": "ok", "blog": "ok"})
+        self.assertEqual(stats["seen"]["skipped"], 1)
+        self.assertEqual(stats["dedup"]["merged"], 1)
+
+        bot.email_sender.send_email.assert_called_once_with(state["articles"])
+        rows = bot.article_store.lookup(state["articles"] + [_article("Gamma")])
+        self.assertEqual({rows[article_key(a)]["status"] for a in state["articles"]}, {"published"})
+        self.assertEqual(rows[article_key(_article("Gamma"))]["status"], "rejected")
+        unseen, _ = bot.seen_store.filter_unseen([_article(t) for t in ("Alpha", "Beta", "Gamma", "Delta")])
+        self.assertEqual(unseen, [])
+
+
+class TestProcessingFailures(unittest.TestCase):
+    """Alpha was processed by an earlier run; Beta fails in this one (graph and streaming modes)."""
+
+    RUNS = {
+        "graph": lambda bot: bot.build_graph().invoke({"run_id": "run-1", "articles": [], "stats": {}}),
+        "streaming": lambda bot: bot.run_streaming(run_id="run-1"),
+    }
+
+    def _bot(self, status: int) -> InsightBotGraph:
+        bot = _bot({"news": _StubCollector(["Alpha", "Beta"])})
+        stored = _article("Alpha")
+        stored.relevance_score, stored.summary, stored.insight = 0.8, "stored summary", "stored insight"
+        bot.article_store.upsert([stored], "processed")
+        bot.summarizer.fail["Beta"] = status
+        return bot
+
+    def test_permanent_failure_drops_the_article_and_publishes_the_rest(self):
+        for mode, run in self.RUNS.items():
+            with self.subTest(mode):
+                bot = self._bot(400)
+                state = run(bot)
+                self.assertEqual([(a.title, a.summary) for a in state["articles"]], [("Alpha", "stored summary")])
+                bot.email_sender.send_email.assert_called_once()
+
+    def test_outage_fails_the_run_so_it_can_be_resumed(self):
+        for mode, run in self.RUNS.items():
+            with self.subTest(mode):
+                bot = self._bot(429)
+                with self.assertRaises(RuntimeError):
+                    run(bot)
+                bot.email_sender.send_email.assert_not_called()
+
+
+class TestCheckpointedGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.news = _StubCollector(["Alpha", "Beta", "Gamma", "Delta"])
+        self.bot = _bot({"news": self.news})
+        self.graph = self.bot.build_graph(checkpointer=self.bot.open_checkpointer())
+        self.run_config = {"configurable": {"thread_id": "run-1"}}
+        self.initial_state = {"run_id": "run-1", "articles": [], "stats": {}}
+
+    def test_resume_after_filter_does_not_fetch_or_score_again(self):
+        self.graph.invoke(self.initial_state, self.run_config, interrupt_after=["filter"])
+        self.assertEqual(self.graph.get_state(self.run_config).next, ("rank",))
+        self.assertEqual(self.bot.summarizer.summarized, [])
+
+        state = self.graph.invoke(None, self.run_config)
+
+        self.assertEqual([a.title for a in state["articles"]], ["Beta", "Delta", "Alpha"])
+        self.assertTrue(all(isinstance(a, Article) for a in state["articles"]))
+        self.assertEqual(self.news.calls, 1)
+        self.assertEqual(sorted(self.bot.filter.scored), ["Alpha", "Beta", "Delta", "Gamma"])
+        self.assertEqual(state["stats"]["collectors"]["news"]["status"], "ok")
+        self.assertFalse(self.graph.get_state(self.run_config).next)
+
+    def test_resume_in_process_skips_articles_already_stored(self):
+        pipeline = self.bot.processing_pipeline
+        run = pipeline.run
+
+        def crash_after_first(articles, on_processed=None):
+            run(articles[:1], on_processed)
+            raise RuntimeError("worker killed")
+
+        with patch.object(pipeline, "run", side_effect=crash_after_first), self.assertRaises(RuntimeError):
+            self.graph.invoke(self.initial_state, self.run_config)
+        self.assertEqual(self.graph.get_state(self.run_config).next, ("process",))
+        self.assertEqual(self.bot.summarizer.summarized, ["Beta"])
+
+        state = self.graph.invoke(None, self.run_config)
+
+        self.assertEqual([a.summary for a in state["articles"]],
+                         ["summary of Beta", "summary of Delta", "summary of Alpha"])
+        self.assertEqual(sorted(self.bot.summarizer.summarized), ["Alpha", "Beta", "Delta"])
+        self.assertEqual(self.news.calls, 1)
+
+    def test_resume_after_failed_publish_does_not_process_again(self):
+        self.bot.email_sender.send_email.side_effect = [RuntimeError("SMTP down"), None]
+        with self.assertRaises(RuntimeError):
+            self.graph.invoke(self.initial_state, self.run_config)
+        self.assertEqual(self.graph.get_state(self.run_config).next, ("publish",))
+        self.assertEqual(self.news.commits, 0)
+        rows = self.bot.article_store.lookup([_article("Beta")])
+        self.assertEqual(rows[article_key(_article("Beta"))]["summary"], "summary of Beta")
+
+        state = self.graph.invoke(None, self.run_config)
+
+        self.assertEqual([a.summary for a in state["articles"]],
+                         ["summary of Beta", "summary of Delta", "summary of Alpha"])
+        self.assertEqual(sorted(self.bot.summarizer.summarized), ["Alpha", "Beta", "Delta"])
+        self.assertEqual(self.news.calls, 1)
+        self.assertEqual(self.bot.email_sender.send_email.call_count, 2)
+        self.assertEqual(self.news.commits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,578 @@
+import unittest
+import numpy as np
+from unittest.mock import patch, MagicMock
+import json
+import re
+import openai
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.runnables import RunnableLambda
+from src.processors.combined import CombinedProcessor
+from src.processors.dedup import NearDuplicateDetector, NearDuplicateIndex, simhash, hamming_distance
+from src.processors.filters import RelevanceFilter
+from src.processors.prefilter import KeywordPreFilter
+from src.processors.pipeline import AsyncProcessingPipeline
+from src.processors.ranker import EmbeddingRanker, kmeans
+from src.processors.registry import ProcessorRegistry
+from src.processors.summarizer import Summarizer
+from src.utils.embedding_cache import EmbeddingCache
+from src.utils.llm_client import _httpx
+from src.utils.rate_limiter import TokenBucket
+from src.utils.token_budget import strip_html
+from src.state import Article
+
+
+def _mock_llm_client(MockClient, responses, config=None):
+    """Makes LLMClient() hand out a fake chat model replaying `responses`."""
+    instance = MockClient.return_value
+    instance.config = config or {"processing": {"relevance_threshold": 0.7, "relevance_batch_size": 3}}
+    instance.get_chat_model.return_value = FakeListChatModel(responses=responses)
+    return instance
+
+
+def _article(idx: int, source: str = "rss") -> Article:
+    return Article(source=source, title=f"Article {idx}", url=f"http://example.com/{idx}", content=f"Content {idx}")
+
+
+class TestRelevanceFilter(unittest.TestCase):
+
+    @patch('src.processors.filters.LLMClient')
+    def test_batch_scoring_single_call(self, MockClient):
+        _mock_llm_client(MockClient, ['```json\n{"0": 0.9, "1": 0.2, "2": 0.75}\n```'])
+        relevance_filter = RelevanceFilter()
+
+        scores = relevance_filter.score_articles([_article(i) for i in range(3)])
+
+        self.assertEqual(scores, [0.9, 0.2, 0.75])
+
+    @patch('src.processors.filters.LLMClient')
+    def test_batch_scoring_falls_back_to_single(self, MockClient):
+        # First response is not JSON -> each article is scored individually
+        _mock_llm_client(MockClient, ["Sorry, I can't do that", "0.8", "0.1"])
+        relevance_filter = RelevanceFilter()
+
+        scores = relevance_filter.score_articles([_article(0), _article(1)])
+
+        self.assertEqual(scores, [0.8, 0.1])
+
+    @patch('src.processors.filters.LLMClient')
+    def test_batch_scoring_rescores_missing_ids(self, MockClient):
+        _mock_llm_client(MockClient, ['{"0": 0.9}', "0.3"])
+        relevance_filter = RelevanceFilter()
+
+        scores = relevance_filter.score_articles([_article(0), _article(1)])
+
+        self.assertEqual(scores, [0.9, 0.3])
+
+    @patch('src.processors.filters.LLMClient')
+    def test_prefilter_only_escalates_middle_band(self, MockClient):
+        _mock_llm_client(MockClient, ["0.6"])
+        relevance_filter = RelevanceFilter()
+        articles = [
+            Article(source="rss", title="Bitcoin price rallies", url="http://example.com/a",
+                    content="Crypto markets and blockchain tokens surged as bitcoin hit a new high."),
+            Article(source="arxiv", title="Quantization of large language model inference", url="http://example.com/b",
+                    content="We propose a transformer quantization method for LLM inference that beats "
+                            "state-of-the-art benchmarks with efficient fine-tuning."),
+            _article(2),
+        ]
+
+        scores = relevance_filter.score_articles(articles)
+
+        self.assertLess(scores[0], 0.15)
+        self.assertGreaterEqual(scores[1], relevance_filter.threshold)
+        self.assertEqual(scores[2], 0.6)  # only this one reached the LLM
+        self.assertEqual(articles[0].raw_data["relevance_source"], "prefilter")
+
+    @patch('src.processors.filters.LLMClient')
+    def test_cascade_rescores_only_borderline_scores(self, MockClient):
+        instance = _mock_llm_client(MockClient, [], config={"processing": {
+            "relevance_threshold": 0.7, "relevance_batch_size": 3,
+            "prefilter": {"enabled": False}, "relevance_cascade": {"enabled": True, "margin": 0.1},
+        }})
+        models = {
+            "relevance": FakeListChatModel(responses=['{"0": 0.95, "1": 0.65, "2": 0.2}']),
+            "relevance_cascade": FakeListChatModel(responses=["0.85"]),
+        }
+        instance.get_chat_model.side_effect = lambda temperature=0.0, task=None: models[task]
+        relevance_filter = RelevanceFilter()
+        articles = [_article(i) for i in range(3)]
+
+        scores = relevance_filter.score_articles(articles)
+
+        self.assertEqual(scores, [0.95, 0.85, 0.2])
+        self.assertEqual(articles[1].raw_data["relevance_source"], "cascade")
+        self.assertEqual(articles[1].raw_data["relevance_first_score"], 0.65)
+        self.assertNotIn("relevance_source", articles[0].raw_data)
+
+
+    @patch('src.processors.filters.LLMClient')
+    def test_batches_are_scored_concurrently_in_order(self, MockClient):
+        instance = _mock_llm_client(MockClient, [], config={"processing": {
+            "relevance_threshold": 0.7, "relevance_batch_size": 2, "relevance_max_concurrency": 4,
+            "prefilter": {"enabled": False},
+        }})
+        # Scores each article in the prompt as its number / 10, whatever order the batches complete in
+        def score(prompt_value):
+            ids = re.findall(r"\[id: (\d+)\]\s*Title: Article (\d+)", prompt_value.to_string())
+            return json.dumps({idx: int(number) / 10 for idx, number in ids})
+        instance.get_chat_model.return_value = RunnableLambda(score)
+        relevance_filter = RelevanceFilter()
+
+        scores = relevance_filter.score_articles([_article(i) for i in range(5)])
+
+        self.assertEqual(scores, [0.0, 0.1, 0.2, 0.3, 0.0])  # the lone last article is scored singly and fails
+        self.assertIs(relevance_filter._chains_for()[1], relevance_filter._chains_for()[1])
+
+    @patch('src.utils.retry.backoff_delay', return_value=0.0)
+    @patch('src.processors.filters.LLMClient')
+    def test_concurrent_batches_are_rate_limited_and_retried(self, MockClient, _):
+        instance = _mock_llm_client(MockClient, [], config={"processing": {
+            "relevance_batch_size": 2, "relevance_max_concurrency": 4, "prefilter": {"enabled": False},
+        }})
+        calls = []
+        def score(prompt_value):
+            ids = re.findall(r"\[id: (\d+)\]\s*Title: Article (\d+)", prompt_value.to_string())
+            calls.append(ids[0][1])
+            if ids[0][1] == "0" and calls.count("0") == 1:
+                raise _StatusError(429)
+            return json.dumps({idx: 0.9 for idx, _ in ids})
+        instance.get_chat_model.return_value = RunnableLambda(score)
+        relevance_filter = RelevanceFilter()
+        relevance_filter.rate_limiter = _CountingBucket(60000)
+
+        scores = relevance_filter.score_articles([_article(i) for i in range(4)])
+
+        self.assertEqual(scores, [0.9] * 4)  # the rate-limited batch was retried, not scored 0.0
+        self.assertEqual(sorted(calls), ["0", "0", "2"])
+        self.assertEqual(relevance_filter.rate_limiter.acquired, 3)
+
+    @patch('src.processors.filters.LLMClient')
+    def test_prompt_content_is_stripped_and_budgeted(self, MockClient):
+        instance = _mock_llm_client(MockClient, [], config={"processing": {
+            "prefilter": {"enabled": False}, "token_budget": {"relevance": 20},
+        }})
+        prompts = []
+        instance.get_chat_model.return_value = RunnableLambda(lambda p: prompts.append(p.to_string()) or "0.5")
+        article = Article(source="rss", title="Long post", url="http://example.com/long",
+                          content="<div><p>" + "quantization " * 500 + "</p></div>")
+
+        RelevanceFilter().filter_article(article)
+
+        content = prompts[0].split("Article Content:")[1].split("Output ONLY")[0]
+        self.assertNotIn("<p>", content)
+        self.assertLess(len(content.split()), 30)
+
+
+class TestKeywordPreFilter(unittest.TestCase):
+
+    def test_classify_bands(self):
+        prefilter = KeywordPreFilter(reject_below=0.2, accept_above=0.9)
+        self.assertEqual(prefilter.classify(0.1), "reject")
+        self.assertEqual(prefilter.classify(0.5), "escalate")
+        self.assertEqual(prefilter.classify(0.95), "accept")
+
+    def test_phrases_take_precedence_over_words(self):
+        prefilter = KeywordPreFilter(weights={"language model": 2.0, "model": -2.0}, bias=0.0)
+        article = Article(source="rss", title="", url="http://example.com", content="a new language model")
+        self.assertGreater(prefilter.score(article), 0.5)
+
+
+class _StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class _FakeSummarizer:
+    def __init__(self, fail_first_with=None, chunks=0, fail_chunk_with=None):
+        self.fail_first_with = fail_first_with
+        self.calls = 0
+        self.chunks = chunks
+        self.fail_chunk_with = fail_chunk_with
+        self.note_calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def needs_chunking(self, article):
+        return self.chunks > 0
+
+    def chunk_inputs(self, article):
+        return [{"title": article.title, "part": part} for part in range(1, self.chunks + 1)]
+
+    async def anote(self, inputs):
+        import asyncio
+        self.note_calls.append((inputs["title"], inputs["part"]))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+        if self.fail_chunk_with and inputs["part"] == 2 and self.note_calls.count((inputs["title"], 2)) == 1:
+            raise _StatusError(self.fail_chunk_with)
+        return f"note {inputs['part']}"
+
+    async def asummarize(self, article, notes=None):
+        import asyncio
+        self.calls += 1
+        if self.fail_first_with and self.calls == 1:
+            raise _StatusError(self.fail_first_with)
+        if notes is not None:
+            return f"summary of {article.title} from {len(notes)} notes"
+        # Later articles finish first
+        await asyncio.sleep(0.01 * (10 - int(article.title.split()[-1])))
+        return f"summary of {article.title}"
+
+
+class _FakeInsightGenerator:
+    async def agenerate_insight(self, article, summary):
+        return f"insight from {summary}"
+
+
+class _CountingBucket(TokenBucket):
+    acquired = 0
+
+    def acquire(self, tokens: float = 1.0):
+        self.acquired += 1
+        super().acquire(tokens)
+
+    async def aacquire(self, tokens: float = 1.0):
+        self.acquired += 1
+        await super().aacquire(tokens)
+
+
+class TestAsyncProcessingPipeline(unittest.TestCase):
+
+    def test_preserves_input_order(self):
+        articles = [_article(i) for i in range(5)]
+        pipeline = AsyncProcessingPipeline(_FakeSummarizer(), _FakeInsightGenerator(), max_concurrency=5)
+
+        processed = pipeline.run(articles)
+
+        self.assertEqual([a.title for a in processed], [a.title for a in articles])
+        self.assertEqual(processed[0].insight, "insight from summary of Article 0")
+
+    def test_run_releases_the_llm_connections_of_its_loop(self):
+        from src.utils import llm_client
+        handler = lambda request: llm_client._httpx.Response(200, json={})
+        transport = llm_client._LoopLocalTransport(None, new_pool=lambda: llm_client._httpx.MockTransport(handler))
+        client = llm_client._httpx.AsyncClient(transport=transport)
+
+        class _HTTPSummarizer(_FakeSummarizer):
+            async def asummarize(self, article, notes=None):
+                await client.get("http://llm.test/v1/chat/completions")
+                return "summary"
+
+        with patch.object(llm_client, "_async_transport", transport):
+            for _ in range(5):
+                AsyncProcessingPipeline(_HTTPSummarizer(), _FakeInsightGenerator()).run([_article(0)])
+
+        self.assertEqual(transport._pools, {})
+
+    @patch('src.utils.retry.backoff_delay', return_value=0.0)
+    def test_chunk_notes_are_paced_and_retried_one_by_one(self, _):
+        summarizer = _FakeSummarizer(chunks=3, fail_chunk_with=429)
+        limiter = _CountingBucket(60000)
+        pipeline = AsyncProcessingPipeline(summarizer, _FakeInsightGenerator(), max_concurrency=2,
+                                           rate_limiter=limiter)
+
+        processed = pipeline.run([_article(0), _article(1)])
+
+        self.assertEqual(processed[0].summary, "summary of Article 0 from 3 notes")
+        # Only the failed chunk is sent again: 3 chunks + 1 retry per article
+        self.assertEqual(len(summarizer.note_calls), 8)
+        self.assertLessEqual(summarizer.max_in_flight, 2)
+        # One limiter token per chunk, summary and insight call
+        self.assertEqual(limiter.acquired, 2 * (4 + 1 + 1))
+
+    @patch('src.utils.retry.backoff_delay', return_value=0.0)
+    def test_retries_rate_limit_errors(self, _):
+        summarizer = _FakeSummarizer(fail_first_with=429)
+        pipeline = AsyncProcessingPipeline(summarizer, _FakeInsightGenerator(), max_concurrency=1,
+                                           rate_limiter=TokenBucket(6000), max_retries=2)
+
+        processed = pipeline.run([_article(1)])
+
+        self.assertEqual(len(processed), 1)
+        self.assertEqual(summarizer.calls, 2)
+
+    def test_drops_article_on_non_retryable_error(self):
+        summarizer = _FakeSummarizer(fail_first_with=400)
+        pipeline = AsyncProcessingPipeline(summarizer, _FakeInsightGenerator(), max_concurrency=1)
+
+        processed = pipeline.run([_article(1), _article(2)])
+
+        self.assertEqual([a.title for a in processed], ["Article 2"])
+        self.assertEqual(summarizer.calls, 2)
+
+    def test_reports_each_article_as_it_completes(self):
+        summarizer = _FakeSummarizer(fail_first_with=400)
+        pipeline = AsyncProcessingPipeline(summarizer, _FakeInsightGenerator(), max_concurrency=1)
+        completed = []
+
+        pipeline.run([_article(1), _article(2), _article(3)], on_processed=lambda a: completed.append(a.title))
+
+        self.assertEqual(completed, ["Article 2", "Article 3"])
+
+    def test_combined_sources_use_single_call(self):
+        combined = _FakeCombinedProcessor('{"summary": "one-shot summary", "insight": "one-shot insight"}')
+        summarizer = _FakeSummarizer()
+        pipeline = AsyncProcessingPipeline(summarizer, _FakeInsightGenerator(), combined_processor=combined,
+                                           combined_sources=["rss"])
+
+        processed = pipeline.run([_article(1, source="rss"), _article(2, source="arxiv")])
+
+        self.assertEqual(processed[0].summary, "one-shot summary")
+        self.assertEqual(processed[0].insight, "one-shot insight")
+        self.assertEqual(processed[1].summary, "summary of Article 2")
+        self.assertEqual(summarizer.calls, 1)
+
+    def test_combined_falls_back_to_two_calls(self):
+        combined = _FakeCombinedProcessor("not json")
+        pipeline = AsyncProcessingPipeline(_FakeSummarizer(), _FakeInsightGenerator(), combined_processor=combined,
+                                           combined_sources=["rss"])
+
+        processed = pipeline.run([_article(1, source="rss")])
+
+        self.assertEqual(processed[0].summary, "summary of Article 1")
+        self.assertEqual(processed[0].insight, "insight from summary of Article 1")
+
+    def test_combined_falls_back_when_the_request_is_rejected(self):
+        request = _httpx.Request("POST", "http://llm.test/v1/chat/completions")
+        rejected = openai.BadRequestError(
+            "response_format is not supported", response=_httpx.Response(400, request=request), body=None
+        )
+        combined = _FakeCombinedProcessor(rejected)
+        pipeline = AsyncProcessingPipeline(_FakeSummarizer(), _FakeInsightGenerator(), combined_processor=combined,
+                                           combined_sources=["rss"], max_retries=3)
+
+        processed = pipeline.run([_article(1, source="rss")])
+
+        self.assertEqual(processed[0].summary, "summary of Article 1")
+        self.assertEqual(processed[0].insight, "insight from summary of Article 1")
+        self.assertEqual(combined.calls, 1)  # a 400 is not retried
+
+
+class _FakeCombinedProcessor:
+    def __init__(self, response):
+        self.response = response
+        self.calls = 0
+
+    async def aprocess(self, article):
+        self.calls += 1
+        if isinstance(self.response, Exception):
+            raise self.response
+        return CombinedProcessor._parse(self.response)
+
+
+class TestCombinedProcessor(unittest.TestCase):
+
+    @patch('src.processors.combined.LLMClient')
+    def test_process_parses_json(self, MockClient):
+        _mock_llm_client(MockClient, ['{"summary": ["fact one", "fact two"], "insight": "why it matters"}'])
+
+        summary, insight = CombinedProcessor().process(_article(0))
+
+        self.assertEqual(summary, "- fact one\n- fact two")
+        self.assertEqual(insight, "why it matters")
+
+    @patch('src.processors.combined.LLMClient')
+    def test_over_budget_content_is_left_to_the_two_call_path(self, MockClient):
+        instance = _mock_llm_client(MockClient, ['{"summary": "s", "insight": "i"}'], config={"processing": {
+            "token_budget": {"combined": 50, "long_content": "map_reduce"},
+        }})
+        long_article = Article(source="rss", title="Long", url="http://example.com/long", content="detail " * 200)
+
+        results = CombinedProcessor().run_many([long_article, _article(1)])
+
+        self.assertIsInstance(results[0], ValueError)
+        self.assertEqual(results[1], ("s", "i"))
+
+
+    def test_parse_rejects_missing_fields(self):
+        with self.assertRaises(ValueError):
+            CombinedProcessor._parse('{"summary": "only a summary"}')
+
+
+class TestSummarizer(unittest.TestCase):
+
+    @patch('src.processors.summarizer.LLMClient')
+    def test_run_many_uses_the_prompt_of_each_source(self, MockClient):
+        MockClient.return_value.config = {}
+        MockClient.return_value.get_chat_model.return_value = RunnableLambda(
+            lambda prompt_value: "paper" if "research paper" in prompt_value.to_string() else "news"
+        )
+        summarizer = Summarizer()
+
+        summaries = summarizer.run_many([_article(0, "arxiv"), _article(1), _article(2, "arxiv")], max_concurrency=2)
+
+        self.assertEqual(summaries, ["paper", "news", "paper"])
+        self.assertEqual(summarizer.summarize(_article(3)), "news")
+
+    @patch('src.utils.retry.backoff_delay', return_value=0.0)
+    @patch('src.processors.summarizer.LLMClient')
+    def test_run_many_is_rate_limited_and_retried(self, MockClient, _):
+        MockClient.return_value.config = {}
+        calls = []
+        def respond(prompt_value):
+            calls.append(prompt_value.to_string())
+            if len(calls) == 1:
+                raise _StatusError(429)
+            return "summary"
+        MockClient.return_value.get_chat_model.return_value = RunnableLambda(respond)
+        summarizer = Summarizer()
+        summarizer.rate_limiter = _CountingBucket(60000)
+
+        summaries = summarizer.run_many([_article(0), _article(1)], max_concurrency=1)
+
+        self.assertEqual(summaries, ["summary", "summary"])
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(summarizer.rate_limiter.acquired, 3)
+
+
+    @patch('src.processors.summarizer.LLMClient')
+    def test_long_content_is_map_reduced(self, MockClient):
+        MockClient.return_value.config = {"processing": {"token_budget": {
+            "summary": 100, "long_content": "map_reduce", "chunk_tokens": 80,
+        }}}
+        prompts = []
+        def respond(prompt_value):
+            prompts.append(prompt_value.to_string())
+            return "- note" if "part of an article" in prompts[-1] else "summary"
+        MockClient.return_value.get_chat_model.return_value = RunnableLambda(respond)
+        long_article = Article(source="rss", title="Long", url="http://example.com/long",
+                               content="\n\n".join(f"Paragraph {i} " + "detail " * 40 for i in range(5)))
+
+        summaries = Summarizer().run_many([long_article, _article(1)])
+
+        self.assertEqual(summaries, ["summary", "summary"])
+        chunk_prompts = [p for p in prompts if "part of an article" in p]
+        self.assertGreater(len(chunk_prompts), 1)
+        self.assertTrue(any("Content: - note\n- note" in p for p in prompts if "part of an article" not in p))
+
+
+class TestProcessorRegistry(unittest.TestCase):
+
+    @patch('src.processors.registry.LLMClient')
+    def test_processors_are_built_once_with_one_client(self, MockClient):
+        _mock_llm_client(MockClient, ["0.5"])
+        registry = ProcessorRegistry("settings.yaml")
+
+        self.assertIs(registry.summarizer, registry.summarizer)
+        self.assertIs(registry.relevance_filter, registry.relevance_filter)
+        self.assertIsNot(registry.summarizer, registry.insight_generator)
+        MockClient.assert_called_once_with("settings.yaml")
+
+    @patch('src.processors.registry.LLMClient')
+    def test_processors_share_one_token_budget(self, MockClient):
+        _mock_llm_client(MockClient, ["0.5"])
+        registry = ProcessorRegistry("settings.yaml")
+        article = Article(source="rss", title="t", url="u", content="<p>Quantized <b>attention</b> kernels.</p>")
+
+        budgets = {id(registry.relevance_filter.budget), id(registry.summarizer.budget),
+                   id(registry.combined_processor.budget)}
+        with patch('src.utils.token_budget.strip_html', wraps=strip_html) as cleaned:
+            registry.relevance_filter.budget.fit(article, "relevance")
+            registry.summarizer.budget.fit(article, "summary")
+
+        self.assertEqual(budgets, {id(registry.token_budget)})
+        self.assertEqual(cleaned.call_count, 1)
+
+
+class TestNearDuplicateDetector(unittest.TestCase):
+
+    ANNOUNCEMENT = ("Today we are releasing a new open-weight model that improves reasoning benchmarks "
+                    "by a large margin while halving inference cost on commodity GPUs.")
+
+    def test_simhash_is_close_for_small_edits(self):
+        a = simhash("Introducing the model. " + self.ANNOUNCEMENT)
+        b = simhash("Introducing the model! " + self.ANNOUNCEMENT + " Read more.")
+        c = simhash("A survey of reinforcement learning methods for robotic grasping in cluttered scenes.")
+        self.assertLessEqual(hamming_distance(a, b), 10)
+        self.assertGreater(hamming_distance(a, c), 10)
+
+    def test_merges_copies_across_sources(self):
+        articles = [
+            Article(source="rss", title="Introducing the model", url="https://openai.com/blog/model", content=self.ANNOUNCEMENT),
+            Article(source="rss", title="Unrelated post", url="https://example.com/other",
+                    content="Notes on migrating a data warehouse to a lakehouse architecture with open table formats."),
+            Article(source="anthropic", title="Introducing the model", url="https://anthropic.com/news/model", content=self.ANNOUNCEMENT),
+        ]
+
+        unique = NearDuplicateDetector(max_distance=3).deduplicate(articles)
+
+        self.assertEqual(len(unique), 2)
+        keeper = unique[0]
+        self.assertEqual(keeper.source, "anthropic")
+        self.assertEqual(keeper.raw_data["duplicate_urls"], [{"source": "rss", "url": "https://openai.com/blog/model"}])
+
+
+    def test_incremental_index_keeps_first_arrival(self):
+        index = NearDuplicateIndex(NearDuplicateDetector(max_distance=3))
+        first = Article(source="rss", title="Introducing the model", url="https://openai.com/blog/model", content=self.ANNOUNCEMENT)
+        copy = Article(source="anthropic", title="Introducing the model", url="https://anthropic.com/news/model", content=self.ANNOUNCEMENT)
+
+        self.assertTrue(index.add(first))
+        self.assertFalse(index.add(copy))
+        self.assertEqual(first.raw_data["duplicate_urls"], [{"source": "anthropic", "url": "https://anthropic.com/news/model"}])
+
+class _FakeEmbeddings:
+    """Maps each text to a fixed vector by the topic word in its title."""
+
+    TOPICS = {"quantization": [1.0, 0.0, 0.0], "agents": [0.0, 1.0, 0.0], "robotics": [0.0, 0.0, 1.0]}
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        vectors = []
+        for text in texts:
+            topic = text.split()[0].lower()
+            base = self.TOPICS[topic]
+            # Small per-text offset so copies of a topic are similar but not identical
+            vectors.append([value + 0.01 * (len(text) % 5) for value in base])
+        return vectors
+
+
+class TestEmbeddingRanker(unittest.TestCase):
+
+    def _articles(self):
+        articles = []
+        for topic, scores in (("Quantization", [0.99, 0.98, 0.97]), ("Agents", [0.9, 0.89]), ("Robotics", [0.8])):
+            for i, score in enumerate(scores):
+                article = Article(source="rss", title=f"{topic} post {i}", url=f"https://e.com/{topic}/{i}", content="x" * i)
+                article.relevance_score = score
+                articles.append(article)
+        return articles
+
+    def test_mmr_covers_every_topic(self):
+        ranker = EmbeddingRanker(_FakeEmbeddings(), top_n=3, diversity=0.5, num_topics=3)
+
+        ranked = ranker.rank(self._articles())
+
+        self.assertEqual([a.title.split()[0] for a in ranked], ["Quantization", "Agents", "Robotics"])
+        self.assertEqual(len({a.raw_data["topic"] for a in ranked}), 3)
+
+    def test_zero_diversity_is_relevance_order(self):
+        ranked = EmbeddingRanker(_FakeEmbeddings(), top_n=3, diversity=0.0).rank(self._articles())
+        self.assertEqual([a.title for a in ranked], ["Quantization post 0", "Quantization post 1", "Quantization post 2"])
+
+    def test_embeddings_are_cached_by_text(self):
+        embeddings = _FakeEmbeddings()
+        ranker = EmbeddingRanker(embeddings, cache=EmbeddingCache(":memory:"), top_n=3)
+
+        ranker.rank(self._articles())
+        ranker.rank(self._articles())
+
+        self.assertEqual(embeddings.calls, 1)
+        self.assertEqual(ranker.cache.stats(), {"hits": 6, "misses": 6})
+
+    def test_kmeans_separates_clusters(self):
+        vectors = np.array([[1, 0], [0.99, 0.1], [0, 1], [0.1, 0.99]], dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        labels, _ = kmeans(vectors, 2)
+        self.assertEqual(labels[0], labels[1])
+        self.assertEqual(labels[2], labels[3])
+        self.assertNotEqual(labels[0], labels[2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+from unittest.mock import patch
+from src.state import Article
+from src.storage.seen_store import SeenStore
+from src.storage.arxiv_store import ArxivStore
+from src.storage.article_store import ArticleStore
+
+
+def _article(url: str, title: str = "New model release", content: str = "A long enough description of the release.") -> Article:
+    return Article(source="rss", title=title, url=url, content=content)
+
+
+class TestSeenStore(unittest.TestCase):
+
+    def test_filters_by_normalized_url_and_content(self):
+        store = SeenStore(":memory:")
+        store.mark([_article("https://www.example.com/post/1/")], "published")
+
+        unseen, seen = store.filter_unseen([
+            _article("http://example.com/post/1?utm_source=rss#top", title="Renamed", content="Different text body entirely here."),
+            _article("https://mirror.example.org/copy"),  # same title + content, new URL
+            _article("https://example.com/post/2", title="Other", content="Something else that is also long enough."),
+        ])
+
+        self.assertEqual([a.url for a in unseen], ["https://example.com/post/2"])
+        self.assertEqual(len(seen), 2)
+
+    def test_lookups_beyond_the_parameter_chunk(self):
+        store = SeenStore(":memory:")
+        articles = [_article(f"https://example.com/{i}", title=f"Post {i}", content="") for i in range(1200)]
+        store.mark(articles[::2], "published")
+
+        unseen, seen = store.filter_unseen(articles)
+
+        self.assertEqual((len(unseen), len(seen)), (600, 600))
+        self.assertEqual(seen[-1].url, "https://example.com/1198")
+
+    def test_short_content_is_not_fingerprinted(self):
+        store = SeenStore(":memory:")
+        store.mark([_article("https://example.com/a", title="Update", content="")], "rejected")
+
+        unseen, _ = store.filter_unseen([_article("https://example.com/b", title="Update", content="")])
+
+        self.assertEqual(len(unseen), 1)
+
+    def test_compact_drops_old_entries(self):
+        store = SeenStore(":memory:")
+        with patch('src.storage.seen_store.time.time', return_value=0.0):
+            store.mark([_article("https://example.com/old")], "published")
+        store.mark([_article("https://example.com/new", title="Fresh", content="Fresh content that is long enough to hash.")], "published")
+
+        removed = store.compact(max_age_days=30)
+
+        self.assertEqual(removed, 2)  # URL + content fingerprint of the old article
+        self.assertEqual(len(store), 2)
+
+    def test_compact_keeps_entries_still_being_fetched(self):
+        store = SeenStore(":memory:")
+        with patch('src.storage.seen_store.time.time', return_value=0.0):
+            store.mark([_article("https://example.com/evergreen")], "rejected")
+
+        _, seen = store.filter_unseen([_article("https://example.com/evergreen")])
+        removed = store.compact(max_age_days=30)
+
+        self.assertEqual(len(seen), 1)
+        self.assertEqual(removed, 0)
+        self.assertEqual(len(store.filter_unseen([_article("https://example.com/evergreen")])[1]), 1)
+
+
+class TestArxivStore(unittest.TestCase):
+
+    def test_cross_listed_entries_returned_once(self):
+        from datetime import datetime, timedelta, timezone
+        now = datetime.now(timezone.utc)
+        store = ArxivStore(":memory:")
+        paper = {"entry_id": "a", "title": "Cross-listed", "published": now}
+        store.upsert("cs.AI", [paper, {"entry_id": "old", "title": "Old", "published": now - timedelta(days=5)}])
+        store.upsert("cs.CL", [paper, {"entry_id": "b", "title": "Newer", "published": now + timedelta(seconds=1)}])
+
+        entries = store.entries(["cs.AI", "cs.CL"], since=now - timedelta(days=1))
+
+        self.assertEqual([e["entry_id"] for e in entries], ["b", "a"])
+        self.assertIsNone(store.watermark("cs.AI"))
+        store.set_watermark("cs.AI", "a", now, now - timedelta(days=3))
+        self.assertEqual(store.watermark("cs.AI")["entry_id"], "a")
+
+
+class TestArticleStore(unittest.TestCase):
+
+    def test_status_and_results_only_move_forward(self):
+        store = ArticleStore(":memory:")
+        article = _article("https://example.com/quantization", title="Faster quantization kernels")
+        article.relevance_score = 0.9
+        store.upsert([article], "scored")
+        article.summary, article.insight = "Summary", "Insight"
+        store.upsert([article], "processed")
+
+        # A later run fetches the same article again, without score or summary
+        again = _article("https://example.com/quantization/", title="Faster quantization kernels")
+        store.upsert([again], "fetched")
+
+        self.assertEqual(store.restore_scores([again]), [])
+        self.assertEqual(again.relevance_score, 0.9)
+        self.assertEqual(store.restore_processed([again]), [])
+        self.assertEqual((again.summary, again.insight), ("Summary", "Insight"))
+        self.assertEqual([row["status"] for row in store.lookup([again]).values()], ["processed"])
+
+    def test_failed_scores_are_not_reused(self):
+        store = ArticleStore(":memory:")
+        article = _article("https://example.com/a")
+        article.raw_data["relevance_error"] = "timeout"
+        store.upsert([article], "rejected")
+
+        rerun = _article("https://example.com/a")
+        self.assertEqual(store.restore_scores([rerun]), [rerun])
+
+    def test_search_by_text_source_and_age(self):
+        store = ArticleStore(":memory:")
+        with patch('src.storage.article_store.time.time', return_value=0.0):
+            store.upsert([_article("https://example.com/old", title="Old quantization news")], "fetched")
+        store.upsert([
+            _article("https://example.com/new", title="New quantization method"),
+            Article(source="arxiv", title="Agents paper", url="https://arxiv.org/1", content="About agents."),
+        ], "fetched")
+
+        self.assertEqual([r["url"] for r in store.search("quantization")], ["https://example.com/new"])
+        self.assertEqual(len(store.search("quantization", days=None)), 2)
+        self.assertEqual([r["url"] for r in store.search("agents", source="arxiv")], ["https://arxiv.org/1"])
+        self.assertEqual(store.search("agents", source="rss"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
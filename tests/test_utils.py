@@ -0,0 +1,257 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+import numpy as np
+from src.utils.embedding_cache import EmbeddingCache
+from src.utils.http_client import HTTPClient
+from src.utils.llm_cache import SQLiteLLMCache
+from src.utils.llm_client import LLMClient, load_config
+from src.utils.metrics import MetricsCallbackHandler, RunMetrics
+from src.utils.token_budget import TokenBudget, TokenCounter, strip_html
+from src.state import Article
+
+
+class TestSQLiteLLMCache(unittest.TestCase):
+
+    def test_cache_hit_skips_model_call(self):
+        cache = SQLiteLLMCache(":memory:")
+        model = FakeListChatModel(responses=["first", "second"], cache=cache)
+
+        self.assertEqual(model.invoke("Summarize  this\n article").content, "first")
+        # Whitespace differences normalize to the same key
+        self.assertEqual(model.invoke("Summarize this article").content, "first")
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1})
+
+    def test_expired_entries_are_ignored(self):
+        cache = SQLiteLLMCache(":memory:", ttl_hours=1)
+        with patch('src.utils.llm_cache.time.time', return_value=1000.0):
+            FakeListChatModel(responses=["old"], cache=cache).invoke("prompt")
+        with patch('src.utils.llm_cache.time.time', return_value=1000.0 + 2 * 3600):
+            result = FakeListChatModel(responses=["new"], cache=cache).invoke("prompt")
+
+        self.assertEqual(result.content, "new")
+
+    def test_size_eviction_keeps_recent_entries(self):
+        cache = SQLiteLLMCache(":memory:", max_entries=2)
+        cache.EVICT_EVERY = 1
+        model = FakeListChatModel(responses=["1", "2", "3"], cache=cache)
+        for prompt in ["p1", "p2", "p3"]:
+            model.invoke(prompt)
+
+        count = cache._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        self.assertEqual(count, 2)
+
+
+class TestEmbeddingCache(unittest.TestCase):
+
+    def test_expired_vectors_are_ignored_and_pruned(self):
+        cache = EmbeddingCache(":memory:", ttl_hours=1)
+        with patch('src.utils.embedding_cache.time.time', return_value=1000.0):
+            cache.put_many({"old": np.ones(3)})
+        with patch('src.utils.embedding_cache.time.time', return_value=1000.0 + 2 * 3600):
+            self.assertEqual(cache.get_many(["old"]), {})
+            cache.put_many({"new": np.ones(3)})
+
+        count = cache._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        self.assertEqual(count, 1)
+
+    def test_size_eviction_keeps_recently_used_vectors(self):
+        cache = EmbeddingCache(":memory:", ttl_hours=None, max_entries=2)
+        for now, key in enumerate(["a", "b"]):
+            with patch('src.utils.embedding_cache.time.time', return_value=1000.0 + now):
+                cache.put_many({key: np.ones(3)})
+        with patch('src.utils.embedding_cache.time.time', return_value=1010.0):
+            cache.get_many(["a"])
+            cache.put_many({"c": np.ones(3)})
+
+        self.assertEqual(set(cache.get_many(["a", "b", "c"])), {"a", "c"})
+
+    def test_cache_without_access_times_is_migrated(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "embeddings.sqlite")
+            import sqlite3
+            conn = sqlite3.connect(path)
+            conn.execute("CREATE TABLE embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL, "
+                         "created_at REAL NOT NULL) WITHOUT ROWID")
+            conn.execute("INSERT INTO embeddings VALUES (?, ?, ?)",
+                         ("k", np.ones(3, dtype=np.float32).tobytes(), 9e9))
+            conn.commit()
+            conn.close()
+
+            vectors = EmbeddingCache(path).get_many(["k"])
+
+        self.assertEqual(vectors["k"].tolist(), [1.0, 1.0, 1.0])
+
+
+class TestRunMetrics(unittest.TestCase):
+
+    def test_callback_records_calls_and_cost(self):
+        from langchain_core.outputs import ChatGeneration, LLMResult
+        from langchain_core.messages import AIMessage
+        from uuid import uuid4
+        metrics = RunMetrics()
+        handler = MetricsCallbackHandler(metrics)
+
+        run_id = uuid4()
+        handler.on_chat_model_start({}, [[]], run_id=run_id, invocation_params={"model": "gpt-4o-mini"})
+        handler.on_llm_end(LLMResult(
+            generations=[[ChatGeneration(message=AIMessage(content="0.9"))]],
+            llm_output={"token_usage": {"prompt_tokens": 1000, "completion_tokens": 10},
+                        "model_name": "gpt-4o-mini-2024-07-18"},
+        ), run_id=run_id)
+        # A cache replay has no provider output
+        cached_id = uuid4()
+        handler.on_chat_model_start({}, [[]], run_id=cached_id, invocation_params={"model": "gpt-4o-mini"})
+        handler.on_llm_end(LLMResult(generations=[[ChatGeneration(message=AIMessage(content="0.9"))]]), run_id=cached_id)
+
+        with metrics.time_node("filter"):
+            pass
+        report = metrics.build_report(
+            {"llm_cache": {"hits": 1, "misses": 1}},
+            pricing={"gpt-4o": {"input": 2.5, "output": 10.0}, "gpt-4o-mini": {"input": 0.15, "output": 0.6}},
+        )
+
+        entry = report["llm"]["gpt-4o-mini-2024-07-18"]
+        self.assertEqual(entry["calls"], 1)
+        self.assertEqual(entry["prompt_tokens"], 1000)
+        self.assertAlmostEqual(entry["estimated_cost_usd"], (1000 * 0.15 + 10 * 0.6) / 1e6)
+        self.assertEqual(report["llm"]["gpt-4o-mini"]["cached_calls"], 1)
+        self.assertIn("filter", report["nodes_s"])
+
+    def test_prometheus_textfile(self):
+        import tempfile, os
+        metrics = RunMetrics()
+        metrics.record_llm_call("gpt-4o-mini", 0.5, prompt_tokens=10, completion_tokens=5)
+        report = metrics.build_report({"collectors": {"rss": {"latency_s": 1.5, "articles": 4}}})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "insightbot.prom")
+            metrics.write_prometheus(report, path)
+            text = open(path).read()
+
+        self.assertIn('insightbot_collector_articles{collector="rss"} 4', text)
+        self.assertIn('insightbot_llm_tokens{model="gpt-4o-mini",type="prompt"} 10', text)
+
+
+class TestHTTPClient(unittest.TestCase):
+
+    def _client(self, handler) -> HTTPClient:
+        import httpx
+        http = HTTPClient(max_retries=2, backoff_seconds=0.0)
+        http.client = httpx.Client(transport=httpx.MockTransport(handler))
+        return http
+
+    def test_get_retries_server_errors(self):
+        import httpx
+        statuses = iter([503, 429, 200])
+        http = self._client(lambda request: httpx.Response(next(statuses), headers={"Retry-After": "0"}))
+
+        self.assertEqual(http.get("https://example.com/feed").status_code, 200)
+
+    def test_post_is_not_retried_on_server_error(self):
+        import httpx
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(500)
+
+        self.assertEqual(self._client(handler).post("https://hooks.example.com", json={}).status_code, 500)
+        self.assertEqual(len(calls), 1)
+
+
+class TestLLMClient(unittest.TestCase):
+
+    def _client(self, config: dict, env: dict) -> LLMClient:
+        with patch.object(LLMClient, "_load_config", return_value=config), \
+                patch.dict("os.environ", {"OPENAI_API_KEY": "sk-test", **env}, clear=True):
+            return LLMClient()
+
+    def test_base_url_from_config_overrides_environment(self):
+        client = self._client(
+            {"processing": {"llm_base_url": "http://127.0.0.1:8089/v1"}, "cache": {"enabled": False}},
+            {"OPENAI_BASE_URL": "http://proxy.internal/v1"},
+        )
+
+        self.assertEqual(client.base_url, "http://127.0.0.1:8089/v1")
+        self.assertEqual(client.get_chat_model().openai_api_base, "http://127.0.0.1:8089/v1")
+        self.assertFalse(client.get_embeddings().check_embedding_ctx_length)
+
+    def test_routes_tasks_to_their_models(self):
+        client = self._client({"cache": {"enabled": False}, "processing": {
+            "summary_model": "gpt-4o-mini",
+            "models": {"relevance": {"model": "gpt-4.1-nano", "max_tokens": 300, "timeout_seconds": 20}},
+        }}, {})
+
+        scorer = client.get_chat_model(task="relevance")
+        self.assertEqual((scorer.model_name, scorer.max_tokens, scorer.request_timeout), ("gpt-4.1-nano", 300, 20))
+        default = client.get_chat_model(task="summary")
+        self.assertEqual((default.model_name, default.max_tokens), ("gpt-4o-mini", None))
+
+    def test_chat_models_share_one_http_pool(self):
+        client = self._client({"cache": {"enabled": False}}, {})
+
+        scorer, summarizer = client.get_chat_model(task="relevance"), client.get_chat_model(task="summary")
+        self.assertIs(scorer.http_client, summarizer.http_client)
+        self.assertIs(scorer.http_async_client, client.get_embeddings().http_async_client)
+
+    def test_chat_models_leave_retries_to_the_callers(self):
+        client = self._client({"cache": {"enabled": False}}, {})
+
+        model = client.get_chat_model(task="relevance")
+        self.assertEqual(model.max_retries, 0)
+        self.assertEqual(model.root_async_client.max_retries, 0)
+
+    def test_config_is_parsed_once_until_the_file_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "settings.yaml")
+            with open(path, "w") as f:
+                f.write("processing: {summary_model: a}\n")
+            first = load_config(path)
+            self.assertIs(load_config(path), first)
+
+            with open(path, "w") as f:
+                f.write("processing: {summary_model: b}\n")
+            os.utime(path, (0, os.path.getmtime(path) + 1))
+            self.assertEqual(load_config(path)["processing"]["summary_model"], "b")
+            self.assertEqual(load_config(os.path.join(tmp, "missing.yaml")), {})
+
+    def test_base_url_defaults_to_environment_then_public_api(self):
+        config = {"cache": {"enabled": False}}
+
+        self.assertEqual(self._client(config, {"OPENAI_BASE_URL": "http://proxy.internal/v1"}).base_url,
+                         "http://proxy.internal/v1")
+        self.assertIsNone(self._client(config, {}).base_url)
+
+
+class TestTokenBudget(unittest.TestCase):
+
+    def test_strip_html_keeps_visible_text_and_paragraphs(self):
+        html = "<div><p>Fast &amp; <b>small</b></p><script>track()</script><p>Second&nbsp;part</p></div>"
+
+        self.assertEqual(strip_html(html), "Fast & small\n\nSecond part")
+        self.assertEqual(strip_html("plain   text &lt;3"), "plain text <3")
+
+    def test_truncate_and_split_stay_within_budget(self):
+        counter = TokenCounter(None)  # estimated counts, no encoding download
+        text = "\n\n".join(["word " * 120, "단어 " * 150, "tail"])
+
+        self.assertLessEqual(counter.count(counter.truncate(text, 50)), 50)
+        chunks = counter.split(text, 100)
+        self.assertTrue(all(counter.count(chunk) <= 100 for chunk in chunks))
+        self.assertEqual("".join(chunks).replace(" ", "").replace("\n", ""), text.replace(" ", "").replace("\n", ""))
+
+    def test_fit_cleans_and_cuts_per_task(self):
+        budget = TokenBudget(TokenCounter(None), limits={"relevance": 10, "summary": None})
+        article = Article(source="rss", title="t", url="http://example.com", content="<p>" + "token " * 100 + "</p>")
+
+        self.assertLessEqual(budget.counter.count(budget.fit(article, "relevance")), 10)
+        self.assertEqual(budget.fit(article, "summary"), ("token " * 100).strip())
+        self.assertFalse(budget.fits(article, "relevance"))
+        self.assertTrue(budget.fits(article, "insight"))
+
+
+if __name__ == '__main__':
+    unittest.main()